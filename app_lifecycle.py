@@ -0,0 +1,114 @@
+"""
+앱 재시작 대기 모듈
+고정 sleep 대신 실제 프로세스 상태(pidof)와 WEBVIEW 컨텍스트 노출 여부를
+짧은 주기로 확인하여 앱이 종료/준비되는 즉시 다음 단계로 진행
+재시작마다 소요 시간을 기록하여 리포트 제공
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from device_discovery import run_adb
+
+APP_RESTART_TIMEOUT = float(os.getenv('APP_RESTART_TIMEOUT', '15'))
+APP_EXIT_TIMEOUT = float(os.getenv('APP_EXIT_TIMEOUT', '5'))
+APP_POLL_INTERVAL = float(os.getenv('APP_POLL_INTERVAL', '0.25'))
+
+# 기존 restart_app의 고정 대기 합계 (terminate 후 2초 + kill 후 2초 + 시작 후 3초)
+LEGACY_RESTART_SLEEP = 7.0
+
+def get_app_pid(device_udid: str, app_package: str) -> Optional[str]:
+    """앱 프로세스 PID 조회 (실행 중이 아니면 None)"""
+    output = run_adb(['shell', 'pidof', app_package], udid=device_udid, timeout=5)
+    pid = output.strip() if output else ''
+    return pid or None
+
+def wait_for_app_exit(device_udid: str, app_package: str, timeout: float = APP_EXIT_TIMEOUT) -> bool:
+    """앱 프로세스가 사라질 때까지 대기"""
+    deadline = time.time() + timeout
+    while True:
+        if get_app_pid(device_udid, app_package) is None:
+            return True
+        if time.time() >= deadline:
+            return False
+        time.sleep(APP_POLL_INTERVAL)
+
+def _webview_available(driver, webview_name: str) -> bool:
+    try:
+        return webview_name in (driver.contexts or [])
+    except Exception:
+        return False
+
+def wait_for_app_ready(driver, device_udid: str, app_package: str, webview_name: str = None,
+                       timeout: float = APP_RESTART_TIMEOUT) -> bool:
+    """
+    앱 준비 대기
+
+    webview_name이 있으면 해당 WEBVIEW 컨텍스트가 노출될 때까지,
+    없으면 앱 프로세스가 뜰 때까지 대기
+    """
+    deadline = time.time() + timeout
+    while True:
+        if webview_name:
+            if _webview_available(driver, webview_name):
+                return True
+        elif get_app_pid(device_udid, app_package):
+            return True
+        if time.time() >= deadline:
+            return False
+        time.sleep(APP_POLL_INTERVAL)
+
+@dataclass
+class RestartRecord:
+    """재시작 1회 기록"""
+    device_udid: str
+    app_package: str
+    latency: float
+    ready: bool
+
+class RestartStats:
+    """앱 재시작 소요 시간 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records: List[RestartRecord] = []
+
+    def add(self, record: RestartRecord):
+        with self._lock:
+            self.records.append(record)
+
+    def get_report(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(record.latency for record in self.records)
+            not_ready = sum(1 for record in self.records if not record.ready)
+        if not latencies:
+            return {'restarts': 0}
+        return {
+            'restarts': len(latencies),
+            'not_ready': not_ready,
+            'average_latency': round(sum(latencies) / len(latencies), 2),
+            'p95_latency': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2),
+            'max_latency': round(latencies[-1], 2),
+            'total_latency': round(sum(latencies), 2),
+            'legacy_sleep_total': round(LEGACY_RESTART_SLEEP * len(latencies), 2)
+        }
+
+    def print_report(self):
+        report = self.get_report()
+        if not report['restarts']:
+            return
+        print("\n🔄 앱 재시작 리포트:")
+        print(f"   재시작: {report['restarts']}회 (준비 확인 실패 {report['not_ready']}회)")
+        print(f"   소요 시간: 평균 {report['average_latency']}s, p95 {report['p95_latency']}s, "
+              f"최대 {report['max_latency']}s")
+        print(f"   총 {report['total_latency']}s (기존 고정 대기만 {report['legacy_sleep_total']}s)")
+
+# 글로벌 통계
+restart_stats = RestartStats()
+
+def get_restart_stats() -> RestartStats:
+    """글로벌 RestartStats 인스턴스 반환"""
+    return restart_stats
@@ -1,7 +1,6 @@
 import unittest
 import time
 import os
-import pandas as pd
 import csv
 from datetime import datetime
 from dotenv import load_dotenv
@@ -11,6 +10,16 @@ from appium.options.android import UiAutomator2Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from readiness_wait import wait_for_page_ready, get_readiness_stats, arm_page_probe
+from result_sink import create_result_sink
+from scenario_cache import get_scenario_cache
+from scenario_loader import TestStep, TestCase, load_test_cases
+from step_profiler import get_step_profiler, wait_until
+from screenshot_service import get_screenshot_service
+from webdriver_recorder import record_driver
+from dom_batch_executor import run_dom_batches, get_dom_batch_stats
+from appium_server_pool import get_device_ports
+from language_matrix import run_language_matrix
 
 # Load environment variables
 load_dotenv()
@@ -22,6 +31,9 @@ SCREENSHOT_DIR = os.path.join('screenshots', f'test_{start_time}')
 os.makedirs(SCREENSHOT_DIR, exist_ok=True)
 RESULT_CSV_FILE = f'test_results_{start_time}.csv'
 TEST_csv_FILE = os.getenv('TEST_CSV_FILE', 'test_scenarios.csv')
+result_sink = create_result_sink(
+    RESULT_CSV_FILE, ['timestamp', 'language', 'test_id', 'screen_id', 'description', 'status', 'message'])
+screenshots = get_screenshot_service()
 
 # App settings from environment (csv runner specific - Vietnam focused)
 BASE_URL = os.getenv('BASE_URL', 'http://localhost/')
@@ -37,31 +49,14 @@ UDID = os.getenv('csv_UDID', 'RFCM902ZM9K')
 USER_ID = os.getenv('USER_ID', 'c89109')
 USER_PW = os.getenv('USER_PW', 'mcnc1234!!')
 
-class TestStep:
-    def __init__(self, action, selector_type, selector_value, input_value=None, description=None):
-        self.action = action
-        self.selector_type = selector_type
-        self.selector_value = selector_value
-        self.input_value = input_value
-        self.description = description
-
-class TestCase:
-    def __init__(self, test_id, screen_id, url, description, steps, expected_result=None):
-        self.test_id = test_id
-        self.screen_id = screen_id
-        self.url = url
-        self.description = description
-        self.steps = steps
-        self.expected_result = expected_result
-
-def get_driver():
-    """Initialize Appium driver with enhanced capabilities"""
+def get_driver(udid=UDID, appium_port=None):
+    """Initialize Appium driver with enhanced capabilities (appium_port: 언어 매트릭스용 서버 풀 포트)"""
     print("\n🚀 Appium 드라이버 초기화 중...")
     
     capabilities = dict(
         platformName='Android',
         automationName='uiautomator2',
-        udid=UDID,
+        udid=udid,
         appPackage=APP_PACKAGE,
         appActivity=APP_ACTIVITY,
         noReset=True,
@@ -85,16 +80,21 @@ def get_driver():
             ]
         }
     )
+    if appium_port:
+        # 여러 디바이스 동시 실행 시 udid별 고정 포트로 충돌 방지
+        ports = get_device_ports(udid)
+        capabilities.update(systemPort=ports.system_port, chromedriverPort=ports.chromedriver_port)
     
     try:
         options = UiAutomator2Options().load_capabilities(capabilities)
         appium_host = os.getenv('APPIUM_HOST', 'localhost')
-        appium_port = os.getenv('APPIUM_PORT', '4723')
+        appium_port = appium_port or os.getenv('APPIUM_PORT', '4723')
         driver = webdriver.Remote(f'http://{appium_host}:{appium_port}', options=options)
+        driver = record_driver(driver, udid)
         driver.implicitly_wait(int(os.getenv('IMPLICIT_WAIT', '10')))
         
         print("✅ Appium 드라이버 초기화 완료")
-        print(f"📱 연결된 디바이스: {UDID}")
+        print(f"📱 연결된 디바이스: {udid}")
         print(f"📦 앱 패키지: {APP_PACKAGE}")
         print(f"🎯 앱 액티비티: {APP_ACTIVITY}")
         
@@ -105,21 +105,16 @@ def get_driver():
         raise
 
 def log_result(lang, test_id, screen_id, status, message, description=None):
-    """Log test results to CSV file"""
-    file_exists = os.path.isfile(RESULT_CSV_FILE)
-    with open(RESULT_CSV_FILE, mode='a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(['timestamp', 'language', 'test_id', 'screen_id', 'description', 'status', 'message'])
-        writer.writerow([
-            datetime.now().isoformat(),
-            lang,
-            test_id,
-            screen_id,
-            description,
-            status,
-            message
-        ])
+    """Log test results to CSV file (queued for the background writer)"""
+    result_sink.write({
+        'timestamp': datetime.now().isoformat(),
+        'language': lang,
+        'test_id': test_id,
+        'screen_id': screen_id,
+        'description': description,
+        'status': status,
+        'message': message
+    })
 
 def load_test_cases_from_csv():
     """Read test scenarios from csv file"""
@@ -131,55 +126,14 @@ def load_test_cases_from_csv():
             print(f"❌ CSV 파일이 존재하지 않음: {TEST_csv_FILE}")
             return []
         
-        # CSV 파일 읽기 (단일 파일에 모든 테스트 단계가 포함됨)
+        # CSV 파일 읽기 (단일 파일에 모든 테스트 단계가 포함됨, 케이스 메타데이터는 기본값 사용)
         print("📖 CSV 파일 읽는 중...")
-        df_steps = pd.read_csv(TEST_csv_FILE)
-        
-        print(f"✅ CSV 파일 읽기 성공: {len(df_steps)}개 행")
-        print(f"📋 컬럼: {list(df_steps.columns)}")
-        
-        # test_id별로 그룹화하여 테스트 케이스 생성
-        test_cases = []
-        unique_test_ids = df_steps['test_id'].unique()
+        test_cases = load_test_cases(None, TEST_csv_FILE)
         
-        print(f"🔍 발견된 테스트 ID: {list(unique_test_ids)}")
-        
-        for test_id in unique_test_ids:
-            # 현재 테스트 ID의 모든 단계 가져오기
-            case_steps_df = df_steps[df_steps['test_id'] == test_id].sort_values('step_order')
-            
-            print(f"📝 테스트 {test_id}: {len(case_steps_df)}개 단계")
-            
-            # 테스트 단계들 생성
-            steps = []
-            for _, step_row in case_steps_df.iterrows():
-                # input_value가 NaN인 경우 None으로 처리
-                input_value = step_row['input_value'] if pd.notna(step_row['input_value']) else None
-                description = step_row['description'] if pd.notna(step_row['description']) else None
-                
-                test_step = TestStep(
-                    action=step_row['action'],
-                    selector_type=step_row['selector_type'],
-                    selector_value=step_row['selector_value'],
-                    input_value=input_value,
-                    description=description
-                )
-                steps.append(test_step)
-                
-                print(f"   단계 {step_row['step_order']}: {step_row['action']} - {description}")
-            
-            # 테스트 케이스 생성 (CSV에는 케이스 메타데이터가 없으므로 기본값 사용)
-            test_case = TestCase(
-                test_id=test_id,
-                screen_id=f"{test_id}_SCREEN",  # 기본 스크린 ID
-                url="",  # CSV에 URL 정보가 없으므로 빈 문자열
-                description=f"테스트 케이스 {test_id}",  # 기본 설명
-                steps=steps,
-                expected_result=None  # 기본값
-            )
-            test_cases.append(test_case)
-            
-            print(f"✅ 테스트 케이스 생성 완료: {test_id}")
+        for test_case in test_cases:
+            print(f"📝 테스트 {test_case.test_id}: {len(test_case.steps)}개 단계")
+            for order, step in enumerate(test_case.steps, 1):
+                print(f"   단계 {order}: {step.action} - {step.description}")
         
         print(f"🎉 총 {len(test_cases)}개 테스트 케이스 로드 완료")
         return test_cases
@@ -478,57 +432,149 @@ def login(driver, wait):
 
 def execute_test_step(driver, wait, step):
     """Execute a single test step"""
+    profiler = get_step_profiler()
     try:
         selector = (getattr(AppiumBy, step.selector_type.upper()), step.selector_value)
         
-        if step.action.lower() == 'click':
-            element = wait.until(EC.element_to_be_clickable(selector))
-            element.click()
-        elif step.action.lower() == 'input':
-            element = wait.until(EC.presence_of_element_located(selector))
-            element.clear()
-            if step.input_value:
-                element.send_keys(step.input_value)
-        elif step.action.lower() == 'verify':
-            element = wait.until(EC.presence_of_element_located(selector))
-            assert element.is_displayed(), "Element not visible"
-            if step.input_value:
-                assert step.input_value in element.text, f"Expected text '{step.input_value}' not found"
-        
-        time.sleep(SLEEP_TIME)
+        with profiler.step(f"{step.action} {step.selector_value}"):
+            if step.action.lower() == 'click':
+                element = wait_until(driver, wait, EC.element_to_be_clickable(selector))
+                with profiler.span('action', 'click'):
+                    element.click()
+            elif step.action.lower() == 'input':
+                element = wait_until(driver, wait, EC.presence_of_element_located(selector))
+                with profiler.span('action', 'input'):
+                    element.clear()
+                    if step.input_value:
+                        element.send_keys(step.input_value)
+            elif step.action.lower() == 'verify':
+                element = wait_until(driver, wait, EC.presence_of_element_located(selector))
+                with profiler.span('action', 'verify'):
+                    assert element.is_displayed(), "Element not visible"
+                    if step.input_value:
+                        assert step.input_value in element.text, f"Expected text '{step.input_value}' not found"
+            
+            with profiler.span('sleep', 'page_ready'):
+                wait_for_page_ready(driver, SLEEP_TIME)
         return True
     except Exception as e:
         print(f"Step execution failed: {str(e)}")
         return False
 
-def run_test_case(driver, wait, lang, test_case):
+def run_test_case(driver, wait, lang, test_case, udid=UDID):
     """Execute a complete test case"""
+    with get_step_profiler().context(device=udid, language=lang, test_id=test_case.test_id):
+        return _run_test_case(driver, wait, lang, test_case)
+
+def _run_test_case(driver, wait, lang, test_case):
+    profiler = get_step_profiler()
     try:
         # Navigate to test URL
         if test_case.url:
             full_url = BASE_URL + test_case.url
-            driver.get(full_url)
-            time.sleep(SLEEP_TIME)
+            with profiler.span('action', 'navigate'):
+                driver.get(full_url)
+                # 새 문서에 계측을 설치해 두어 첫 스텝 액션이 시작한 요청도 대기 조건에 포함
+                arm_page_probe(driver)
+            profiler.sleep(SLEEP_TIME)
 
         # Execute each test step
-        for step in test_case.steps:
+        # DOM_BATCH=true면 연속된 DOM 스텝은 execute_script 1회로 실행하고 나머지만 WebDriver로 실행
+        for step in run_dom_batches(driver, test_case.steps, lambda: wait_for_page_ready(driver, SLEEP_TIME)):
             if not execute_test_step(driver, wait, step):
                 raise Exception(f"Step failed: {step.description}")
 
         # Take screenshot for successful test
         screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_{test_case.test_id}_{test_case.screen_id}_pass.png")
-        driver.save_screenshot(screenshot_path)
+        screenshots.capture(driver, screenshot_path, 'pass')
         
         log_result(lang, test_case.test_id, test_case.screen_id, "PASS", "", test_case.description)
         return True
     except Exception as e:
         # Take screenshot for failed test
         screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_{test_case.test_id}_{test_case.screen_id}_fail.png")
-        driver.save_screenshot(screenshot_path)
+        screenshots.capture(driver, screenshot_path, 'fail')
         
         log_result(lang, test_case.test_id, test_case.screen_id, "FAIL", str(e), test_case.description)
         return False
 
+def open_device(udid=UDID, appium_port=None):
+    """디바이스 1대 준비: 드라이버 생성 후 WEBVIEW 전환 (driver, wait, webview_success, udid 반환)"""
+    driver = get_driver(udid, appium_port)
+    wait = WebDriverWait(driver, int(os.getenv('EXPLICIT_WAIT', '20')))
+    try:
+        # Safe switch to WebView context
+        print(f"\n🔄 WEBVIEW 컨텍스트로 안전한 전환 시도... ({udid})")
+        webview_success = safe_switch_to_webview(driver, WEBVIEW_NAME)
+    except Exception:
+        driver.quit()
+        raise
+    
+    if not webview_success:
+        print("⚠️ WEBVIEW 전환 실패 - 네이티브 앱 컨텍스트로 진행")
+        # WEBVIEW 실패해도 테스트는 계속 진행
+        log_result('system', 'WEBVIEW_SWITCH', 'CONTEXT', 'FAIL', f'WEBVIEW 컨텍스트 전환 실패 ({udid})')
+    else:
+        print("✅ WEBVIEW 컨텍스트 전환 성공")
+        log_result('system', 'WEBVIEW_SWITCH', 'CONTEXT', 'PASS', f'WEBVIEW 컨텍스트 전환 성공 ({udid})')
+    return driver, wait, webview_success, udid
+
+def close_device(device):
+    """앱과 드라이버 종료"""
+    driver = device[0]
+    print(f"\n🔄 테스트 종료 처리 중... ({device[3]})")
+    
+    # 앱 종료 시도
+    try:
+        driver.terminate_app(APP_PACKAGE)
+        print("✅ 앱 종료 완료")
+    except:
+        pass
+    
+    # 드라이버 종료
+    driver.quit()
+    print("✅ 드라이버 종료 완료")
+
+def run_language(device, lang, test_cases):
+    """언어 1개의 전체 테스트 케이스 실행 (언어 변경 -> 로그인 -> 케이스 -> 로그인 페이지 복귀)"""
+    driver, wait, webview_success, udid = device
+    print(f"\n🌐 언어별 테스트 시작: {lang} ({udid})")
+    
+    # Change language (WEBVIEW 모드에서만)
+    if webview_success:
+        if not change_language(driver, wait, lang):
+            print(f"⚠️ 언어 변경 실패: {lang} - 건너뛰기")
+            log_result(lang, 'LANGUAGE_CHANGE', 'SETUP', 'FAIL', f'언어 변경 실패: {lang}')
+            return
+    else:
+        print(f"⚠️ WEBVIEW 모드가 아니므로 언어 변경 건너뛰기: {lang}")
+    
+    # Perform login (WEBVIEW 모드에서만)
+    if webview_success:
+        if not login(driver, wait):
+            print(f"⚠️ 로그인 실패: {lang} - 건너뛰기")
+            log_result(lang, 'LOGIN', 'AUTH', 'FAIL', f'로그인 실패: {lang}')
+            return
+    else:
+        print(f"⚠️ WEBVIEW 모드가 아니므로 로그인 건너뛰기: {lang}")
+    
+    # Execute each test case
+    print(f"🧪 테스트 케이스 실행 시작: {lang}")
+    for i, test_case in enumerate(test_cases, 1):
+        print(f"\n📝 테스트 케이스 {i}/{len(test_cases)}: {test_case.test_id}")
+        run_test_case(driver, wait, lang, test_case, udid)
+    
+    # Return to login page for next language (WEBVIEW 모드에서만)
+    if webview_success and len(LANGUAGES) > 1:
+        try:
+            print(f"🔄 다음 언어를 위해 로그인 페이지로 이동: {lang}")
+            driver.get(BASE_URL + LOGIN_PATH)
+            time.sleep(SLEEP_TIME)
+        except Exception as e:
+            print(f"⚠️ 로그인 페이지 이동 실패: {e}")
+    
+    print(f"✅ 언어별 테스트 완료: {lang}")
+
 class TestCsvScenarios(unittest.TestCase):
     """CSV 기반 테스트 시나리오 실행 클래스"""
     
@@ -544,30 +590,9 @@ class TestCsvScenarios(unittest.TestCase):
         print(f"📁 스크린샷 저장: {SCREENSHOT_DIR}")
         print(f"📊 결과 저장: {RESULT_CSV_FILE}")
         print("=" * 80)
-        
-        self.driver = None
-        self.wait = None
     
     def tearDown(self):
-        """테스트 종료 후 정리"""
-        if self.driver:
-            try:
-                print("\n🔄 테스트 종료 처리 중...")
-                
-                # 앱 종료 시도
-                try:
-                    self.driver.terminate_app(APP_PACKAGE)
-                    print("✅ 앱 종료 완료")
-                except:
-                    pass
-                
-                # 드라이버 종료
-                self.driver.quit()
-                print("✅ 드라이버 종료 완료")
-                
-            except Exception as e:
-                print(f"⚠️ 정리 중 오류: {e}")
-        
+        """테스트 종료 후 정리 (드라이버는 디바이스별로 close_device에서 종료)"""
         print("🔚 CSV 테스트 정리 완료")
         print("=" * 80)
 
@@ -581,64 +606,27 @@ class TestCsvScenarios(unittest.TestCase):
 
         print(f"✅ {len(test_cases)}개 테스트 케이스 로드 완료")
 
-        # Initialize driver
-        self.driver = get_driver()
-        self.wait = WebDriverWait(self.driver, int(os.getenv('EXPLICIT_WAIT', '20')))
-        
         try:
-            # Safe switch to WebView context
-            print("\n🔄 WEBVIEW 컨텍스트로 안전한 전환 시도...")
-            webview_success = safe_switch_to_webview(self.driver, WEBVIEW_NAME)
-            
-            if not webview_success:
-                print("⚠️ WEBVIEW 전환 실패 - 네이티브 앱 컨텍스트로 진행")
-                # WEBVIEW 실패해도 테스트는 계속 진행
-                log_result('system', 'WEBVIEW_SWITCH', 'CONTEXT', 'FAIL', 'WEBVIEW 컨텍스트 전환 실패')
-            else:
-                print("✅ WEBVIEW 컨텍스트 전환 성공")
-                log_result('system', 'WEBVIEW_SWITCH', 'CONTEXT', 'PASS', 'WEBVIEW 컨텍스트 전환 성공')
-            
             # Execute test cases for each language
-            for lang in LANGUAGES:
-                print(f"\n🌐 언어별 테스트 시작: {lang}")
-                
-                # Change language (WEBVIEW 모드에서만)
-                if webview_success:
-                    if not change_language(self.driver, self.wait, lang):
-                        print(f"⚠️ 언어 변경 실패: {lang} - 건너뛰기")
-                        log_result(lang, 'LANGUAGE_CHANGE', 'SETUP', 'FAIL', f'언어 변경 실패: {lang}')
-                        continue
-                else:
-                    print(f"⚠️ WEBVIEW 모드가 아니므로 언어 변경 건너뛰기: {lang}")
-                
-                # Perform login (WEBVIEW 모드에서만)
-                if webview_success:
-                    if not login(self.driver, self.wait):
-                        print(f"⚠️ 로그인 실패: {lang} - 건너뛰기")
-                        log_result(lang, 'LOGIN', 'AUTH', 'FAIL', f'로그인 실패: {lang}')
-                        continue
-                else:
-                    print(f"⚠️ WEBVIEW 모드가 아니므로 로그인 건너뛰기: {lang}")
-                
-                # Execute each test case
-                print(f"🧪 테스트 케이스 실행 시작: {lang}")
-                for i, test_case in enumerate(test_cases, 1):
-                    print(f"\n📝 테스트 케이스 {i}/{len(test_cases)}: {test_case.test_id}")
-                    run_test_case(self.driver, self.wait, lang, test_case)
-                
-                # Return to login page for next language (WEBVIEW 모드에서만)
-                if webview_success and len(LANGUAGES) > 1:
-                    try:
-                        print(f"🔄 다음 언어를 위해 로그인 페이지로 이동: {lang}")
-                        self.driver.get(BASE_URL + LOGIN_PATH)
-                        time.sleep(SLEEP_TIME)
-                    except Exception as e:
-                        print(f"⚠️ 로그인 페이지 이동 실패: {e}")
-                
-                print(f"✅ 언어별 테스트 완료: {lang}")
+            # LANGUAGE_MATRIX=true이고 같은 기종 디바이스가 더 있으면 언어마다 다른 디바이스에서 동시 실행
+            matrix = run_language_matrix(UDID, LANGUAGES, open_device,
+                                         lambda device, lang: run_language(device, lang, test_cases),
+                                         close_device)
+            for lang in matrix.skipped_languages():
+                log_result(lang, 'LANGUAGE_MATRIX', 'DEVICE', 'FAIL', f'실행할 디바이스 없음: {lang}')
+            for lang, error in matrix.failed_languages():
+                log_result(lang, 'LANGUAGE_MATRIX', 'DEVICE', 'FAIL', f'언어 테스트 오류: {error}')
             
+            get_readiness_stats().print_report()
+            get_scenario_cache().print_report()
+            get_step_profiler().print_report()
+            get_dom_batch_stats().print_report()
+            get_step_profiler().save('csv_profile')
+            screenshots.close()
+            screenshots.print_report()
+            result_sink.flush()
             print("\n🎉 모든 테스트 시나리오 완료!")
-            print(f"📊 결과 파일: {RESULT_CSV_FILE}")
+            print(f"📊 결과 파일: {result_sink.path}")
             print(f"📸 스크린샷: {SCREENSHOT_DIR}")
                 
         except Exception as e:
@@ -10,6 +10,16 @@ from appium.options.android import UiAutomator2Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from readiness_wait import wait_for_page_ready, get_readiness_stats, arm_page_probe
+from result_sink import create_result_sink
+from scenario_cache import get_scenario_cache
+from scenario_loader import TestStep, TestCase, load_test_cases
+from step_profiler import get_step_profiler, wait_until
+from screenshot_service import get_screenshot_service
+from webdriver_recorder import record_driver
+from dom_batch_executor import run_dom_batches, get_dom_batch_stats
+from appium_server_pool import get_device_ports
+from language_matrix import run_language_matrix
 
 # Load environment variables
 load_dotenv()
@@ -22,6 +32,9 @@ os.makedirs(SCREENSHOT_DIR, exist_ok=True)
 RESULT_CSV_FILE = f'test_results_{start_time}.csv'
 TEST_CASES_FILE = os.getenv('TEST_CASES_FILE', 'test_cases.csv')
 TEST_STEPS_FILE = os.getenv('TEST_STEPS_FILE', 'test_steps.csv')
+result_sink = create_result_sink(
+    RESULT_CSV_FILE, ['timestamp', 'language', 'test_id', 'screen_id', 'description', 'status', 'message'])
+screenshots = get_screenshot_service()
 
 # App settings from environment (Excel runner specific - Vietnam focused)
 BASE_URL = os.getenv('BASE_URL', 'http://localhost/')
@@ -37,29 +50,12 @@ UDID = os.getenv('EXCEL_UDID', 'RFCM902ZM9K')
 USER_ID = os.getenv('USER_ID', 'c89109')
 USER_PW = os.getenv('USER_PW', 'mcnc1234!!')
 
-class TestStep:
-    def __init__(self, action, selector_type, selector_value, input_value=None, description=None):
-        self.action = action
-        self.selector_type = selector_type
-        self.selector_value = selector_value
-        self.input_value = input_value
-        self.description = description
-
-class TestCase:
-    def __init__(self, test_id, screen_id, url, description, steps, expected_result=None):
-        self.test_id = test_id
-        self.screen_id = screen_id
-        self.url = url
-        self.description = description
-        self.steps = steps
-        self.expected_result = expected_result
-
-def get_driver():
-    """Initialize Appium driver with required capabilities"""
+def get_driver(udid=UDID, appium_port=None):
+    """Initialize Appium driver with required capabilities (appium_port: 언어 매트릭스용 서버 풀 포트)"""
     capabilities = dict(
         platformName='Android',
         automationName='uiautomator2',
-        udid=UDID,
+        udid=udid,
         appPackage=APP_PACKAGE,
         appActivity=APP_ACTIVITY,
         noReset=True,
@@ -83,82 +79,34 @@ def get_driver():
             ]
         }
     )
+    if appium_port:
+        # 여러 디바이스 동시 실행 시 udid별 고정 포트로 충돌 방지
+        ports = get_device_ports(udid)
+        capabilities.update(systemPort=ports.system_port, chromedriverPort=ports.chromedriver_port)
     options = UiAutomator2Options().load_capabilities(capabilities)
     appium_host = os.getenv('APPIUM_HOST', 'localhost')
-    appium_port = os.getenv('APPIUM_PORT', '4723')
+    appium_port = appium_port or os.getenv('APPIUM_PORT', '4723')
     driver = webdriver.Remote(f'http://{appium_host}:{appium_port}', options=options)
+    driver = record_driver(driver, udid)
     driver.implicitly_wait(int(os.getenv('IMPLICIT_WAIT', '10')))
     return driver
 
 def log_result(lang, test_id, screen_id, status, message, description=None):
-    """Log test results to CSV file"""
-    file_exists = os.path.isfile(RESULT_CSV_FILE)
-    with open(RESULT_CSV_FILE, mode='a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(['timestamp', 'language', 'test_id', 'screen_id', 'description', 'status', 'message'])
-        writer.writerow([
-            datetime.now().isoformat(),
-            lang,
-            test_id,
-            screen_id,
-            description,
-            status,
-            message
-        ])
+    """Log test results to CSV file (queued for the background writer)"""
+    result_sink.write({
+        'timestamp': datetime.now().isoformat(),
+        'language': lang,
+        'test_id': test_id,
+        'screen_id': screen_id,
+        'description': description,
+        'status': status,
+        'message': message
+    })
 
 def load_test_cases_from_csv():
     """Read test scenarios from CSV files"""
     try:
-        # Read test cases CSV
-        test_cases = []
-        with open(TEST_CASES_FILE, 'r', encoding='utf-8') as f:
-            cases_reader = csv.DictReader(f)
-            cases_data = list(cases_reader)
-        
-        # Read test steps CSV
-        with open(TEST_STEPS_FILE, 'r', encoding='utf-8') as f:
-            steps_reader = csv.DictReader(f)
-            steps_data = list(steps_reader)
-        
-        # Group steps by test_id
-        steps_by_test = {}
-        for step in steps_data:
-            test_id = step['test_id']
-            if test_id not in steps_by_test:
-                steps_by_test[test_id] = []
-            steps_by_test[test_id].append(step)
-        
-        # Create test cases
-        for case_data in cases_data:
-            test_id = case_data['test_id']
-            
-            # Get steps for this test case and sort by step_order
-            case_steps = steps_by_test.get(test_id, [])
-            case_steps.sort(key=lambda x: int(x['step_order']))
-            
-            steps = []
-            for step_data in case_steps:
-                test_step = TestStep(
-                    action=step_data['action'],
-                    selector_type=step_data['selector_type'],
-                    selector_value=step_data['selector_value'],
-                    input_value=step_data['input_value'] if step_data['input_value'] else None,
-                    description=step_data['description'] if step_data['description'] else None
-                )
-                steps.append(test_step)
-            
-            test_case = TestCase(
-                test_id=case_data['test_id'],
-                screen_id=case_data['screen_id'],
-                url=case_data['url'],
-                description=case_data['description'],
-                steps=steps,
-                expected_result=case_data['expected_result'] if case_data['expected_result'] else None
-            )
-            test_cases.append(test_case)
-            
-        return test_cases
+        return load_test_cases(TEST_CASES_FILE, TEST_STEPS_FILE)
     except Exception as e:
         print(f"Error loading test cases from CSV: {str(e)}")
         return []
@@ -199,57 +147,105 @@ def login(driver, wait):
 
 def execute_test_step(driver, wait, step):
     """Execute a single test step"""
+    profiler = get_step_profiler()
     try:
         selector = (getattr(AppiumBy, step.selector_type.upper()), step.selector_value)
         
-        if step.action.lower() == 'click':
-            element = wait.until(EC.element_to_be_clickable(selector))
-            element.click()
-        elif step.action.lower() == 'input':
-            element = wait.until(EC.presence_of_element_located(selector))
-            element.clear()
-            if step.input_value:
-                element.send_keys(step.input_value)
-        elif step.action.lower() == 'verify':
-            element = wait.until(EC.presence_of_element_located(selector))
-            assert element.is_displayed(), "Element not visible"
-            if step.input_value:
-                assert step.input_value in element.text, f"Expected text '{step.input_value}' not found"
-        
-        time.sleep(SLEEP_TIME)
+        with profiler.step(f"{step.action} {step.selector_value}"):
+            if step.action.lower() == 'click':
+                element = wait_until(driver, wait, EC.element_to_be_clickable(selector))
+                with profiler.span('action', 'click'):
+                    element.click()
+            elif step.action.lower() == 'input':
+                element = wait_until(driver, wait, EC.presence_of_element_located(selector))
+                with profiler.span('action', 'input'):
+                    element.clear()
+                    if step.input_value:
+                        element.send_keys(step.input_value)
+            elif step.action.lower() == 'verify':
+                element = wait_until(driver, wait, EC.presence_of_element_located(selector))
+                with profiler.span('action', 'verify'):
+                    assert element.is_displayed(), "Element not visible"
+                    if step.input_value:
+                        assert step.input_value in element.text, f"Expected text '{step.input_value}' not found"
+            
+            with profiler.span('sleep', 'page_ready'):
+                wait_for_page_ready(driver, SLEEP_TIME)
         return True
     except Exception as e:
         print(f"Step execution failed: {str(e)}")
         return False
 
-def run_test_case(driver, wait, lang, test_case):
+def run_test_case(driver, wait, lang, test_case, udid=UDID):
     """Execute a complete test case"""
+    with get_step_profiler().context(device=udid, language=lang, test_id=test_case.test_id):
+        return _run_test_case(driver, wait, lang, test_case)
+
+def _run_test_case(driver, wait, lang, test_case):
+    profiler = get_step_profiler()
     try:
         # Navigate to test URL
         if test_case.url:
             full_url = BASE_URL + test_case.url
-            driver.get(full_url)
-            time.sleep(SLEEP_TIME)
+            with profiler.span('action', 'navigate'):
+                driver.get(full_url)
+                # 새 문서에 계측을 설치해 두어 첫 스텝 액션이 시작한 요청도 대기 조건에 포함
+                arm_page_probe(driver)
+            profiler.sleep(SLEEP_TIME)
 
         # Execute each test step
-        for step in test_case.steps:
+        # DOM_BATCH=true면 연속된 DOM 스텝은 execute_script 1회로 실행하고 나머지만 WebDriver로 실행
+        for step in run_dom_batches(driver, test_case.steps, lambda: wait_for_page_ready(driver, SLEEP_TIME)):
             if not execute_test_step(driver, wait, step):
                 raise Exception(f"Step failed: {step.description}")
 
         # Take screenshot for successful test
         screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_{test_case.test_id}_{test_case.screen_id}_pass.png")
-        driver.save_screenshot(screenshot_path)
+        screenshots.capture(driver, screenshot_path, 'pass')
         
         log_result(lang, test_case.test_id, test_case.screen_id, "PASS", "", test_case.description)
         return True
     except Exception as e:
         # Take screenshot for failed test
         screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_{test_case.test_id}_{test_case.screen_id}_fail.png")
-        driver.save_screenshot(screenshot_path)
+        screenshots.capture(driver, screenshot_path, 'fail')
         
         log_result(lang, test_case.test_id, test_case.screen_id, "FAIL", str(e), test_case.description)
         return False
 
+def open_device(udid=UDID, appium_port=None):
+    """Create a driver for one device and switch to the WebView context"""
+    driver = get_driver(udid, appium_port)
+    wait = WebDriverWait(driver, int(os.getenv('EXPLICIT_WAIT', '20')))
+    try:
+        driver.switch_to.context(WEBVIEW_NAME)
+    except Exception:
+        driver.quit()
+        raise
+    return driver, wait, udid
+
+def close_device(device):
+    device[0].quit()
+
+def run_language(device, lang, test_cases):
+    """Execute all test cases for one language"""
+    driver, wait, udid = device
+    # Change language
+    if not change_language(driver, wait, lang):
+        return
+    
+    # Perform login
+    if not login(driver, wait):
+        return
+    
+    # Execute each test case
+    for test_case in test_cases:
+        run_test_case(driver, wait, lang, test_case, udid)
+    
+    # Return to login page for next language
+    driver.get(BASE_URL + LOGIN_PATH)
+    time.sleep(SLEEP_TIME)
+
 class TestCsvScenarios(unittest.TestCase):
     def test_all_scenarios(self):
         # Load test cases from CSV
@@ -257,34 +253,27 @@ class TestCsvScenarios(unittest.TestCase):
         if not test_cases:
             self.fail("No test cases loaded from CSV files")
 
-        # Initialize driver
-        driver = get_driver()
-        wait = WebDriverWait(driver, int(os.getenv('EXPLICIT_WAIT', '20')))
-        
         try:
-            # Switch to WebView context
-            driver.switch_to.context(WEBVIEW_NAME)
-            
             # Execute test cases for each language
-            for lang in LANGUAGES:
-                # Change language
-                if not change_language(driver, wait, lang):
-                    continue
-                
-                # Perform login
-                if not login(driver, wait):
-                    continue
-                
-                # Execute each test case
-                for test_case in test_cases:
-                    run_test_case(driver, wait, lang, test_case)
-                
-                # Return to login page for next language
-                driver.get(BASE_URL + LOGIN_PATH)
-                time.sleep(SLEEP_TIME)
+            # LANGUAGE_MATRIX=true이고 같은 기종 디바이스가 더 있으면 언어마다 다른 디바이스에서 동시 실행
+            matrix = run_language_matrix(UDID, LANGUAGES, open_device,
+                                         lambda device, lang: run_language(device, lang, test_cases),
+                                         close_device)
+            for lang in matrix.skipped_languages():
+                log_result(lang, 'LANGUAGE_MATRIX', 'DEVICE', 'FAIL', f'No device left to run {lang}')
+            for lang, error in matrix.failed_languages():
+                log_result(lang, 'LANGUAGE_MATRIX', 'DEVICE', 'FAIL', f'Language run failed: {error}')
+            
+            get_readiness_stats().print_report()
+            get_scenario_cache().print_report()
+            get_step_profiler().print_report()
+            get_dom_batch_stats().print_report()
+            get_step_profiler().save('excel_profile')
+            screenshots.close()
+            screenshots.print_report()
                 
         finally:
-            driver.quit()
+            result_sink.flush()
 
 if __name__ == '__main__':
     print("🚀 CSV 기반 Appium 테스트 실행기 (베트남 패키지)")
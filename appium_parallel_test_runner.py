@@ -1,6 +1,8 @@
 import unittest
 import time
 import os
+import argparse
+import asyncio
 import csv
 import threading
 import subprocess
@@ -13,6 +15,23 @@ from appium.options.android import UiAutomator2Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from work_scheduler import build_scheduler
+from session_pool import get_session_pool
+from readiness_wait import wait_for_page_ready, get_readiness_stats, arm_page_probe
+from result_sink import create_result_sink
+from scenario_cache import get_scenario_cache
+from device_discovery import discover_devices
+from app_lifecycle import wait_for_app_exit, wait_for_app_ready, RestartRecord, get_restart_stats
+from auth_session import get_auth_session_manager
+from scenario_loader import TestStep, TestCase, load_test_cases
+from async_orchestrator import AsyncOrchestrator
+from appium_server_pool import get_appium_server_pool, get_device_ports
+from step_profiler import get_step_profiler, wait_until
+from screenshot_service import get_screenshot_service
+from webdriver_recorder import record_driver
+from dom_batch_executor import run_dom_batches, get_dom_batch_stats
+from shard_coordinator import (COORDINATOR_BIND, COORDINATOR_HTTP_TIMEOUT, COORDINATOR_PORT, ShardCoordinator,
+                               launch_local_workers, partition_udids, run_worker)
 
 # Load environment variables
 load_dotenv()
@@ -36,6 +55,12 @@ BASE_URL = os.getenv('BASE_URL', 'http://localhost/')
 LOGIN_PATH = os.getenv('LOGIN_PATH', 'LOG1000')
 SLEEP_TIME = int(os.getenv('SLEEP_TIME', '3'))
 
+# Scheduler settings ('queue': 전역 작업 큐, 'pair': 페어별 순차 실행)
+SCHEDULER_MODE = os.getenv('SCHEDULER_MODE', 'queue').lower()
+
+# Orchestrator ('threads': 디바이스별 스레드, 'asyncio': 단일 이벤트 루프 + W3C HTTP API)
+ORCHESTRATOR = os.getenv('ORCHESTRATOR', 'threads').lower()
+
 # Country specific settings
 COUNTRY_SETTINGS = {
     'VN': {'languages': ['vi', 'ko', 'en'], 'default_lang': 'vi'},
@@ -43,25 +68,11 @@ COUNTRY_SETTINGS = {
     'KR': {'languages': ['ko', 'en'], 'default_lang': 'ko'}
 }
 
-# Thread-safe logging
-csv_lock = threading.Lock()
-
-class TestStep:
-    def __init__(self, action, selector_type, selector_value, input_value=None, description=None):
-        self.action = action
-        self.selector_type = selector_type
-        self.selector_value = selector_value
-        self.input_value = input_value
-        self.description = description
-
-class TestCase:
-    def __init__(self, test_id, screen_id, url, description, steps, expected_result=None):
-        self.test_id = test_id
-        self.screen_id = screen_id
-        self.url = url
-        self.description = description
-        self.steps = steps
-        self.expected_result = expected_result
+# Buffered result writer (device threads only enqueue rows)
+RESULT_FIELDS = ['timestamp', 'device_id', 'user_id', 'language', 
+                 'test_id', 'screen_id', 'description', 'status', 'message']
+result_sink = create_result_sink(RESULT_CSV_FILE, RESULT_FIELDS)
+screenshots = get_screenshot_service()
 
 class DeviceConfig:
     def __init__(self, device_id, udid, platform_name, platform_version, app_package=None, app_activity=None, webview_name=None):
@@ -100,59 +111,12 @@ def read_csv_file(file_path):
 def get_connected_devices():
     """Get list of connected Android devices"""
     try:
-        # Run adb devices command
-        result = subprocess.run(['adb', 'devices'], capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            print("Error running adb devices command")
-            return []
-        
-        # Parse the output
-        lines = result.stdout.strip().split('\n')[1:]  # Skip the first line (header)
-        devices = []
-        
-        for line in lines:
-            if line.strip():
-                parts = line.split()
-                if len(parts) >= 2 and parts[1] == 'device':
-                    device_info = get_device_info(parts[0])
-                    if device_info:
-                        devices.append(device_info)
-        
-        return devices
+        # getprop은 디바이스별로 동시에 실행되고 빌드 지문이 같으면 캐시 사용
+        return [device.to_device_config() for device in discover_devices()]
     except Exception as e:
         print(f"Error detecting devices: {str(e)}")
         return []
 
-def get_device_info(udid):
-    """Get detailed information about a specific device"""
-    try:
-        # Get device properties
-        result = subprocess.run(['adb', '-s', udid, 'shell', 'getprop'], 
-                              capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            return None
-            
-        # Parse properties
-        props = {}
-        for line in result.stdout.split('\n'):
-            if ': ' in line:
-                key, value = line.split(': ', 1)
-                key = key.strip('[]')
-                value = value.strip('[]')
-                props[key] = value
-        
-        return {
-            'udid': udid,
-            'platform_name': 'Android',
-            'platform_version': props.get('ro.build.version.release', ''),
-            'device_name': props.get('ro.product.model', '')
-        }
-    except Exception as e:
-        print(f"Error getting device info for {udid}: {str(e)}")
-        return None
-
 def update_devices_csv(connected_devices):
     """Update devices.csv with currently connected devices"""
     try:
@@ -200,17 +164,17 @@ def update_devices_csv(connected_devices):
         print(f"Error updating devices.csv: {str(e)}")
         return False
 
-def load_configurations():
-    """Load device and user configurations from CSV files"""
+def load_configurations(discover=True):
+    """Load device and user configurations from CSV files (discover=False: use devices.csv as-is)"""
     try:
         # Get connected devices first
-        connected_devices = get_connected_devices()
-        if not connected_devices:
+        connected_devices = get_connected_devices() if discover else None
+        if discover and not connected_devices:
             print("No devices connected!")
             return [], []
             
         # Update devices.csv with connected devices
-        if not update_devices_csv(connected_devices):
+        if discover and not update_devices_csv(connected_devices):
             print("Failed to update devices configuration!")
             return [], []
         
@@ -251,62 +215,24 @@ def load_configurations():
 def load_test_cases_from_csv():
     """Read test scenarios from CSV files"""
     try:
-        cases_data = read_csv_file(TEST_CASES_CSV)
-        steps_data = read_csv_file(TEST_STEPS_CSV)
-        
-        test_cases = []
-        for case in cases_data:
-            # Get all steps for current test case
-            case_steps = [step for step in steps_data if step['test_id'] == case['test_id']]
-            # Sort steps by order
-            case_steps.sort(key=lambda x: int(x['step_order']))
-            
-            steps = []
-            for step in case_steps:
-                test_step = TestStep(
-                    action=step['action'],
-                    selector_type=step['selector_type'],
-                    selector_value=step['selector_value'],
-                    input_value=step['input_value'] if step['input_value'] else None,
-                    description=step['description'] if step['description'] else None
-                )
-                steps.append(test_step)
-            
-            test_case = TestCase(
-                test_id=case['test_id'],
-                screen_id=case['screen_id'],
-                url=case['url'],
-                description=case['description'],
-                steps=steps,
-                expected_result=case['expected_result']
-            )
-            test_cases.append(test_case)
-            
-        return test_cases
+        return load_test_cases(TEST_CASES_CSV, TEST_STEPS_CSV)
     except Exception as e:
         print(f"Error loading test cases: {str(e)}")
         return []
 
 def log_result(lang, test_id, screen_id, status, message, device_id, user_id, description=None):
-    """Thread-safe logging of test results"""
-    with csv_lock:
-        file_exists = os.path.isfile(RESULT_CSV_FILE)
-        with open(RESULT_CSV_FILE, mode='a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            if not file_exists:
-                writer.writerow(['timestamp', 'device_id', 'user_id', 'language', 
-                               'test_id', 'screen_id', 'description', 'status', 'message'])
-            writer.writerow([
-                datetime.now().isoformat(),
-                device_id,
-                user_id,
-                lang,
-                test_id,
-                screen_id,
-                description,
-                status,
-                message
-            ])
+    """Thread-safe logging of test results (queued for the background writer)"""
+    result_sink.write({
+        'timestamp': datetime.now().isoformat(),
+        'device_id': device_id,
+        'user_id': user_id,
+        'language': lang,
+        'test_id': test_id,
+        'screen_id': screen_id,
+        'description': description,
+        'status': status,
+        'message': message
+    })
 
 def kill_app_process(device_udid, app_package, clear_data=False):
     """앱 프로세스 종료 (데이터 유지 옵션)"""
@@ -337,15 +263,11 @@ def kill_app_process(device_udid, app_package, clear_data=False):
             else:
                 print(f"⚠️ 앱 데이터 정리 실패: {clear_result.stderr}")
         
-        # 앱 프로세스 확인
-        check_result = subprocess.run([
-            'adb', '-s', device_udid, 'shell', 'ps', '|', 'grep', app_package
-        ], check=False, capture_output=True, text=True, timeout=5, shell=True)
-        
-        if app_package in check_result.stdout:
-            print("⚠️ 앱이 여전히 실행 중일 수 있음")
-        else:
+        # 앱 프로세스 종료 확인 (pidof 폴링)
+        if wait_for_app_exit(device_udid, app_package):
             print("✅ 앱 완전 종료 확인")
+        else:
+            print("⚠️ 앱이 여전히 실행 중일 수 있음")
         
         return True
     except subprocess.TimeoutExpired:
@@ -355,8 +277,9 @@ def kill_app_process(device_udid, app_package, clear_data=False):
         print(f"❌ 앱 종료 중 오류: {str(e)}")
         return False
 
-def restart_app(driver, device_udid, app_package, app_activity, clear_data=False):
-    """앱 재시작 (데이터 유지 옵션)"""
+def restart_app(driver, device_udid, app_package, app_activity, clear_data=False, webview_name=None):
+    """앱 재시작 (데이터 유지 옵션, 프로세스/WEBVIEW 준비 즉시 반환)"""
+    restart_start = time.time()
     try:
         print(f"🔄 앱 재시작 중: {app_package} (데이터 {'정리' if clear_data else '유지'})")
         
@@ -367,11 +290,12 @@ def restart_app(driver, device_udid, app_package, app_activity, clear_data=False
         except Exception as e:
             print(f"⚠️ Appium을 통한 앱 종료 실패: {e}")
         
-        time.sleep(2)
-        
-        # 2. 앱 프로세스 강제 종료 (데이터 유지)
+        # 2. 앱 프로세스 강제 종료 (데이터 유지, 종료 확인까지 대기)
         kill_app_process(device_udid, app_package, clear_data=clear_data)
-        time.sleep(2)
+        
+        # 앱 데이터를 정리하면 로그인 세션도 사라짐
+        if clear_data:
+            get_auth_session_manager().invalidate(device_udid)
         
         # 3. 앱 재시작 (데이터 유지)
         try:
@@ -391,16 +315,21 @@ def restart_app(driver, device_udid, app_package, app_activity, clear_data=False
                 print(f"❌ adb를 통한 앱 시작도 실패: {adb_e}")
                 return False
         
-        time.sleep(3)
+        # 4. 프로세스 기동 및 WEBVIEW 컨텍스트 노출 대기
+        ready = wait_for_app_ready(driver, device_udid, app_package, webview_name)
+        latency = time.time() - restart_start
+        get_restart_stats().add(RestartRecord(device_udid, app_package, latency, ready))
         
-        print(f"🎉 앱 재시작 성공: {app_package}")
+        if not ready:
+            print(f"⚠️ 앱 준비 확인 시간 초과 ({latency:.1f}s): {app_package}")
+        print(f"🎉 앱 재시작 성공: {app_package} ({latency:.1f}s)")
         return True
     except Exception as e:
         print(f"❌ 앱 재시작 실패: {str(e)}")
         return False
 
-def get_driver(device_config, user_config, appium_port):
-    """Initialize Appium driver with device-specific capabilities"""
+def build_capabilities(device_config, user_config):
+    """Build UiAutomator2 capabilities shared by the thread and asyncio orchestrators"""
     # 디바이스 설정 우선, 없으면 사용자 설정, 마지막으로 환경변수 사용
     app_package = (device_config.app_package or 
                   user_config.app_package or 
@@ -409,6 +338,9 @@ def get_driver(device_config, user_config, appium_port):
     app_activity = (device_config.app_activity or 
                    os.getenv('DEFAULT_APP_ACTIVITY', 'com.mcnc.bizmob.cesco.SlideFragmentActivity'))
     
+    # udid별 고정 슬롯 포트 (실행 간 동일, 디바이스 간 충돌 없음)
+    ports = get_device_ports(device_config.udid)
+    
     capabilities = dict(
         platformName=device_config.platform_name,
         platformVersion=device_config.platform_version,
@@ -430,7 +362,8 @@ def get_driver(device_config, user_config, appium_port):
         uiautomator2ServerInstallTimeout=120000,  # 2분
         uiautomator2ServerLaunchTimeout=120000,   # 2분
         adbExecTimeout=120000,  # 2분
-        systemPort=8200 + hash(device_config.udid) % 1000,  # 고유 포트 할당
+        systemPort=ports.system_port,  # 고유 포트 할당
+        chromedriverPort=ports.chromedriver_port,
         autoWebview=False,  # 수동 웹뷰 전환
         recreateChromeDriverSessions=True,  # 세션 재생성
         chromeOptions={
@@ -445,12 +378,26 @@ def get_driver(device_config, user_config, appium_port):
             ]
         }
     )
+    return capabilities
+
+def get_driver(device_config, user_config, appium_port):
+    """Initialize Appium driver with device-specific capabilities"""
+    capabilities = build_capabilities(device_config, user_config)
     options = UiAutomator2Options().load_capabilities(capabilities)
     appium_host = os.getenv('APPIUM_HOST', 'localhost')
     driver = webdriver.Remote(f'http://{appium_host}:{appium_port}', options=options)
+    driver = record_driver(driver, device_config.udid)
     driver.implicitly_wait(int(os.getenv('IMPLICIT_WAIT', '10')))
     return driver
 
+def acquire_driver(device_config, user_config, appium_port):
+    """Get a pooled Appium session for the device, creating one only when needed"""
+    app_package = (device_config.app_package or 
+                  user_config.app_package or 
+                  os.getenv('DEFAULT_APP_PACKAGE', 'com.cesco.oversea.srs.viet'))
+    key = (device_config.udid, app_package, appium_port)
+    return get_session_pool().acquire(key, lambda: get_driver(device_config, user_config, appium_port))
+
 def change_language(driver, wait, lang, country_code):
     """Change application language based on country settings"""
     try:
@@ -490,24 +437,30 @@ def login(driver, wait, user_config):
 
 def execute_test_step(driver, wait, step):
     """Execute a single test step"""
+    profiler = get_step_profiler()
     try:
         selector = (getattr(AppiumBy, step.selector_type.upper()), step.selector_value)
         
-        if step.action.lower() == 'click':
-            element = wait.until(EC.element_to_be_clickable(selector))
-            element.click()
-        elif step.action.lower() == 'input':
-            element = wait.until(EC.presence_of_element_located(selector))
-            element.clear()
-            if step.input_value:
-                element.send_keys(step.input_value)
-        elif step.action.lower() == 'verify':
-            element = wait.until(EC.presence_of_element_located(selector))
-            assert element.is_displayed(), "Element not visible"
-            if step.input_value:
-                assert step.input_value in element.text, f"Expected text '{step.input_value}' not found"
-        
-        time.sleep(SLEEP_TIME)
+        with profiler.step(f"{step.action} {step.selector_value}"):
+            if step.action.lower() == 'click':
+                element = wait_until(driver, wait, EC.element_to_be_clickable(selector))
+                with profiler.span('action', 'click'):
+                    element.click()
+            elif step.action.lower() == 'input':
+                element = wait_until(driver, wait, EC.presence_of_element_located(selector))
+                with profiler.span('action', 'input'):
+                    element.clear()
+                    if step.input_value:
+                        element.send_keys(step.input_value)
+            elif step.action.lower() == 'verify':
+                element = wait_until(driver, wait, EC.presence_of_element_located(selector))
+                with profiler.span('action', 'verify'):
+                    assert element.is_displayed(), "Element not visible"
+                    if step.input_value:
+                        assert step.input_value in element.text, f"Expected text '{step.input_value}' not found"
+            
+            with profiler.span('sleep', 'page_ready'):
+                wait_for_page_ready(driver, SLEEP_TIME)
         return True
     except Exception as e:
         print(f"Step execution failed: {str(e)}")
@@ -515,6 +468,11 @@ def execute_test_step(driver, wait, step):
 
 def run_test_case(driver, wait, lang, test_case, device_config, user_config):
     """Execute a complete test case"""
+    with get_step_profiler().context(device=device_config.device_id, language=lang, test_id=test_case.test_id):
+        return _run_test_case(driver, wait, lang, test_case, device_config, user_config)
+
+def _run_test_case(driver, wait, lang, test_case, device_config, user_config):
+    profiler = get_step_profiler()
     try:
         # 테스트 케이스 시작 전 앱 상태 확인 및 재시작
         restart_between_tests = os.getenv('RESTART_APP_BETWEEN_TESTS', 'true').lower() == 'true'
@@ -527,20 +485,26 @@ def run_test_case(driver, wait, lang, test_case, device_config, user_config):
                            os.getenv('DEFAULT_APP_ACTIVITY', 'com.mcnc.bizmob.cesco.SlideFragmentActivity'))
             
             print(f"🔄 테스트 케이스 전 앱 재시작: {test_case.test_id} (데이터 {'정리' if clear_app_data else '유지'})")
-            restart_app(driver, device_config.udid, app_package, app_activity, clear_data=clear_app_data)
+            with profiler.span('wait', 'restart_app'):
+                restart_app(driver, device_config.udid, app_package, app_activity, clear_data=clear_app_data,
+                            webview_name=device_config.webview_name or user_config.webview_name)
         
         if test_case.url:
             full_url = BASE_URL + test_case.url
-            driver.get(full_url)
-            time.sleep(SLEEP_TIME)
-
-        for step in test_case.steps:
+            with profiler.span('action', 'navigate'):
+                driver.get(full_url)
+                # 새 문서에 계측을 설치해 두어 첫 스텝 액션이 시작한 요청도 대기 조건에 포함
+                arm_page_probe(driver)
+            profiler.sleep(SLEEP_TIME)
+
+        # DOM_BATCH=true면 연속된 DOM 스텝은 execute_script 1회로 실행하고 나머지만 WebDriver로 실행
+        for step in run_dom_batches(driver, test_case.steps, lambda: wait_for_page_ready(driver, SLEEP_TIME)):
             if not execute_test_step(driver, wait, step):
                 raise Exception(f"Step failed: {step.description}")
 
         screenshot_path = os.path.join(SCREENSHOT_DIR, 
             f"{device_config.device_id}_{user_config.user_id}_{lang}_{test_case.test_id}_{test_case.screen_id}_pass.png")
-        driver.save_screenshot(screenshot_path)
+        screenshots.capture(driver, screenshot_path, 'pass')
         
         log_result(lang, test_case.test_id, test_case.screen_id, "PASS", "", 
                   device_config.device_id, user_config.user_id, test_case.description)
@@ -548,7 +512,7 @@ def run_test_case(driver, wait, lang, test_case, device_config, user_config):
     except Exception as e:
         screenshot_path = os.path.join(SCREENSHOT_DIR,
             f"{device_config.device_id}_{user_config.user_id}_{lang}_{test_case.test_id}_{test_case.screen_id}_fail.png")
-        driver.save_screenshot(screenshot_path)
+        screenshots.capture(driver, screenshot_path, 'fail')
         
         log_result(lang, test_case.test_id, test_case.screen_id, "FAIL", str(e),
                   device_config.device_id, user_config.user_id, test_case.description)
@@ -642,17 +606,17 @@ def run_pair_tests(test_pair, test_cases, appium_port):
         clear_app_data = os.getenv('CLEAR_APP_DATA', 'false').lower() == 'true'
         print(f"\nPreparing app {app_package} on device {test_pair.device_config.udid}...")
         kill_app_process(test_pair.device_config.udid, app_package, clear_data=clear_app_data)
-        time.sleep(3)
         
         for user_config in test_pair.user_configs:
             print(f"\nTesting with user: {user_config.user_id} ({user_config.country_code})")
             
-            driver = get_driver(test_pair.device_config, user_config, appium_port)
+            driver = acquire_driver(test_pair.device_config, user_config, appium_port)
             wait = WebDriverWait(driver, int(os.getenv('EXPLICIT_WAIT', '20')))
             
             # 앱 재시작 (첫 번째 사용자만, 데이터 유지)
             if user_config == test_pair.user_configs[0]:
-                restart_app(driver, test_pair.device_config.udid, app_package, app_activity, clear_data=clear_app_data)
+                restart_app(driver, test_pair.device_config.udid, app_package, app_activity, clear_data=clear_app_data,
+                            webview_name=test_pair.device_config.webview_name or user_config.webview_name)
             
             try:
                 print("Available contexts:", driver.contexts)
@@ -663,39 +627,211 @@ def run_pair_tests(test_pair, test_cases, appium_port):
                 
                 for lang in test_pair.languages:
                     print(f"\nTesting language: {lang}")
-                    if not change_language(driver, wait, lang, user_config.country_code):
-                        continue
-                    
-                    if not login(driver, wait, user_config):
+                    # 로그인 상태면 언어만 변경, 세션이 만료된 경우에만 재로그인
+                    if not get_auth_session_manager().ensure_session(
+                            driver, wait, test_pair.device_config.udid, user_config, lang,
+                            change_language, login):
                         continue
                     
                     for test_case in test_cases:
+                        case_start = time.time()
                         run_test_case(driver, wait, lang, test_case, 
                                     test_pair.device_config, user_config)
-                    
-                    driver.get(BASE_URL + LOGIN_PATH)
-                    time.sleep(SLEEP_TIME)
+                        get_session_pool().record_test_time(time.time() - case_start)
                     
             finally:
-                driver.quit()
+                get_session_pool().release(driver)
                 
     except Exception as e:
         print(f"Test pair execution failed for {test_pair.pair_id}: {str(e)}")
 
-def main():
-    """Main execution function"""
-    # Check for connected devices first
-    connected_devices = get_connected_devices()
-    if not connected_devices:
+def run_device_worker(test_pair, scheduler, appium_port):
+    """Pull work items from the global queue and run them on one device"""
+    device_config = test_pair.device_config
+    udid = device_config.udid
+    driver = None
+    wait = None
+    current_user = None
+    current_lang = None
+    app_restarted = False
+    
+    app_package = (device_config.app_package or 
+                  test_pair.user_configs[0].app_package or 
+                  os.getenv('DEFAULT_APP_PACKAGE', 'com.cesco.oversea.srs.viet'))
+    app_activity = (device_config.app_activity or 
+                   os.getenv('DEFAULT_APP_ACTIVITY', 'com.mcnc.bizmob.cesco.SlideFragmentActivity'))
+    clear_app_data = os.getenv('CLEAR_APP_DATA', 'false').lower() == 'true'
+    
+    try:
+        print(f"\nPreparing app {app_package} on device {udid}...")
+        setup_start = time.time()
+        kill_app_process(udid, app_package, clear_data=clear_app_data)
+        scheduler.record(udid, 'setup', time.time() - setup_start)
+        
+        while True:
+            idle_start = time.time()
+            current_key = (current_user.user_id if current_user else None, current_lang)
+            item = scheduler.next_item(udid, current_key)
+            scheduler.record(udid, 'idle', time.time() - idle_start)
+            if item is None:
+                break
+            
+            setup_start = time.time()
+            try:
+                # 사용자가 바뀌면 드라이버 재생성
+                if current_user is None or item.user_config.user_id != current_user.user_id:
+                    if driver:
+                        get_session_pool().release(driver)
+                        driver = None
+                    print(f"\n[{device_config.device_id}] Testing with user: "
+                          f"{item.user_config.user_id} ({item.user_config.country_code})")
+                    current_user = None
+                    current_lang = None
+                    driver = acquire_driver(device_config, item.user_config, appium_port)
+                    wait = WebDriverWait(driver, int(os.getenv('EXPLICIT_WAIT', '20')))
+                    
+                    # 앱 재시작 (첫 번째 사용자만, 데이터 유지)
+                    if not app_restarted:
+                        restart_app(driver, udid, app_package, app_activity, clear_data=clear_app_data,
+                                    webview_name=device_config.webview_name or item.user_config.webview_name)
+                        app_restarted = True
+                    
+                    print("Available contexts:", driver.contexts)
+                    webview_context = device_config.webview_name or item.user_config.webview_name
+                    driver.switch_to.context(webview_context)
+                    current_user = item.user_config
+                
+                # 언어가 바뀌면 로그인 상태에서 언어 변경 (세션 만료 시에만 재로그인)
+                if item.language != current_lang:
+                    current_lang = None
+                    print(f"\n[{device_config.device_id}] Testing language: {item.language}")
+                    if not get_auth_session_manager().ensure_session(
+                            driver, wait, udid, current_user, item.language, change_language, login):
+                        dropped = scheduler.drop_bucket(item.bucket_key)
+                        print(f"Skipping {dropped + 1} work item(s) for user {current_user.user_id}, "
+                              f"language {item.language}")
+                        continue
+                    current_lang = item.language
+            except Exception as e:
+                print(f"Device setup failed on {device_config.device_id}: {str(e)}")
+                if driver:
+                    get_session_pool().release(driver, healthy=False)
+                    get_auth_session_manager().invalidate(udid)
+                    driver = None
+                dropped = scheduler.drop_bucket(item.bucket_key)
+                print(f"Skipping {dropped + 1} work item(s) for user {item.user_config.user_id}, "
+                      f"language {item.language}")
+                current_user = None
+                current_lang = None
+                continue
+            finally:
+                scheduler.record(udid, 'setup', time.time() - setup_start)
+            
+            busy_start = time.time()
+            run_test_case(driver, wait, item.language, item.test_case, device_config, current_user)
+            scheduler.record(udid, 'busy', time.time() - busy_start, completed=True)
+            get_session_pool().record_test_time(time.time() - busy_start)
+    
+    except Exception as e:
+        print(f"Device worker failed for {device_config.device_id}: {str(e)}")
+    finally:
+        if driver:
+            get_session_pool().release(driver)
+        scheduler.finish_device(udid)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Parallel Appium test runner')
+    parser.add_argument('--orchestrator', choices=['threads', 'asyncio'],
+                        default=ORCHESTRATOR if ORCHESTRATOR in ('threads', 'asyncio') else 'threads',
+                        help='threads: one thread per device, asyncio: one event loop driving the W3C HTTP API')
+    parser.add_argument('--mode', choices=['local', 'coordinator', 'worker'], default='local',
+                        help='coordinator: serve the work queue over HTTP, worker: run shards from a coordinator')
+    parser.add_argument('--coordinator', default=os.getenv('COORDINATOR_URL', ''),
+                        help='coordinator URL for worker mode (e.g. http://10.0.0.5:8765)')
+    parser.add_argument('--udids', default='',
+                        help='worker mode: comma separated udids (default: connected devices)')
+    parser.add_argument('--bind', default=COORDINATOR_BIND, help='coordinator bind address')
+    parser.add_argument('--port', type=int, default=COORDINATOR_PORT, help='coordinator port')
+    parser.add_argument('--local-workers', type=int, default=0,
+                        help='coordinator mode: also start N worker processes on this machine')
+    return parser.parse_args(argv)
+
+def run_coordinator(args, test_pairs, test_cases):
+    """Serve the work queue to workers and write their streamed results to the local result sink"""
+    coordinator = ShardCoordinator(test_pairs, test_cases, result_sink.write, args.bind, args.port)
+    coordinator.start()
+    workers = []
+    if args.local_workers:
+        workers = launch_local_workers(os.path.abspath(__file__), coordinator.url,
+                                       partition_udids(test_pairs, args.local_workers))
+    try:
+        coordinator.wait(processes=workers)
+        for process in workers:
+            try:
+                process.wait(timeout=COORDINATOR_HTTP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.terminate()
+    finally:
+        coordinator.stop()
+    for item in coordinator.unrun_items:
+        log_result(item.language, item.test_case.test_id, item.test_case.screen_id, 'FAIL',
+                   'Not run: no worker available', '', item.user_config.user_id, item.test_case.description)
+    status = coordinator.get_status()
+    print(f"\n🛰️ 워커 {len(status['workers'])}개, 결과 {status['results_received']}건 수신, "
+          f"재할당 작업 {status['requeued_items']}건")
+    coordinator.scheduler.print_utilization_report()
+
+def run_worker_mode(args):
+    """Register local devices with the coordinator and stream results back to it"""
+    global result_sink
+    if not args.coordinator:
+        print("--coordinator URL is required in worker mode")
+        return
+    result_sink = create_result_sink(args.coordinator.rstrip('/') + '/results', RESULT_FIELDS, backend='http')
+    udids = [udid for udid in args.udids.split(',') if udid] or [d['udid'] for d in get_connected_devices()]
+    if not udids:
         print("No devices connected. Please connect devices and try again.")
         return
-        
-    print(f"Found {len(connected_devices)} connected device(s):")
-    for device in connected_devices:
-        print(f"- {device['device_name']} ({device['udid']})")
+    run_worker(args.coordinator, udids, run_device_worker, get_appium_server_pool().prepare)
+
+def run_asyncio_orchestrator(test_pairs, test_cases, appium_ports):
+    """Run the work queue on a single asyncio event loop"""
+    orchestrator = AsyncOrchestrator(
+        test_cases,
+        build_capabilities=build_capabilities,
+        log_result=log_result,
+        screenshot_dir=SCREENSHOT_DIR,
+        base_url=BASE_URL,
+        country_settings=COUNTRY_SETTINGS,
+        sleep_time=SLEEP_TIME
+    )
+    scheduler = asyncio.run(orchestrator.run(test_pairs, appium_ports))
+    scheduler.print_utilization_report()
+
+def main(argv=None):
+    """Main execution function"""
+    args = parse_args(argv)
+    
+    if args.mode == 'worker':
+        run_worker_mode(args)
+        print_reports()
+        return
+    
+    # 코디네이터는 다른 호스트의 디바이스도 다루므로 devices.csv를 그대로 사용
+    coordinator_mode = args.mode == 'coordinator'
+    if not coordinator_mode:
+        # Check for connected devices first
+        connected_devices = get_connected_devices()
+        if not connected_devices:
+            print("No devices connected. Please connect devices and try again.")
+            return
+            
+        print(f"Found {len(connected_devices)} connected device(s):")
+        for device in connected_devices:
+            print(f"- {device['device_name']} ({device['udid']})")
     
     # Load configurations
-    devices, users = load_configurations()
+    devices, users = load_configurations(discover=not coordinator_mode)
     if not devices or not users:
         print("Failed to load required configurations")
         return
@@ -716,30 +852,86 @@ def main():
     for pair in test_pairs:
         print(f"- {pair.pair_id}: {pair.description}")
     
-    # Create a thread pool for parallel execution
-    with ThreadPoolExecutor(max_workers=len(test_pairs)) as executor:
-        futures = []
-        for i, pair in enumerate(test_pairs):
-            base_port = int(os.getenv('APPIUM_PORT', '4723'))
-            appium_port = base_port + i
+    if coordinator_mode:
+        run_coordinator(args, test_pairs, test_cases)
+        print_reports()
+        return
+    
+    # 디바이스별 Appium 서버 시작 또는 기존 서버 재사용
+    appium_ports = get_appium_server_pool().prepare(pair.device_config.udid for pair in test_pairs)
+    
+    if args.orchestrator == 'asyncio':
+        run_asyncio_orchestrator(test_pairs, test_cases, appium_ports)
+    elif SCHEDULER_MODE == 'pair':
+        # Create a thread pool for parallel execution
+        with ThreadPoolExecutor(max_workers=len(test_pairs)) as executor:
+            futures = []
+            for pair in test_pairs:
+                appium_port = appium_ports[pair.device_config.udid]
+                
+                print(f"\nInitializing test pair {pair.pair_id}:")
+                print(f"- Description: {pair.description}")
+                print(f"- Device: {pair.device_config.device_id} ({pair.device_config.udid})")
+                print(f"- Users: {[user.user_id for user in pair.user_configs]}")
+                print(f"- Languages: {pair.languages}")
+                print(f"- Appium Port: {appium_port}")
+                
+                future = executor.submit(run_pair_tests, pair, test_cases, appium_port)
+                futures.append(future)
             
-            print(f"\nInitializing test pair {pair.pair_id}:")
-            print(f"- Description: {pair.description}")
-            print(f"- Device: {pair.device_config.device_id} ({pair.device_config.udid})")
-            print(f"- Users: {[user.user_id for user in pair.user_configs]}")
-            print(f"- Languages: {pair.languages}")
-            print(f"- Appium Port: {appium_port}")
+            # Wait for all tests to complete
+            for future in futures:
+                future.result()
+    else:
+        # 전역 작업 큐: 디바이스당 워커 하나가 남은 작업을 가져가 실행
+        scheduler = build_scheduler(test_pairs, test_cases)
+        device_pairs = {}
+        for pair in test_pairs:
+            device_pairs.setdefault(pair.device_config.udid, []).append(pair)
+        
+        print(f"\nScheduling {scheduler.total_items} work item(s) on {len(device_pairs)} device(s)")
+        
+        with ThreadPoolExecutor(max_workers=len(device_pairs)) as executor:
+            futures = []
+            for udid, pairs in device_pairs.items():
+                appium_port = appium_ports[udid]
+                pair = pairs[0]
+                scheduler.register_device(pair.device_config.device_id, udid, [p.pair_id for p in pairs])
+                
+                print(f"\nInitializing device worker {pair.device_config.device_id} ({udid}):")
+                print(f"- Pairs: {[p.pair_id for p in pairs]}")
+                print(f"- Appium Port: {appium_port}")
+                
+                future = executor.submit(run_device_worker, pair, scheduler, appium_port)
+                futures.append(future)
             
-            future = executor.submit(run_pair_tests, pair, test_cases, appium_port)
-            futures.append(future)
+            for future in futures:
+                future.result()
         
-        # Wait for all tests to complete
-        for future in futures:
-            future.result()
+        scheduler.print_utilization_report()
+    
+    print_reports()
+
+def print_reports():
+    """Close pooled sessions, print run reports and flush the result sink"""
+    get_session_pool().close_all()
+    get_session_pool().print_report()
+    get_appium_server_pool().print_report()
+    get_appium_server_pool().shutdown()
+    get_readiness_stats().print_report()
+    get_restart_stats().print_report()
+    get_auth_session_manager().print_report()
+    get_scenario_cache().print_report()
+    get_step_profiler().print_report()
+    get_dom_batch_stats().print_report()
+    get_step_profiler().save('parallel_profile')
+    screenshots.close()
+    screenshots.print_report()
+    result_sink.close()
     
     print("\nAll tests completed. Check results in:")
     print(f"- Screenshots: {SCREENSHOT_DIR}")
-    print(f"- Test Results: {RESULT_CSV_FILE}")
+    print(f"- Test Results: {result_sink.path}")
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
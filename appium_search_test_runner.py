@@ -10,6 +10,10 @@ from appium.webdriver.common.appiumby import AppiumBy
 from appium.options.android import UiAutomator2Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from result_sink import create_result_sink
+from scenario_cache import load_cached
+from step_profiler import get_step_profiler, wait_until
+from screenshot_service import get_screenshot_service
 
 start_time = datetime.now().strftime('%Y%m%d_%H%M%S')
 
@@ -20,6 +24,9 @@ os.makedirs(SCREENSHOT_DIR, exist_ok=True)
 #TEST_DEFINITION_FILE = 'test_cases_navi.json'
 TEST_DEFINITION_FILE = 'test_cases_search.json'
 RESULT_CSV_FILE = 'test_results.csv'
+result_sink = create_result_sink(
+    RESULT_CSV_FILE, ['timestamp', 'language', 'test_id', 'screen_id', 'status', 'message'])
+screenshots = get_screenshot_service()
 #BASE_URL = "../"  # 접속할 기본 URL
 BASE_URL = "http://localhost/"  # 접속할 기본 URL
 BASE_URL = "http://10.200.11.143:8080/"  # 접속할 기본 URL
@@ -63,15 +70,20 @@ def get_driver():
 
 # 테스트 결과 로그 저장
 def log_result(lang, test_id, screen_id, status, message):
-    file_exists = os.path.isfile(RESULT_CSV_FILE)
-    with open(RESULT_CSV_FILE, mode='a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(['timestamp', 'language', 'test_id', 'screen_id', 'status', 'message'])
-        writer.writerow([datetime.now().isoformat(), lang, test_id, screen_id, status, message])
+    result_sink.write({
+        'timestamp': datetime.now().isoformat(),
+        'language': lang,
+        'test_id': test_id,
+        'screen_id': screen_id,
+        'status': status,
+        'message': message
+    })
     
 # 테스트 케이스 로딩
 def load_test_cases():
+    return load_cached('json_test_cases', [TEST_DEFINITION_FILE], _parse_test_definition)
+
+def _parse_test_definition():
     with open(TEST_DEFINITION_FILE, encoding='utf-8') as f:
         return json.load(f)
 
@@ -122,7 +134,7 @@ def login(driver, wait):
                 print("✅ 로그인 버튼 클릭 성공")
                 time.sleep(SLEEP_TIME)
                 screenshot_path = os.path.join(SCREENSHOT_DIR, f"LOGIN_pass.png")
-                driver.save_screenshot(screenshot_path)
+                screenshots.capture(driver, screenshot_path, 'pass')
                 print("[로그인] 완료")
                 return True
             except Exception as e:
@@ -147,83 +159,97 @@ def test_navigation(driver, wait):
 def run_test_case(driver, wait, lang, case):
     test_id = case.get("test_id")
     screen_id = case.get("screen_id")
-    try:
-        url = case.get("url")
-        if url:
-            driver.get(url)
-            time.sleep(SLEEP_TIME)
+    profiler = get_step_profiler()
+    with profiler.context(language=lang, test_id=test_id):
+        try:
+            url = case.get("url")
+            if url:
+                with profiler.span('action', 'navigate'):
+                    driver.get(url)
+                profiler.sleep(SLEEP_TIME)
 
-        for step in case.get("steps", []):
-            action = step.get("action")
-            selector = step.get("selector")
-            value = step.get("value")
-            if action == "click":
-                el = wait.until(EC.element_to_be_clickable((AppiumBy.XPATH, selector)))
-                el.click()
-            elif action == "input":
-                el = wait.until(EC.presence_of_element_located((AppiumBy.XPATH, selector)))
-                el.clear()
-                el.send_keys(value)
+            for step in case.get("steps", []):
+                action = step.get("action")
+                selector = step.get("selector")
+                value = step.get("value")
+                with profiler.step(f"{action} {selector}"):
+                    if action == "click":
+                        el = wait_until(driver, wait, EC.element_to_be_clickable((AppiumBy.XPATH, selector)))
+                        with profiler.span('action', 'click'):
+                            el.click()
+                    elif action == "input":
+                        el = wait_until(driver, wait, EC.presence_of_element_located((AppiumBy.XPATH, selector)))
+                        with profiler.span('action', 'input'):
+                            el.clear()
+                            el.send_keys(value)
 
-        expected = case.get("assert_text")
-        if expected:
-            body = driver.page_source
-            assert expected in body, f"'{expected}' not found"
+            expected = case.get("assert_text")
+            if expected:
+                with profiler.span('action', 'assert_text'):
+                    body = driver.page_source
+                assert expected in body, f"'{expected}' not found"
 
-        screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_{test_id}_{screen_id}_pass.png")
-        driver.save_screenshot(screenshot_path)
-        log_result(lang, test_id, screen_id, "PASS", "")
-    except Exception as e:
-        screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_{test_id}_{screen_id}_fail.png")
-        driver.save_screenshot(screenshot_path)
-        log_result(lang, test_id, screen_id, "FAIL", str(e))
+            screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_{test_id}_{screen_id}_pass.png")
+            screenshots.capture(driver, screenshot_path, 'pass')
+            log_result(lang, test_id, screen_id, "PASS", "")
+        except Exception as e:
+            screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_{test_id}_{screen_id}_fail.png")
+            screenshots.capture(driver, screenshot_path, 'fail')
+            log_result(lang, test_id, screen_id, "FAIL", str(e))
 # 서치 테스트 실행
 def search_test_case(driver, wait, lang, case):
     test_id = case.get("test_id")
     screen_id = case.get("screen_id") 
+    profiler = get_step_profiler()
 
-    try:
-        #if(screen_id=="CUS1000" and lang=="ko"):
-        url = BASE_URL+case.get("url")
-        if url:
-            driver.get(url)
-            time.sleep(SLEEP_TIME)
+    with profiler.context(language=lang, test_id=test_id):
+        try:
+            #if(screen_id=="CUS1000" and lang=="ko"):
+            url = BASE_URL+case.get("url")
+            if url:
+                with profiler.span('action', 'navigate'):
+                    driver.get(url)
+                profiler.sleep(SLEEP_TIME)
 
-        for step in case.get("steps", []):
-            action = step.get("action")
-            selector_css = step.get("selector_css")
-            selector_xpath = step.get("selector_xpath")
-            selector_id = step.get("selector_id")
-            value = step.get("value")
-            if action == "click":
-                #el = wait.until(EC.element_to_be_clickable((AppiumBy.XPATH, selector_css)))
-                #el = wait.until(EC.element_to_be_clickable((AppiumBy.CSS_SELECTOR, selector_css)))
-                el = wait.until(EC.element_to_be_clickable((AppiumBy.ID, selector_id)))
-                el.click()
-            elif action == "input":
-                #el = wait.until(EC.presence_of_element_located((AppiumBy.XPATH, selector_css)))
-                #el = wait.until(EC.presence_of_element_located((AppiumBy.CSS_SELECTOR, selector_css)))
-                #el = wait.until(EC.presence_of_element_located((AppiumBy.CSS_SELECTOR, ".active > input")))
-                el = wait.until(EC.presence_of_element_located((AppiumBy.XPATH, "//input[@placeholder='검색어 입력']")))
-                #el = wait.until(EC.presence_of_element_located((AppiumBy.ID, selector_id)))
-                try:
-                    el.clear()
-                    el.send_keys(value)
-                except Exception as e:
-                    print(f"[입력 실패]: {e}")
+            for step in case.get("steps", []):
+                action = step.get("action")
+                selector_css = step.get("selector_css")
+                selector_xpath = step.get("selector_xpath")
+                selector_id = step.get("selector_id")
+                value = step.get("value")
+                with profiler.step(f"{action} {selector_id or selector_css}"):
+                    if action == "click":
+                        #el = wait.until(EC.element_to_be_clickable((AppiumBy.XPATH, selector_css)))
+                        #el = wait.until(EC.element_to_be_clickable((AppiumBy.CSS_SELECTOR, selector_css)))
+                        el = wait_until(driver, wait, EC.element_to_be_clickable((AppiumBy.ID, selector_id)))
+                        with profiler.span('action', 'click'):
+                            el.click()
+                    elif action == "input":
+                        #el = wait.until(EC.presence_of_element_located((AppiumBy.XPATH, selector_css)))
+                        #el = wait.until(EC.presence_of_element_located((AppiumBy.CSS_SELECTOR, selector_css)))
+                        #el = wait.until(EC.presence_of_element_located((AppiumBy.CSS_SELECTOR, ".active > input")))
+                        el = wait_until(driver, wait, EC.presence_of_element_located((AppiumBy.XPATH, "//input[@placeholder='검색어 입력']")))
+                        #el = wait.until(EC.presence_of_element_located((AppiumBy.ID, selector_id)))
+                        try:
+                            with profiler.span('action', 'input'):
+                                el.clear()
+                                el.send_keys(value)
+                        except Exception as e:
+                            print(f"[입력 실패]: {e}")
 
-        expected = case.get("assert_text")
-        if expected:
-            body = driver.page_source
-            assert expected in body, f"'{expected}' not found"
+            expected = case.get("assert_text")
+            if expected:
+                with profiler.span('action', 'assert_text'):
+                    body = driver.page_source
+                assert expected in body, f"'{expected}' not found"
 
-        screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_{test_id}_{screen_id}_pass.png")
-        driver.save_screenshot(screenshot_path)
-        log_result(lang, test_id, screen_id, "PASS", "")
-    except Exception as e:
-        screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_{test_id}_{screen_id}_fail.png")
-        driver.save_screenshot(screenshot_path)
-        log_result(lang, test_id, screen_id, "FAIL", str(e))
+            screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_{test_id}_{screen_id}_pass.png")
+            screenshots.capture(driver, screenshot_path, 'pass')
+            log_result(lang, test_id, screen_id, "PASS", "")
+        except Exception as e:
+            screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_{test_id}_{screen_id}_fail.png")
+            screenshots.capture(driver, screenshot_path, 'fail')
+            log_result(lang, test_id, screen_id, "FAIL", str(e))
 # 서치 테스트 실행
 def search_test(driver, wait, lang):
     
@@ -239,11 +265,11 @@ def search_test(driver, wait, lang):
             el.click()
         time.sleep(SLEEP_TIME)
         screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_search_pass.png")
-        driver.save_screenshot(screenshot_path)
+        screenshots.capture(driver, screenshot_path, 'pass')
         #log_result(lang, test_id, screen_id, "PASS", "")
     except Exception as e:
         screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_search_fail.png")
-        driver.save_screenshot(screenshot_path)
+        screenshots.capture(driver, screenshot_path, 'fail')
         #log_result(lang, test_id, screen_id, "FAIL", str(e))
 # 네비게이션션 테스트 실행
 def navi_test_case(driver, wait, lang, case):
@@ -258,11 +284,11 @@ def navi_test_case(driver, wait, lang, case):
             time.sleep(SLEEP_TIME)
         print(f"[페이지 이동 ]: {go_url}")
         screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_{test_id}_{assert_text}_pass.png")
-        driver.save_screenshot(screenshot_path)
+        screenshots.capture(driver, screenshot_path, 'pass')
         log_result(lang, test_id, screen_id, "PASS", "")
     except Exception as e:
         screenshot_path = os.path.join(SCREENSHOT_DIR, f"{lang}_{test_id}_{assert_text}_fail.png")
-        driver.save_screenshot(screenshot_path)
+        screenshots.capture(driver, screenshot_path, 'fail')
         log_result(lang, test_id, screen_id, "FAIL", str(e))
 
 # unittest 실행
@@ -289,6 +315,10 @@ class TestAllLanguages(unittest.TestCase):
             # search_test(driver, wait, lang)
             go_login_page(driver, wait)
         driver.quit()
+        get_step_profiler().print_report()
+        get_step_profiler().save('search_profile')
+        screenshots.close()
+        screenshots.print_report()
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,251 @@
+"""
+Appium 서버 풀 관리 모듈
+디바이스(udid)마다 고정 슬롯을 배정하여 appium_port, systemPort, chromedriverPort를
+실행 간에도 같은 값으로 할당 (슬롯은 파일에 저장, hash(udid) 랜덤화로 인한 충돌 방지)
+디바이스별 Appium 서버가 이미 떠 있으면 /status 확인 후 재사용하고, 없으면 시작하여
+다음 실행에서도 재사용할 수 있도록 유지
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 잠금 없이 사용
+    fcntl = None
+
+# APPIUM_PORT_FILE, APPIUM_SERVER_* 설정은 포트 베이스와 같이 러너의 load_dotenv 이후 풀 생성 시 읽음
+
+LOCAL_HOSTS = ('localhost', '127.0.0.1', '0.0.0.0', '::1')
+
+@dataclass(frozen=True)
+class PortAllocation:
+    """디바이스 1대의 포트 할당"""
+    udid: str
+    slot: int
+    appium_port: int
+    system_port: int
+    chromedriver_port: int
+
+class PortRegistry:
+    """udid별 슬롯을 파일에 저장하는 포트 할당기 (여러 프로세스가 같은 파일 공유 가능)"""
+
+    def __init__(self, path: str = None, appium_base: int = None,
+                 system_base: int = None, chromedriver_base: int = None):
+        self.path = path or os.getenv('APPIUM_PORT_FILE', '.appium_ports.json')
+        self.appium_base = appium_base or int(os.getenv('APPIUM_PORT', '4723'))
+        self.system_base = system_base or int(os.getenv('SYSTEM_PORT_BASE', '8200'))
+        self.chromedriver_base = chromedriver_base or int(os.getenv('CHROMEDRIVER_PORT_BASE', '9515'))
+        self._lock = threading.Lock()
+        self._slots: Dict[str, int] = {}
+
+    def _allocation(self, udid: str, slot: int) -> PortAllocation:
+        return PortAllocation(udid=udid, slot=slot, appium_port=self.appium_base + slot,
+                              system_port=self.system_base + slot,
+                              chromedriver_port=self.chromedriver_base + slot)
+
+    def _read(self, f) -> Dict[str, int]:
+        f.seek(0)
+        content = f.read()
+        if not content.strip():
+            return {}
+        try:
+            data = json.loads(content)
+        except ValueError:
+            print(f"⚠️ 포트 할당 파일 손상 - 새로 생성: {self.path}")
+            return {}
+        return {udid: int(slot) for udid, slot in data.get('slots', {}).items()}
+
+    def allocate(self, udid: str) -> PortAllocation:
+        """udid의 포트 할당 (처음 보는 udid는 비어 있는 가장 작은 슬롯 배정 후 저장)"""
+        with self._lock:
+            if udid in self._slots:
+                return self._allocation(udid, self._slots[udid])
+
+            with open(self.path, 'a+', encoding='utf-8') as f:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    slots = self._read(f)
+                    if udid not in slots:
+                        used = set(slots.values())
+                        slots[udid] = next(slot for slot in range(len(used) + 1) if slot not in used)
+                        f.seek(0)
+                        f.truncate()
+                        json.dump({'slots': slots}, f, indent=2)
+                        f.flush()
+                finally:
+                    if fcntl:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+
+            self._slots.update(slots)
+            return self._allocation(udid, slots[udid])
+
+@dataclass
+class AppiumServer:
+    """디바이스별 Appium 서버"""
+    allocation: PortAllocation
+    host: str
+    status: str = 'unknown'   # attached, started, external, failed
+    process: Optional[subprocess.Popen] = None
+    startup_time: float = 0.0
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.allocation.appium_port}"
+
+def check_server(host: str, port: int, timeout: float = 2.0) -> bool:
+    """Appium /status 응답 확인"""
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}/status", timeout=timeout) as response:
+            value = json.loads(response.read() or b'{}').get('value', {})
+        return bool(value.get('ready', True))
+    except (OSError, ValueError):
+        return False
+
+class AppiumServerPool:
+    """디바이스별 Appium 서버 시작/재사용 관리"""
+
+    def __init__(self, host: str = None, registry: PortRegistry = None, mode: str = None):
+        self.host = host or os.getenv('APPIUM_HOST', 'localhost')
+        self.registry = registry or PortRegistry()
+        # auto: 살아 있는 서버 재사용, 없으면 시작 / attach: 기존 서버만 사용 / off: 서버 관리 안 함
+        self.mode = (mode or os.getenv('APPIUM_SERVER_MODE', 'auto')).lower()
+        self.binary = os.getenv('APPIUM_BINARY', 'appium')
+        self.start_timeout = float(os.getenv('APPIUM_SERVER_START_TIMEOUT', '60'))
+        # true면 직접 시작한 서버를 종료하지 않고 다음 실행에서 재사용
+        self.keep_warm = os.getenv('APPIUM_SERVER_KEEP_WARM', 'true').lower() == 'true'
+        self.log_dir = os.getenv('APPIUM_LOG_DIR', 'appium_logs')
+        self._lock = threading.Lock()
+        self._servers: Dict[str, AppiumServer] = {}
+
+    def ports_for(self, udid: str) -> PortAllocation:
+        return self.registry.allocate(udid)
+
+    def _start_server(self, server: AppiumServer) -> bool:
+        binary = shutil.which(self.binary)
+        if binary is None:
+            print(f"⚠️ Appium 실행 파일을 찾을 수 없음: {self.binary}")
+            return False
+
+        port = server.allocation.appium_port
+        os.makedirs(self.log_dir, exist_ok=True)
+        log_file = os.path.join(self.log_dir, f"appium_{port}.log")
+        command = [binary, '--address', self.host, '--port', str(port), '--log', log_file, '--log-no-colors']
+        start = time.time()
+        try:
+            # 다음 실행에서 재사용할 수 있도록 별도 세션으로 분리하여 실행
+            server.process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                              start_new_session=self.keep_warm)
+        except OSError as e:
+            print(f"❌ Appium 서버 시작 실패 (port {port}): {e}")
+            return False
+
+        deadline = start + self.start_timeout
+        while time.time() < deadline:
+            if server.process.poll() is not None:
+                print(f"❌ Appium 서버가 종료됨 (port {port}, 로그: {log_file})")
+                return False
+            if check_server(self.host, port):
+                server.startup_time = time.time() - start
+                return True
+            time.sleep(0.5)
+        print(f"❌ Appium 서버 시작 시간 초과 (port {port}, 로그: {log_file})")
+        return False
+
+    def ensure_server(self, udid: str) -> AppiumServer:
+        """udid용 서버 준비 (살아 있으면 재사용, 없으면 시작)"""
+        with self._lock:
+            server = self._servers.get(udid)
+            if server and server.status in ('attached', 'started', 'external'):
+                return server
+            server = AppiumServer(allocation=self.ports_for(udid), host=self.host)
+            self._servers[udid] = server
+
+        port = server.allocation.appium_port
+        if self.mode == 'off':
+            server.status = 'external'
+        elif check_server(self.host, port):
+            server.status = 'attached'
+            print(f"♻️ Appium 서버 재사용: {server.url} ({udid})")
+        elif self.mode == 'attach' or self.host not in LOCAL_HOSTS:
+            server.status = 'failed'
+            print(f"⚠️ Appium 서버 응답 없음: {server.url} ({udid})")
+        elif self._start_server(server):
+            server.status = 'started'
+            print(f"🚀 Appium 서버 시작: {server.url} ({udid}, {server.startup_time:.1f}s)")
+        else:
+            server.status = 'failed'
+        return server
+
+    def prepare(self, udids: Iterable[str]) -> Dict[str, int]:
+        """여러 디바이스의 서버를 동시에 준비하고 udid -> appium_port 반환"""
+        udids = list(dict.fromkeys(udids))
+        if not udids:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(udids), thread_name_prefix='appium-server') as executor:
+            servers = list(executor.map(self.ensure_server, udids))
+        return {server.allocation.udid: server.allocation.appium_port for server in servers}
+
+    def shutdown(self, force: bool = False):
+        """직접 시작한 서버 종료 (keep-warm이면 force일 때만)"""
+        if self.keep_warm and not force:
+            return
+        with self._lock:
+            servers = [server for server in self._servers.values() if server.process]
+        for server in servers:
+            server.process.terminate()
+            try:
+                server.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.process.kill()
+            server.status = 'stopped'
+
+    def get_report(self) -> Dict[str, Any]:
+        with self._lock:
+            servers = list(self._servers.values())
+        counts: Dict[str, int] = {}
+        for server in servers:
+            counts[server.status] = counts.get(server.status, 0) + 1
+        return {
+            'servers': len(servers),
+            'status': counts,
+            'startup_time': round(sum(server.startup_time for server in servers), 2),
+            'ports': {server.allocation.udid: [server.allocation.appium_port, server.allocation.system_port,
+                                               server.allocation.chromedriver_port] for server in servers}
+        }
+
+    def print_report(self):
+        report = self.get_report()
+        if not report['servers']:
+            return
+        print("\n🖥️ Appium 서버 풀 리포트:")
+        print(f"   서버: {report['servers']}개 - 재사용 {report['status'].get('attached', 0)}, "
+              f"시작 {report['status'].get('started', 0)} ({report['startup_time']}s), "
+              f"실패 {report['status'].get('failed', 0)}")
+        for udid, (appium_port, system_port, chromedriver_port) in report['ports'].items():
+            print(f"   📱 {udid}: appium {appium_port}, systemPort {system_port}, chromedriverPort {chromedriver_port}")
+
+# 글로벌 인스턴스 (러너의 load_dotenv 이후 첫 호출 시 생성)
+appium_server_pool = None
+_pool_lock = threading.Lock()
+
+def get_appium_server_pool() -> AppiumServerPool:
+    """글로벌 AppiumServerPool 인스턴스 반환"""
+    global appium_server_pool
+    with _pool_lock:
+        if appium_server_pool is None:
+            appium_server_pool = AppiumServerPool()
+        return appium_server_pool
+
+def get_device_ports(udid: str) -> PortAllocation:
+    """udid의 고정 포트 할당 조회 (서버 시작 없음)"""
+    return get_appium_server_pool().ports_for(udid)
@@ -11,6 +11,11 @@ from appium.webdriver.common.appiumby import AppiumBy
 from appium.options.android import UiAutomator2Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from result_sink import create_result_sink
+from scenario_cache import load_cached
+from webdriver_recorder import record_driver
+from appium_server_pool import get_device_ports
+from language_matrix import run_language_matrix
 
 # Load environment variables
 load_dotenv()
@@ -22,6 +27,8 @@ SCREENSHOT_DIR = os.path.join('screenshots', f'test_{start_time}')
 os.makedirs(SCREENSHOT_DIR, exist_ok=True)
 TEST_DEFINITION_FILE = os.getenv('TEST_DEFINITION_FILE', 'test_cases_navi.json')
 RESULT_CSV_FILE = 'test_results.csv'
+result_sink = create_result_sink(
+    RESULT_CSV_FILE, ['timestamp', 'language', 'test_id', 'screen_id', 'status', 'message'])
 BASE_URL = os.getenv('BASE_URL', 'http://localhost/')
 LOGIN_PATH = os.getenv('LOGIN_PATH', 'LOG1000')
 LANGUAGES = os.getenv('VI_LANGUAGES', 'vi,ko,en').split(',')
@@ -34,11 +41,12 @@ UDID = os.getenv('DEFAULT_UDID', 'RFCM902ZM9K')
 USER_ID = os.getenv('USER_ID', 'c89109')
 USER_PW = os.getenv('USER_PW', 'mcnc1234!!')
 # Appium 드라이버 초기화 ([개선]다수의 디바이스 병력 실행 필요)
-def get_driver():
+# appium_port: 언어 매트릭스 실행 시 서버 풀에서 할당된 포트
+def get_driver(udid=UDID, appium_port=None):
     capabilities = dict(
         platformName='Android',
         automationName='uiautomator2',
-        udid=UDID,
+        udid=udid,
         appPackage=APP_PACKAGE, 
         appActivity=APP_ACTIVITY,
         noReset=True,
@@ -62,24 +70,34 @@ def get_driver():
             ]
         }
     )
+    if appium_port:
+        # 여러 디바이스 동시 실행 시 udid별 고정 포트로 충돌 방지
+        ports = get_device_ports(udid)
+        capabilities.update(systemPort=ports.system_port, chromedriverPort=ports.chromedriver_port)
     options = UiAutomator2Options().load_capabilities(capabilities)
     appium_host = os.getenv('APPIUM_HOST', 'localhost')
-    appium_port = os.getenv('APPIUM_PORT', '4723')
+    appium_port = appium_port or os.getenv('APPIUM_PORT', '4723')
     driver = webdriver.Remote(f'http://{appium_host}:{appium_port}', options=options)
+    driver = record_driver(driver, udid)
     driver.implicitly_wait(int(os.getenv('IMPLICIT_WAIT', '10')))
     return driver
 
 # 테스트 결과 로그 저장
 def log_result(lang, test_id, screen_id, status, message):
-    file_exists = os.path.isfile(RESULT_CSV_FILE)
-    with open(RESULT_CSV_FILE, mode='a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(['timestamp', 'language', 'test_id', 'screen_id', 'status', 'message'])
-        writer.writerow([datetime.now().isoformat(), lang, test_id, screen_id, status, message])
+    result_sink.write({
+        'timestamp': datetime.now().isoformat(),
+        'language': lang,
+        'test_id': test_id,
+        'screen_id': screen_id,
+        'status': status,
+        'message': message
+    })
     
 # 테스트 케이스 로딩
 def load_test_cases():
+    return load_cached('json_test_cases', [TEST_DEFINITION_FILE], _parse_test_definition)
+
+def _parse_test_definition():
     with open(TEST_DEFINITION_FILE, encoding='utf-8') as f:
         return json.load(f)
 
@@ -273,53 +291,76 @@ def navi_test_case(driver, wait, lang, case):
         driver.save_screenshot(screenshot_path)
         log_result(lang, test_id, screen_id, "FAIL", str(e))
 
+# 디바이스 1대 준비 (드라이버 생성 후 WebView 전환)
+def open_device(udid=UDID, appium_port=None):
+    driver = get_driver(udid, appium_port)
+    wait = WebDriverWait(driver, int(os.getenv('EXPLICIT_WAIT', '20')))
+    try:
+        switch_to_webview(driver)
+    except Exception:
+        driver.quit()
+        raise
+    return driver, wait
+
+def close_device(device):
+    device[0].quit()
+
+# WebView 컨텍스트 전환 (대기 로직 포함)
+def switch_to_webview(driver):
+    print(f"🔄 Waiting for WebView context: {WEBVIEW_NAME}")
+    
+    # WebView가 로드될 때까지 최대 30초 대기
+    max_wait_time = 30
+    wait_interval = 2
+    waited_time = 0
+    
+    while waited_time < max_wait_time:
+        available_contexts = driver.contexts
+        print(f"Available contexts: {available_contexts}")
+        
+        if WEBVIEW_NAME in available_contexts:
+            print(f"✅ WebView context found: {WEBVIEW_NAME}")
+            driver.switch_to.context(WEBVIEW_NAME)
+            break
+        else:
+            print(f"⏳ WebView not ready, waiting... ({waited_time}s/{max_wait_time}s)")
+            time.sleep(wait_interval)
+            waited_time += wait_interval
+    
+    if waited_time >= max_wait_time:
+        print(f"⚠️  WebView context not found after {max_wait_time}s, using NATIVE_APP")
+        print(f"Available contexts: {driver.contexts}")
+    else:
+        print(f"✅ Successfully switched to WebView context: {WEBVIEW_NAME}")
+
+# 언어 1개 실행
+def run_language(device, lang, cases):
+    driver, wait = device
+    #화면 로딩 후후
+    change_language(driver, wait, lang)
+    login(driver, wait)
+    #화면 로딩 후 
+    # test_navigation(driver, wait)
+    for case in cases:
+        # run_test_case(driver, wait, lang, case)
+        # 고객 검색 테스트
+        # search_test_case(driver, wait, lang, case)
+        navi_test_case(driver, wait, lang, case)
+    #로그인 페이지로 이동
+    # search_test(driver, wait, lang)
+    go_login_page(driver, wait)
+
 # unittest 실행
 class TestAllLanguages(unittest.TestCase):
     def test_01_login(self):
         cases = load_test_cases()
-        driver = get_driver()
-        wait = WebDriverWait(driver, int(os.getenv('EXPLICIT_WAIT', '20')))
-        # WebView 컨텍스트 전환 (대기 로직 포함)
-        print(f"🔄 Waiting for WebView context: {WEBVIEW_NAME}")
-        
-        # WebView가 로드될 때까지 최대 30초 대기
-        max_wait_time = 30
-        wait_interval = 2
-        waited_time = 0
-        
-        while waited_time < max_wait_time:
-            available_contexts = driver.contexts
-            print(f"Available contexts: {available_contexts}")
-            
-            if WEBVIEW_NAME in available_contexts:
-                print(f"✅ WebView context found: {WEBVIEW_NAME}")
-                driver.switch_to.context(WEBVIEW_NAME)
-                break
-            else:
-                print(f"⏳ WebView not ready, waiting... ({waited_time}s/{max_wait_time}s)")
-                time.sleep(wait_interval)
-                waited_time += wait_interval
-        
-        if waited_time >= max_wait_time:
-            print(f"⚠️  WebView context not found after {max_wait_time}s, using NATIVE_APP")
-            print(f"Available contexts: {driver.contexts}")
-        else:
-            print(f"✅ Successfully switched to WebView context: {WEBVIEW_NAME}")
-        for lang in LANGUAGES:
-            #화면 로딩 후후
-            change_language(driver, wait, lang)
-            login(driver, wait)
-            #화면 로딩 후 
-            # test_navigation(driver, wait)
-            for case in cases:
-                # run_test_case(driver, wait, lang, case)
-                # 고객 검색 테스트
-                # search_test_case(driver, wait, lang, case)
-                navi_test_case(driver, wait, lang, case)
-            #로그인 페이지로 이동
-            # search_test(driver, wait, lang)
-            go_login_page(driver, wait)
-        driver.quit()
+        # LANGUAGE_MATRIX=true이고 같은 기종 디바이스가 더 있으면 언어마다 다른 디바이스에서 동시 실행
+        matrix = run_language_matrix(UDID, LANGUAGES, open_device,
+                                     lambda device, lang: run_language(device, lang, cases), close_device)
+        for lang in matrix.skipped_languages():
+            log_result(lang, 'LANGUAGE_MATRIX', 'DEVICE', 'FAIL', f'No device left to run {lang}')
+        for lang, error in matrix.failed_languages():
+            log_result(lang, 'LANGUAGE_MATRIX', 'DEVICE', 'FAIL', f'Language run failed: {error}')
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
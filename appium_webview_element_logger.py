@@ -12,6 +12,10 @@ from appium.webdriver.common.appiumby import AppiumBy
 from appium.options.android import UiAutomator2Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from webview_element_extractor import collect_page_elements, extract_element_info, get_element_scan_stats
+from screenshot_service import get_screenshot_service
+from webdriver_recorder import record_driver
+from element_log_sink import ElementLogSink, rebuild_legacy_json
 
 # 테스트 시작 시간
 start_time = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -20,6 +24,7 @@ start_time = datetime.now().strftime('%Y%m%d_%H%M%S')
 SCREENSHOT_DIR = os.path.join('screenshots', f'webview_test_{start_time}')
 LOG_DIR = os.path.join('logs', f'webview_test_{start_time}')
 ELEMENT_LOG_FILE = os.path.join(LOG_DIR, 'webview_elements.json')
+ELEMENT_STREAM_FILE = os.path.join(LOG_DIR, 'webview_elements.jsonl')
 DETAILED_LOG_FILE = os.path.join(LOG_DIR, 'detailed_test.log')
 
 # 디렉토리 생성
@@ -53,24 +58,20 @@ class WebViewElementLogger:
     def __init__(self):
         self.driver = None
         self.wait = None
-        self.element_data = {
-            'session_info': {
-                'start_time': start_time,
-                'app_package': APP_PACKAGE,
-                'app_activity': APP_ACTIVITY,
-                'device_udid': DEVICE_UDID,
-                'webview_context': WEBVIEW_CONTEXT
-            },
-            'context_switches': [],
-            'scanned_pages': [],
-            'all_elements': []
-        }
+        # 페이지/컨텍스트 기록은 스캔할 때마다 JSONL로 기록하고 메모리에는 집계만 유지
+        self.element_log = ElementLogSink(ELEMENT_STREAM_FILE, {
+            'start_time': start_time,
+            'app_package': APP_PACKAGE,
+            'app_activity': APP_ACTIVITY,
+            'device_udid': DEVICE_UDID,
+            'webview_context': WEBVIEW_CONTEXT
+        })
     
-    def safe_screenshot(self, filepath):
-        """안전한 스크린샷 저장"""
+    def safe_screenshot(self, filepath, kind='pass'):
+        """안전한 스크린샷 저장 (정책에 따라 건너뛸 수 있음, 저장은 백그라운드에서 처리)"""
         try:
-            self.driver.save_screenshot(filepath)
-            logger.info(f"📸 스크린샷 저장: {filepath}")
+            if get_screenshot_service().capture(self.driver, filepath, kind):
+                logger.info(f"📸 스크린샷 저장: {filepath}")
             return True
         except Exception as e:
             logger.warning(f"⚠️ 스크린샷 저장 실패: {e}")
@@ -185,6 +186,7 @@ class WebViewElementLogger:
         try:
             options = UiAutomator2Options().load_capabilities(capabilities)
             self.driver = webdriver.Remote('http://localhost:4723', options=options)
+            self.driver = record_driver(self.driver, DEVICE_UDID)
             self.driver.implicitly_wait(10)
             self.wait = WebDriverWait(self.driver, 30)
             
@@ -219,7 +221,7 @@ class WebViewElementLogger:
                 'native_contexts': [ctx for ctx in available_contexts if 'NATIVE' in ctx]
             }
             
-            self.element_data['context_switches'].append(context_info)
+            self.element_log.add_context_switch(context_info)
             
             logger.info(f"📱 현재 컨텍스트: {current_context}")
             logger.info(f"📋 사용 가능한 컨텍스트: {available_contexts}")
@@ -295,7 +297,7 @@ class WebViewElementLogger:
                         'current_context': current_context,
                         'retry_count': retry + 1
                     }
-                    self.element_data['context_switches'].append(switch_info)
+                    self.element_log.add_context_switch(switch_info)
                     
                     # 스크린샷 저장 (안전하게)
                     screenshot_path = os.path.join(SCREENSHOT_DIR, "02_webview_context.png")
@@ -332,7 +334,7 @@ class WebViewElementLogger:
                     'error': error_msg,
                     'retry_count': retry + 1
                 }
-                self.element_data['context_switches'].append(error_info)
+                self.element_log.add_context_switch(error_info)
                 
                 if retry < max_retries - 1:
                     logger.info(f"⏳ {3}초 후 재시도...")
@@ -511,7 +513,7 @@ class WebViewElementLogger:
                 'success': login_success,
                 'url_after_login': current_url if 'current_url' in locals() else 'unknown'
             }
-            self.element_data['context_switches'].append(login_info)
+            self.element_log.add_context_switch(login_info)
             
             if login_success:
                 logger.info("🎉 로그인 테스트 성공!")
@@ -531,7 +533,7 @@ class WebViewElementLogger:
                 'success': False,
                 'error': str(e)
             }
-            self.element_data['context_switches'].append(error_info)
+            self.element_log.add_context_switch(error_info)
             
             return False
     
@@ -571,81 +573,8 @@ class WebViewElementLogger:
             except:
                 logger.warning("⚠️ 페이지 제목을 가져올 수 없음")
             
-            # 다양한 타입의 요소들 스캔
-            element_selectors = {
-                'inputs': [
-                    "input[type='text']",
-                    "input[type='email']", 
-                    "input[type='password']",
-                    "input[type='number']",
-                    "input[type='tel']",
-                    "input[type='search']",
-                    "input[type='url']",
-                    "input:not([type])",
-                    "input"
-                ],
-                'buttons': [
-                    "button",
-                    "input[type='button']",
-                    "input[type='submit']",
-                    "[role='button']",
-                    ".btn",
-                    ".button"
-                ],
-                'links': [
-                    "a[href]",
-                    "[role='link']"
-                ],
-                'forms': [
-                    "form"
-                ],
-                'selects': [
-                    "select",
-                    "[role='combobox']",
-                    "[role='listbox']"
-                ],
-                'textareas': [
-                    "textarea"
-                ],
-                'images': [
-                    "img",
-                    "[role='img']"
-                ]
-            }
-            
-            # 각 요소 타입별로 스캔
-            for element_type, selectors in element_selectors.items():
-                logger.info(f"🔍 {element_type.upper()} 요소 스캔 중...")
-                
-                for selector in selectors:
-                    try:
-                        elements = self.driver.find_elements(AppiumBy.CSS_SELECTOR, selector)
-                        logger.info(f"   📍 '{selector}' 선택자로 {len(elements)}개 요소 발견")
-                        
-                        for i, element in enumerate(elements):
-                            element_info = self.extract_element_info(element, element_type, selector, i)
-                            if element_info and element_info not in page_data['elements'][element_type]:
-                                page_data['elements'][element_type].append(element_info)
-                                
-                    except Exception as e:
-                        logger.debug(f"   ⚠️ 선택자 '{selector}' 스캔 실패: {e}")
-                
-                logger.info(f"✅ {element_type.upper()} 요소 스캔 완료: {len(page_data['elements'][element_type])}개")
-            
-            # 기타 요소들 스캔
-            logger.info("🔍 기타 요소 스캔 중...")
-            other_selectors = ['div', 'span', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'label']
-            
-            for selector in other_selectors:
-                try:
-                    elements = self.driver.find_elements(AppiumBy.TAG_NAME, selector)
-                    # 텍스트가 있거나 특별한 속성이 있는 요소만 수집
-                    for i, element in enumerate(elements[:5]):  # 최대 5개만
-                        element_info = self.extract_element_info(element, 'other', selector, i)
-                        if element_info and (element_info.get('text') or element_info.get('id') or element_info.get('class')):
-                            page_data['elements']['other_elements'].append(element_info)
-                except:
-                    continue
+            # 요소 정보 수집 (ELEMENT_SCAN_MODE: script/webdriver/compare)
+            page_data['elements'] = collect_page_elements(self.driver)
             
             # 전체 요소 개수 계산
             page_data['total_elements'] = sum(len(elements) for elements in page_data['elements'].values())
@@ -661,15 +590,8 @@ class WebViewElementLogger:
             logger.info(f"   📦 기타 요소: {len(page_data['elements']['other_elements'])}개")
             logger.info(f"   🔢 총 요소 개수: {page_data['total_elements']}개")
             
-            # 페이지 데이터 저장
-            self.element_data['scanned_pages'].append(page_data)
-            
-            # 모든 요소를 전체 요소 리스트에도 추가
-            for element_type, elements in page_data['elements'].items():
-                for element in elements:
-                    element['page_name'] = page_name
-                    element['element_type_category'] = element_type
-                    self.element_data['all_elements'].append(element)
+            # 페이지 데이터 기록 (전체 요소 목록은 기존 형식 JSON 재생성 시 구성)
+            self.element_log.add_page(page_data)
             
             # 페이지별 스크린샷 저장 (안전하게)
             screenshot_path = os.path.join(SCREENSHOT_DIR, f"03_{page_name}_elements.png")
@@ -683,101 +605,24 @@ class WebViewElementLogger:
     
     def extract_element_info(self, element, element_type, selector, index):
         """개별 요소의 상세 정보 추출"""
-        try:
-            element_info = {
-                'index': index,
-                'selector_used': selector,
-                'element_type': element_type,
-                'tag_name': None,
-                'id': None,
-                'class': None,
-                'name': None,
-                'type': None,
-                'value': None,
-                'text': None,
-                'placeholder': None,
-                'href': None,
-                'src': None,
-                'alt': None,
-                'title': None,
-                'role': None,
-                'is_displayed': False,
-                'is_enabled': False,
-                'location': None,
-                'size': None,
-                'attributes': {}
-            }
-            
-            # 기본 정보
-            element_info['tag_name'] = element.tag_name
-            element_info['is_displayed'] = element.is_displayed()
-            element_info['is_enabled'] = element.is_enabled()
-            
-            # 위치 및 크기 정보
-            try:
-                element_info['location'] = element.location
-                element_info['size'] = element.size
-            except:
-                pass
-            
-            # 주요 속성들 추출
-            attributes_to_check = [
-                'id', 'class', 'name', 'type', 'value', 'placeholder', 
-                'href', 'src', 'alt', 'title', 'role', 'data-*'
-            ]
-            
-            for attr in attributes_to_check:
-                try:
-                    attr_value = element.get_attribute(attr)
-                    if attr_value:
-                        element_info[attr] = attr_value
-                        element_info['attributes'][attr] = attr_value
-                except:
-                    pass
-            
-            # 텍스트 내용
-            try:
-                text = element.text
-                if text and text.strip():
-                    element_info['text'] = text.strip()
-            except:
-                pass
-            
-            # innerHTML 내용 (일부만)
-            try:
-                inner_html = element.get_attribute('innerHTML')
-                if inner_html and len(inner_html) < 200:
-                    element_info['innerHTML'] = inner_html
-            except:
-                pass
-            
-            return element_info
-            
-        except Exception as e:
-            logger.debug(f"요소 정보 추출 실패 (인덱스 {index}): {e}")
-            return None
+        return extract_element_info(element, element_type, selector, index)
     
     def log_element_summary(self):
         """요소 스캔 결과 요약 로깅"""
         logger.info("📊 Step 4: 요소 스캔 결과 요약")
         
-        if not self.element_data['all_elements']:
+        if not self.element_log.total_elements:
             logger.warning("⚠️ 스캔된 요소가 없습니다")
             return
         
         # 요소 타입별 통계
-        type_stats = {}
-        for element in self.element_data['all_elements']:
-            element_type = element.get('element_type', 'unknown')
-            type_stats[element_type] = type_stats.get(element_type, 0) + 1
-        
         logger.info("📈 요소 타입별 통계:")
-        for element_type, count in sorted(type_stats.items()):
+        for element_type, count in sorted(self.element_log.type_stats.items()):
             logger.info(f"   {element_type}: {count}개")
         
         # 중요한 요소들 상세 로깅
         logger.info("📝 주요 Input 요소들:")
-        inputs = [e for e in self.element_data['all_elements'] if e.get('element_type') == 'inputs']
+        inputs = self.element_log.samples['inputs']
         for i, input_elem in enumerate(inputs[:10]):  # 최대 10개
             logger.info(f"   Input {i+1}: type='{input_elem.get('type', 'text')}', "
                        f"id='{input_elem.get('id', 'N/A')}', "
@@ -785,7 +630,7 @@ class WebViewElementLogger:
                        f"placeholder='{input_elem.get('placeholder', 'N/A')}'")
         
         logger.info("🔘 주요 Button 요소들:")
-        buttons = [e for e in self.element_data['all_elements'] if e.get('element_type') == 'buttons']
+        buttons = self.element_log.samples['buttons']
         for i, button_elem in enumerate(buttons[:10]):  # 최대 10개
             logger.info(f"   Button {i+1}: text='{button_elem.get('text', 'N/A')}', "
                        f"type='{button_elem.get('type', 'N/A')}', "
@@ -793,26 +638,25 @@ class WebViewElementLogger:
                        f"class='{button_elem.get('class', 'N/A')}'")
     
     def save_element_data(self):
-        """요소 데이터를 JSON 파일로 저장"""
+        """요소 로그 마무리 (ELEMENT_LOG_LEGACY_JSON=true면 기존 JSON 파일도 생성)"""
         logger.info("💾 Step 5: 요소 데이터 저장")
         
         try:
-            # 세션 완료 정보 추가
-            self.element_data['session_info']['end_time'] = datetime.now().isoformat()
-            self.element_data['session_info']['total_elements_found'] = len(self.element_data['all_elements'])
-            self.element_data['session_info']['total_pages_scanned'] = len(self.element_data['scanned_pages'])
-            
-            # JSON 파일로 저장
-            with open(ELEMENT_LOG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.element_data, f, ensure_ascii=False, indent=2)
+            # 세션 완료 정보 기록 (페이지 데이터는 스캔 시 이미 기록됨)
+            self.element_log.close()
+            saved_file = ELEMENT_STREAM_FILE
+            if self.element_log.legacy_json:
+                saved_file = rebuild_legacy_json(ELEMENT_STREAM_FILE, ELEMENT_LOG_FILE)
             
-            logger.info(f"✅ 요소 데이터 저장 완료: {ELEMENT_LOG_FILE}")
+            logger.info(f"✅ 요소 데이터 저장 완료: {saved_file}")
             logger.info(f"📊 저장된 데이터:")
-            logger.info(f"   총 페이지 수: {len(self.element_data['scanned_pages'])}")
-            logger.info(f"   총 요소 수: {len(self.element_data['all_elements'])}")
-            logger.info(f"   컨텍스트 전환 기록: {len(self.element_data['context_switches'])}")
+            logger.info(f"   총 페이지 수: {self.element_log.total_pages}")
+            logger.info(f"   총 요소 수: {self.element_log.total_elements}")
+            logger.info(f"   컨텍스트 전환 기록: {self.element_log.context_switches}")
+            if not self.element_log.legacy_json:
+                logger.info(f"💡 기존 형식 JSON 생성: python element_log_sink.py {ELEMENT_STREAM_FILE}")
             
-            return ELEMENT_LOG_FILE
+            return saved_file
             
         except Exception as e:
             logger.error(f"❌ 요소 데이터 저장 실패: {e}")
@@ -877,7 +721,7 @@ class WebViewElementLogger:
                     
                     # 클릭 전 스크린샷 (안전하게)
                     screenshot_path = os.path.join(SCREENSHOT_DIR, f"04_before_click_{i+1}.png")
-                    self.safe_screenshot(screenshot_path)
+                    self.safe_screenshot(screenshot_path, 'step')
                     
                     # 요소 클릭
                     elem_info['element'].click()
@@ -885,7 +729,7 @@ class WebViewElementLogger:
                     
                     # 클릭 후 스크린샷 (안전하게)
                     screenshot_path = os.path.join(SCREENSHOT_DIR, f"05_after_click_{i+1}.png")
-                    self.safe_screenshot(screenshot_path)
+                    self.safe_screenshot(screenshot_path, 'step')
                     
                     # 새 페이지 스캔
                     self.scan_page_elements(f"clicked_page_{i+1}")
@@ -902,6 +746,10 @@ class WebViewElementLogger:
     def close(self):
         """드라이버 종료"""
         logger.info("🔚 테스트 세션 종료")
+        get_element_scan_stats().print_report()
+        get_screenshot_service().close()
+        get_screenshot_service().print_report()
+        self.element_log.close()
         if self.driver:
             try:
                 self.driver.quit()
@@ -996,7 +844,7 @@ class TestWebViewElementLogger(unittest.TestCase):
         
         logger.info("🎉 모든 테스트 단계 완료!")
         logger.info(f"📁 결과 파일:")
-        logger.info(f"   📊 요소 데이터: {ELEMENT_LOG_FILE}")
+        logger.info(f"   📊 요소 데이터: {saved_file}")
         logger.info(f"   📝 상세 로그: {DETAILED_LOG_FILE}")
         logger.info(f"   📸 스크린샷: {SCREENSHOT_DIR}")
 
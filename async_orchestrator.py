@@ -0,0 +1,565 @@
+"""
+asyncio 기반 멀티 디바이스 오케스트레이터
+디바이스마다 스레드를 두는 대신 한 이벤트 루프에서
+Appium W3C HTTP API(asyncio 스트림)와 adb(asyncio 서브프로세스)를 논블로킹으로 호출
+병렬 러너와 같은 설정 CSV, 작업 큐, 결과 기록기를 사용 (--orchestrator asyncio)
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app_lifecycle import APP_EXIT_TIMEOUT, APP_POLL_INTERVAL, APP_RESTART_TIMEOUT, RestartRecord, get_restart_stats
+from device_discovery import ADB_COMMAND_TIMEOUT
+from readiness_wait import (READINESS_PROBE_JS, ReadinessResult, get_readiness_stats, is_page_settled,
+                            readiness_settings)
+from screenshot_service import get_screenshot_service
+from step_profiler import get_step_profiler
+from work_scheduler import build_scheduler
+
+APPIUM_HTTP_TIMEOUT = float(os.getenv('APPIUM_HTTP_TIMEOUT', '60'))
+APPIUM_SESSION_TIMEOUT = float(os.getenv('APPIUM_SESSION_TIMEOUT', '300'))
+ELEMENT_POLL_INTERVAL = 0.5
+
+W3C_ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+# AppiumBy 속성명 -> W3C 위치 전략 (WEBVIEW에서 미지원 전략은 CSS로 변환)
+SELECTOR_STRATEGIES = {
+    'CSS_SELECTOR': lambda value: ('css selector', value),
+    'XPATH': lambda value: ('xpath', value),
+    'ID': lambda value: ('css selector', f'[id="{value}"]'),
+    'NAME': lambda value: ('css selector', f'[name="{value}"]'),
+    'CLASS_NAME': lambda value: ('css selector', f'.{value}'),
+    'TAG_NAME': lambda value: ('css selector', value),
+    'LINK_TEXT': lambda value: ('link text', value),
+    'PARTIAL_LINK_TEXT': lambda value: ('partial link text', value),
+    'ACCESSIBILITY_ID': lambda value: ('accessibility id', value),
+    'ANDROID_UIAUTOMATOR': lambda value: ('-android uiautomator', value)
+}
+
+class AppiumHttpError(Exception):
+    """Appium 서버가 오류 응답을 반환한 경우"""
+
+    def __init__(self, status: int, error: str, message: str):
+        super().__init__(f"{status} {error}: {message}")
+        self.status = status
+        self.error = error
+
+class AsyncHttpClient:
+    """asyncio 스트림 기반 keep-alive HTTP/1.1 JSON 클라이언트"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+        self._reader = self._writer = None
+
+    async def _read_response(self) -> Tuple[int, Dict[str, str], bytes]:
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by server")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self._reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self._reader.readline()
+                    break
+                chunks.append(await self._reader.readexactly(size))
+                await self._reader.readline()
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            body = await self._reader.readexactly(int(headers['content-length']))
+        else:
+            body = await self._reader.read()
+            headers['connection'] = 'close'
+        return status, headers, body
+
+    async def request(self, method: str, path: str, payload: Any = None,
+                      timeout: float = APPIUM_HTTP_TIMEOUT) -> Any:
+        """요청 전송 후 W3C 응답의 value 반환"""
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        head = (f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: keep-alive\r\n\r\n").encode('latin-1')
+
+        async with self._lock:
+            for attempt in range(2):
+                if self._writer is not None and (self._reader.at_eof() or self._writer.is_closing()):
+                    # 서버가 이미 닫은 keep-alive 연결은 아무것도 쓰기 전에 버리고 새로 연결
+                    await self.close()
+                if self._writer is None:
+                    self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+                try:
+                    self._writer.write(head + body)
+                    await self._writer.drain()
+                    status, headers, data = await asyncio.wait_for(self._read_response(), timeout)
+                    break
+                except (asyncio.TimeoutError, asyncio.CancelledError):
+                    # 응답을 다 읽지 못한 연결은 다음 요청이 이전 응답을 읽게 되므로 버리고 재시도하지 않음
+                    # (명령이 이미 실행되었을 수 있음)
+                    await self.close()
+                    raise
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # 요청을 쓴 뒤 끊긴 경우 서버가 이미 실행했을 수 있으므로
+                    # 멱등한 GET만 한 번 재연결해 재전송 (POST/DELETE는 그대로 실패)
+                    await self.close()
+                    if attempt or method != 'GET':
+                        raise
+            if headers.get('connection', '').lower() == 'close':
+                await self.close()
+
+        result = json.loads(data.decode('utf-8')) if data else {}
+        value = result.get('value') if isinstance(result, dict) else result
+        if status >= 400:
+            error = value if isinstance(value, dict) else {}
+            raise AppiumHttpError(status, error.get('error', 'unknown error'), error.get('message', str(value)))
+        return value
+
+def to_w3c_capabilities(capabilities: Dict[str, Any]) -> Dict[str, Any]:
+    """UiAutomator2 capability 딕셔너리를 W3C 형식(appium: 접두사)으로 변환"""
+    always_match = {}
+    for key, value in capabilities.items():
+        if value is None:
+            continue
+        if key == 'platformName' or ':' in key:
+            always_match[key] = value
+        else:
+            always_match[f'appium:{key}'] = value
+    return {'capabilities': {'alwaysMatch': always_match, 'firstMatch': [{}]}}
+
+class AsyncAppiumSession:
+    """Appium W3C 세션 (필요한 명령만 구현)"""
+
+    def __init__(self, client: AsyncHttpClient, session_id: str):
+        self.client = client
+        self.session_id = session_id
+
+    @classmethod
+    async def create(cls, host: str, port: int, capabilities: Dict[str, Any]) -> 'AsyncAppiumSession':
+        client = AsyncHttpClient(host, port)
+        try:
+            value = await client.request('POST', '/session', to_w3c_capabilities(capabilities),
+                                         timeout=APPIUM_SESSION_TIMEOUT)
+        except Exception:
+            await client.close()
+            raise
+        return cls(client, value['sessionId'])
+
+    async def command(self, method: str, path: str = '', payload: Any = None) -> Any:
+        return await self.client.request(method, f'/session/{self.session_id}{path}', payload)
+
+    async def quit(self):
+        try:
+            await self.command('DELETE')
+        except Exception:
+            pass
+        await self.client.close()
+
+    async def set_implicit_wait(self, seconds: float):
+        await self.command('POST', '/timeouts', {'implicit': int(seconds * 1000)})
+
+    async def get(self, url: str):
+        await self.command('POST', '/url', {'url': url})
+
+    async def execute_script(self, script: str, *args) -> Any:
+        return await self.command('POST', '/execute/sync', {'script': script, 'args': list(args)})
+
+    async def contexts(self) -> List[str]:
+        return await self.command('GET', '/contexts') or []
+
+    async def switch_context(self, name: str):
+        await self.command('POST', '/context', {'name': name})
+
+    async def find_element(self, selector_type: str, selector_value: str) -> str:
+        using, value = SELECTOR_STRATEGIES[selector_type.upper()](selector_value)
+        element = await self.command('POST', '/element', {'using': using, 'value': value})
+        return element[W3C_ELEMENT_KEY]
+
+    async def click(self, element_id: str):
+        await self.command('POST', f'/element/{element_id}/click', {})
+
+    async def clear(self, element_id: str):
+        await self.command('POST', f'/element/{element_id}/clear', {})
+
+    async def send_keys(self, element_id: str, text: str):
+        await self.command('POST', f'/element/{element_id}/value', {'text': text, 'value': list(text)})
+
+    async def text(self, element_id: str) -> str:
+        return await self.command('GET', f'/element/{element_id}/text') or ''
+
+    async def is_displayed(self, element_id: str) -> bool:
+        return bool(await self.command('GET', f'/element/{element_id}/displayed'))
+
+    async def is_enabled(self, element_id: str) -> bool:
+        return bool(await self.command('GET', f'/element/{element_id}/enabled'))
+
+    async def screenshot(self) -> str:
+        """base64 PNG (디코딩은 스크린샷 서비스 워커에서 처리)"""
+        return await self.command('GET', '/screenshot')
+
+    async def _find_ready_element(self, selector_type: str, selector_value: str,
+                                  clickable: bool) -> Tuple[Optional[str], Optional[Exception]]:
+        try:
+            element_id = await self.find_element(selector_type, selector_value)
+            if not clickable or (await self.is_displayed(element_id) and await self.is_enabled(element_id)):
+                return element_id, None
+            return None, None
+        except AppiumHttpError as e:
+            return None, e
+
+    async def wait_for_element(self, selector_type: str, selector_value: str, timeout: float,
+                               clickable: bool = False) -> str:
+        """요소가 나타날 때까지 대기 (clickable이면 표시/활성 상태까지 확인)
+
+        첫 조회는 locate, 이후 폴링은 wait 구간으로 프로파일러에 기록
+        """
+        profiler = get_step_profiler()
+        deadline = time.time() + timeout
+        with profiler.span('locate'):
+            element_id, last_error = await self._find_ready_element(selector_type, selector_value, clickable)
+        if element_id:
+            return element_id
+        with profiler.span('wait'):
+            while time.time() < deadline:
+                await asyncio.sleep(ELEMENT_POLL_INTERVAL)
+                element_id, error = await self._find_ready_element(selector_type, selector_value, clickable)
+                if element_id:
+                    return element_id
+                last_error = error or last_error
+        raise TimeoutError(f"Element not ready: {selector_type}={selector_value} ({last_error})")
+
+async def run_adb_async(args: List[str], udid: str, timeout: float = ADB_COMMAND_TIMEOUT) -> Optional[str]:
+    """adb 명령 비동기 실행 (실패 시 None)"""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            'adb', '-s', udid, *args,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    except OSError as e:
+        print(f"⚠️ adb 실행 실패: {e}")
+        return None
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        print(f"⚠️ adb 명령 타임아웃: {' '.join(args)}")
+        return None
+    if process.returncode != 0:
+        return None
+    return stdout.decode('utf-8', errors='replace')
+
+async def wait_for_page_ready_async(session: AsyncAppiumSession, ceiling: float) -> ReadinessResult:
+    """readiness_wait.wait_for_page_ready의 비동기 버전 (같은 통계에 기록)"""
+    settings = readiness_settings()
+    start = time.time()
+    if not settings.enabled:
+        await asyncio.sleep(ceiling)
+        result = ReadinessResult(waited=time.time() - start, fixed_sleep=ceiling, settled=False, reason='disabled')
+        get_readiness_stats().add(result)
+        return result
+
+    await asyncio.sleep(min(settings.min_wait, ceiling))
+    state, reason, settled = None, 'timeout', False
+    while True:
+        try:
+            state = await session.execute_script(READINESS_PROBE_JS) or {}
+        except Exception:
+            await asyncio.sleep(max(ceiling - (time.time() - start), 0))
+            reason = 'fallback'
+            break
+        if is_page_settled(state, settings.quiet_ms):
+            settled, reason = True, 'settled'
+            break
+        if time.time() - start + settings.poll_interval >= ceiling:
+            await asyncio.sleep(max(ceiling - (time.time() - start), 0))
+            break
+        await asyncio.sleep(settings.poll_interval)
+
+    result = ReadinessResult(
+        waited=time.time() - start, fixed_sleep=ceiling, settled=settled, reason=reason,
+        ready_state=state.get('readyState') if state else None,
+        pending_requests=state.get('pending') if state else None
+    )
+    get_readiness_stats().add(result)
+    return result
+
+class AsyncOrchestrator:
+    """디바이스별 코루틴이 전역 작업 큐에서 작업을 가져가 실행"""
+
+    def __init__(self, test_cases, build_capabilities: Callable, log_result: Callable,
+                 screenshot_dir: str, base_url: str, country_settings: Dict[str, Dict[str, Any]],
+                 sleep_time: float):
+        self.test_cases = test_cases
+        self.build_capabilities = build_capabilities
+        self.log_result = log_result
+        self.screenshot_dir = screenshot_dir
+        self.base_url = base_url
+        self.country_settings = country_settings
+        self.sleep_time = sleep_time
+        self.appium_host = os.getenv('APPIUM_HOST', 'localhost')
+        self.explicit_wait = int(os.getenv('EXPLICIT_WAIT', '20'))
+        self.implicit_wait = int(os.getenv('IMPLICIT_WAIT', '10'))
+        self.restart_between_tests = os.getenv('RESTART_APP_BETWEEN_TESTS', 'true').lower() == 'true'
+        self.clear_app_data = os.getenv('CLEAR_APP_DATA', 'false').lower() == 'true'
+
+    async def restart_app(self, session: Optional[AsyncAppiumSession], udid: str, app_package: str,
+                          app_activity: str, webview_name: Optional[str]) -> bool:
+        """adb로 앱 재시작 후 프로세스/WEBVIEW 준비까지 폴링"""
+        start = time.time()
+        await run_adb_async(['shell', 'am', 'force-stop', app_package], udid)
+        if self.clear_app_data:
+            await run_adb_async(['shell', 'pm', 'clear', app_package], udid)
+
+        deadline = time.time() + APP_EXIT_TIMEOUT
+        while (await run_adb_async(['shell', 'pidof', app_package], udid, timeout=5) or '').strip():
+            if time.time() >= deadline:
+                break
+            await asyncio.sleep(APP_POLL_INTERVAL)
+
+        await run_adb_async(['shell', 'am', 'start', '-n', f'{app_package}/{app_activity}'], udid)
+
+        ready = False
+        deadline = time.time() + APP_RESTART_TIMEOUT
+        while True:
+            if session is not None and webview_name:
+                try:
+                    ready = webview_name in await session.contexts()
+                except Exception:
+                    ready = False
+            else:
+                ready = bool((await run_adb_async(['shell', 'pidof', app_package], udid, timeout=5) or '').strip())
+            if ready or time.time() >= deadline:
+                break
+            await asyncio.sleep(APP_POLL_INTERVAL)
+
+        latency = time.time() - start
+        get_restart_stats().add(RestartRecord(udid, app_package, latency, ready))
+        print(f"🎉 앱 재시작 완료: {app_package} on {udid} ({latency:.1f}s)")
+        return ready
+
+    async def change_language(self, session: AsyncAppiumSession, lang: str, country_code: str) -> bool:
+        try:
+            button = await session.wait_for_element('XPATH', "//button[contains(.,'select language')]",
+                                                    self.explicit_wait, clickable=True)
+            await session.click(button)
+            index = self.country_settings[country_code]['languages'].index(lang) + 1
+            option = await session.wait_for_element('XPATH', f"(//input[@name='select'])[{index}]",
+                                                    self.explicit_wait, clickable=True)
+            await session.click(option)
+            return True
+        except Exception as e:
+            print(f"Language change failed for {lang}: {str(e)}")
+            return False
+
+    async def login(self, session: AsyncAppiumSession, user_config) -> bool:
+        try:
+            user_id = await session.wait_for_element('CSS_SELECTOR', '.log_id input', self.explicit_wait)
+            await session.clear(user_id)
+            await session.send_keys(user_id, user_config.user_id)
+            user_pw = await session.wait_for_element('XPATH', "//input[@type='password']", self.explicit_wait)
+            await session.clear(user_pw)
+            await session.send_keys(user_pw, user_config.user_pw)
+            login_btn = await session.wait_for_element('CSS_SELECTOR', '.btn01', self.explicit_wait, clickable=True)
+            await session.click(login_btn)
+            await wait_for_page_ready_async(session, self.sleep_time)
+            return True
+        except Exception as e:
+            print(f"Login failed for user {user_config.user_id}: {str(e)}")
+            return False
+
+    async def execute_test_step(self, session: AsyncAppiumSession, step):
+        profiler = get_step_profiler()
+        action = step.action.lower()
+        with profiler.step(f"{step.action} {step.selector_value}"):
+            if action == 'click':
+                element = await session.wait_for_element(step.selector_type, step.selector_value,
+                                                         self.explicit_wait, clickable=True)
+                with profiler.span('action', 'click'):
+                    await session.click(element)
+            elif action == 'input':
+                element = await session.wait_for_element(step.selector_type, step.selector_value, self.explicit_wait)
+                with profiler.span('action', 'input'):
+                    await session.clear(element)
+                    if step.input_value:
+                        await session.send_keys(element, step.input_value)
+            elif action == 'verify':
+                element = await session.wait_for_element(step.selector_type, step.selector_value, self.explicit_wait)
+                with profiler.span('action', 'verify'):
+                    assert await session.is_displayed(element), "Element not visible"
+                    if step.input_value:
+                        assert step.input_value in await session.text(element), \
+                            f"Expected text '{step.input_value}' not found"
+            with profiler.span('sleep', 'page_ready'):
+                await wait_for_page_ready_async(session, self.sleep_time)
+
+    async def save_screenshot(self, session: AsyncAppiumSession, filename: str, kind: str = 'pass'):
+        screenshots = get_screenshot_service()
+        if not screenshots.should_capture(kind):
+            return
+        with get_step_profiler().span('screenshot', filename):
+            try:
+                data = await session.screenshot()
+            except Exception as e:
+                print(f"⚠️ 스크린샷 실패: {e}")
+                return
+        # 디코딩/저장은 스크린샷 서비스 워커에서 처리 (대기열이 가득 차면 이벤트 루프 대신 executor에서 대기)
+        path = os.path.join(self.screenshot_dir, filename)
+        # run_in_executor는 태그 컨텍스트를 넘기지 않으므로 중복 판단 범위를 미리 계산
+        await asyncio.get_running_loop().run_in_executor(None, screenshots.submit, data, path, kind,
+                                                         screenshots.current_scope())
+
+    async def run_test_case(self, session, lang, test_case, device_config, user_config, app_package,
+                            app_activity, webview_name):
+        with get_step_profiler().context(device=device_config.device_id, language=lang, test_id=test_case.test_id):
+            return await self._run_test_case(session, lang, test_case, device_config, user_config,
+                                             app_package, app_activity, webview_name)
+
+    async def _run_test_case(self, session, lang, test_case, device_config, user_config, app_package,
+                             app_activity, webview_name):
+        """app_package는 run_device에서 DEFAULT_APP_PACKAGE까지 반영해 결정한 값"""
+        profiler = get_step_profiler()
+        prefix = f"{device_config.device_id}_{user_config.user_id}_{lang}_{test_case.test_id}_{test_case.screen_id}"
+        try:
+            if self.restart_between_tests:
+                with profiler.span('wait', 'restart_app'):
+                    await self.restart_app(session, device_config.udid, app_package, app_activity, webview_name)
+                    await session.switch_context(webview_name)
+            if test_case.url:
+                with profiler.span('action', 'navigate'):
+                    await session.get(self.base_url + test_case.url)
+                with profiler.span('sleep', 'page_ready'):
+                    await wait_for_page_ready_async(session, self.sleep_time)
+            for step in test_case.steps:
+                try:
+                    await self.execute_test_step(session, step)
+                except Exception as e:
+                    print(f"Step execution failed: {str(e)}")
+                    raise Exception(f"Step failed: {step.description}")
+            await self.save_screenshot(session, f"{prefix}_pass.png")
+            self.log_result(lang, test_case.test_id, test_case.screen_id, "PASS", "",
+                            device_config.device_id, user_config.user_id, test_case.description)
+            return True
+        except Exception as e:
+            await self.save_screenshot(session, f"{prefix}_fail.png", 'fail')
+            self.log_result(lang, test_case.test_id, test_case.screen_id, "FAIL", str(e),
+                            device_config.device_id, user_config.user_id, test_case.description)
+            return False
+
+    async def run_device(self, test_pair, scheduler, appium_port: int):
+        """디바이스 1대의 작업 루프 (run_device_worker의 비동기 버전)"""
+        device_config = test_pair.device_config
+        udid = device_config.udid
+        app_activity = device_config.app_activity or os.getenv(
+            'DEFAULT_APP_ACTIVITY', 'com.mcnc.bizmob.cesco.SlideFragmentActivity')
+        sessions: Dict[str, AsyncAppiumSession] = {}
+        session = None
+        app_package = None
+        current_user = None
+        current_lang = None
+        webview_name = None
+
+        try:
+            while True:
+                idle_start = time.time()
+                current_key = (current_user.user_id if current_user else None, current_lang)
+                item = scheduler.next_item(udid, current_key)
+                scheduler.record(udid, 'idle', time.time() - idle_start)
+                if item is None:
+                    break
+
+                setup_start = time.time()
+                try:
+                    if current_user is None or item.user_config.user_id != current_user.user_id:
+                        current_user = None
+                        current_lang = None
+                        app_package = (device_config.app_package or item.user_config.app_package or
+                                       os.getenv('DEFAULT_APP_PACKAGE', 'com.cesco.oversea.srs.viet'))
+                        webview_name = device_config.webview_name or item.user_config.webview_name
+                        session = sessions.get(app_package)
+                        if session is None:
+                            print(f"[{device_config.device_id}] Appium 세션 생성 중 (port {appium_port})...")
+                            session = await AsyncAppiumSession.create(
+                                self.appium_host, appium_port,
+                                self.build_capabilities(device_config, item.user_config))
+                            await session.set_implicit_wait(self.implicit_wait)
+                            sessions[app_package] = session
+                        await session.switch_context(webview_name)
+                        current_user = item.user_config
+
+                    if item.language != current_lang:
+                        current_lang = None
+                        print(f"\n[{device_config.device_id}] Testing language: {item.language}")
+                        if current_key[1] is not None:
+                            await session.get(self.base_url + os.getenv('LOGIN_PATH', 'LOG1000'))
+                            await wait_for_page_ready_async(session, self.sleep_time)
+                        if (not await self.change_language(session, item.language, current_user.country_code) or
+                                not await self.login(session, current_user)):
+                            dropped = scheduler.drop_bucket(item.bucket_key)
+                            print(f"Skipping {dropped + 1} work item(s) for user {current_user.user_id}, "
+                                  f"language {item.language}")
+                            continue
+                        current_lang = item.language
+                except Exception as e:
+                    print(f"Device setup failed on {device_config.device_id}: {str(e)}")
+                    dropped = scheduler.drop_bucket(item.bucket_key)
+                    print(f"Skipping {dropped + 1} work item(s) for user {item.user_config.user_id}, "
+                          f"language {item.language}")
+                    current_user = None
+                    current_lang = None
+                    continue
+                finally:
+                    scheduler.record(udid, 'setup', time.time() - setup_start)
+
+                busy_start = time.time()
+                await self.run_test_case(session, item.language, item.test_case, device_config,
+                                         current_user, app_package, app_activity, webview_name)
+                scheduler.record(udid, 'busy', time.time() - busy_start, completed=True)
+        except Exception as e:
+            print(f"Device coroutine failed for {device_config.device_id}: {str(e)}")
+        finally:
+            for pooled in sessions.values():
+                await pooled.quit()
+            scheduler.finish_device(udid)
+
+    async def run(self, test_pairs, appium_ports: Dict[str, int]):
+        """모든 디바이스 코루틴 실행 후 스케줄러 반환"""
+        scheduler = build_scheduler(test_pairs, self.test_cases)
+        device_pairs: Dict[str, list] = {}
+        for pair in test_pairs:
+            device_pairs.setdefault(pair.device_config.udid, []).append(pair)
+
+        print(f"\n⚡ asyncio 오케스트레이터: {scheduler.total_items}개 작업, {len(device_pairs)}대 디바이스")
+        coroutines = []
+        for udid, pairs in device_pairs.items():
+            pair = pairs[0]
+            scheduler.register_device(pair.device_config.device_id, udid, [p.pair_id for p in pairs])
+            print(f"- {pair.device_config.device_id} ({udid}): pairs {[p.pair_id for p in pairs]}, "
+                  f"Appium port {appium_ports[udid]}")
+            coroutines.append(self.run_device(pair, scheduler, appium_ports[udid]))
+        await asyncio.gather(*coroutines)
+        return scheduler
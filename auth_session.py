@@ -0,0 +1,208 @@
+"""
+인증 세션 관리 모듈
+언어가 바뀔 때마다 로그인 페이지로 돌아가 다시 로그인하는 대신
+쿠키/localStorage 토큰과 현재 페이지로 로그인 상태를 확인하고
+가능하면 로그인 상태에서 언어만 변경, 세션이 실제로 만료된 경우에만 재로그인
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+from readiness_wait import wait_for_page_ready
+
+# AUTH_* 설정은 러너의 load_dotenv 이후 get_auth_session_manager()에서 읽어 전달
+DEFAULT_TOKEN_KEYS = 'token,accessToken,authToken,JSESSIONID'
+DEFAULT_LOGIN_FORM_SELECTOR = '.log_id input'
+LANGUAGE_BUTTON_XPATH = "//button[contains(.,'select language')]"
+
+# 토큰 존재 여부, 현재 URL, 로그인 폼 노출 여부 조회
+AUTH_PROBE_JS = """
+var keys = arguments[0], formSelector = arguments[1], tokens = [];
+function stored(storage, key) {
+    try { return storage && storage.getItem(key); } catch (e) { return null; }
+}
+var cookies = (document.cookie || '').split('; ');
+for (var i = 0; i < keys.length; i++) {
+    var key = keys[i];
+    var inCookie = cookies.some(function(cookie) { return cookie.indexOf(key + '=') === 0; });
+    if (stored(window.localStorage, key) || stored(window.sessionStorage, key) || inCookie) {
+        tokens.push(key);
+    }
+}
+var form = formSelector ? document.querySelector(formSelector) : null;
+return {
+    url: window.location.href,
+    tokens: tokens,
+    loginForm: !!(form && form.offsetParent !== null)
+};
+"""
+
+SET_LANGUAGE_JS = """
+window.localStorage.setItem(arguments[0], arguments[1]);
+window.location.reload();
+return true;
+"""
+
+@dataclass
+class AuthState:
+    """디바이스별 인증 상태"""
+    user_id: Optional[str] = None
+    language: Optional[str] = None
+    logged_in: bool = False
+
+class AuthSessionManager:
+    """디바이스(udid)별 로그인 상태를 추적하여 불필요한 재로그인 방지"""
+
+    def __init__(self, base_url: str, login_path: str, enabled: bool = True,
+                 token_keys: List[str] = None, login_form_selector: str = DEFAULT_LOGIN_FORM_SELECTOR,
+                 language_storage_key: str = ''):
+        self.base_url = base_url
+        self.login_path = login_path
+        self.enabled = enabled
+        self.token_keys = token_keys if token_keys is not None else DEFAULT_TOKEN_KEYS.split(',')
+        self.login_form_selector = login_form_selector
+        # 앱이 언어를 저장하는 localStorage 키 (설정 시 로그인 상태에서 키 변경 후 새로고침으로 언어 전환)
+        self.language_storage_key = language_storage_key
+        self._lock = threading.Lock()
+        self._states: Dict[str, AuthState] = {}
+        self.logins_performed = 0
+        self.logins_avoided = 0
+        self.in_place_switches = 0
+        self.expired_sessions = 0
+
+    def _state(self, udid: str) -> AuthState:
+        with self._lock:
+            return self._states.setdefault(udid, AuthState())
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def invalidate(self, udid: str):
+        """세션 무효화 (앱 데이터 정리, 세션 교체 등)"""
+        with self._lock:
+            self._states.pop(udid, None)
+
+    def probe(self, driver) -> Dict[str, Any]:
+        try:
+            return driver.execute_script(AUTH_PROBE_JS, self.token_keys, self.login_form_selector) or {}
+        except Exception:
+            return {}
+
+    def is_logged_in(self, driver) -> bool:
+        """토큰 또는 현재 페이지로 로그인 상태 확인 (로그인 폼이 보이면 로그아웃 상태)"""
+        state = self.probe(driver)
+        if not state or state.get('loginForm'):
+            return False
+        if state.get('tokens'):
+            return True
+        return self.login_path not in (state.get('url') or '')
+
+    def switch_language_in_place(self, driver, wait, lang: str, country_code: str,
+                                 change_language: Callable) -> bool:
+        """로그인 상태 유지한 채 언어 변경 (앱이 지원하는 경우)"""
+        try:
+            if self.language_storage_key:
+                driver.execute_script(SET_LANGUAGE_JS, self.language_storage_key, lang)
+                wait_for_page_ready(driver, 3, verbose=False)
+                return True
+            # 현재 화면에 언어 선택 버튼이 있을 때만 시도
+            if driver.find_elements(AppiumBy.XPATH, LANGUAGE_BUTTON_XPATH):
+                return change_language(driver, wait, lang, country_code)
+        except Exception as e:
+            print(f"⚠️ 로그인 상태 언어 변경 실패 ({lang}): {e}")
+        return False
+
+    def _full_login(self, driver, wait, user_config, lang: str,
+                    change_language: Callable, login: Callable) -> bool:
+        # 로그인 폼이 없으면 로그인 페이지로 이동
+        if not self.probe(driver).get('loginForm'):
+            driver.get(self.base_url + self.login_path)
+            wait_for_page_ready(driver, 3, verbose=False)
+        if not change_language(driver, wait, lang, user_config.country_code):
+            return False
+        if not login(driver, wait, user_config):
+            return False
+        self._count('logins_performed')
+        return True
+
+    def ensure_session(self, driver, wait, udid: str, user_config, lang: str,
+                       change_language: Callable, login: Callable) -> bool:
+        """
+        user_config 사용자로 lang 언어 세션 준비
+
+        Args:
+            driver: WEBVIEW 컨텍스트의 드라이버
+            udid: 디바이스 udid (세션 상태 키)
+            change_language: change_language(driver, wait, lang, country_code)
+            login: login(driver, wait, user_config)
+
+        Returns:
+            bool: 세션 준비 성공 여부
+        """
+        state = self._state(udid)
+
+        if self.enabled and state.logged_in and state.user_id == user_config.user_id:
+            if self.is_logged_in(driver):
+                if state.language == lang:
+                    self._count('logins_avoided')
+                    print(f"🔐 기존 로그인 세션 유지: {user_config.user_id} ({lang})")
+                    return True
+                if (self.switch_language_in_place(driver, wait, lang, user_config.country_code, change_language)
+                        and self.is_logged_in(driver)):
+                    state.language = lang
+                    self._count('logins_avoided')
+                    self._count('in_place_switches')
+                    print(f"🔐 로그인 상태에서 언어 변경: {user_config.user_id} ({lang})")
+                    return True
+            else:
+                self._count('expired_sessions')
+                print(f"⚠️ 로그인 세션 만료 - 재로그인: {user_config.user_id}")
+
+        state.logged_in = False
+        if not self._full_login(driver, wait, user_config, lang, change_language, login):
+            return False
+        state.user_id = user_config.user_id
+        state.language = lang
+        state.logged_in = True
+        return True
+
+    def get_report(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'logins_performed': self.logins_performed,
+                'logins_avoided': self.logins_avoided,
+                'in_place_switches': self.in_place_switches,
+                'expired_sessions': self.expired_sessions
+            }
+
+    def print_report(self):
+        report = self.get_report()
+        print("\n🔐 로그인 세션 리포트:")
+        print(f"   로그인 수행: {report['logins_performed']}회, 생략: {report['logins_avoided']}회 "
+              f"(로그인 상태 언어 변경 {report['in_place_switches']}회)")
+        print(f"   만료된 세션 재로그인: {report['expired_sessions']}회")
+
+# 글로벌 인스턴스 (러너의 load_dotenv 이후 첫 호출 시 생성)
+auth_session_manager = None
+_manager_lock = threading.Lock()
+
+def get_auth_session_manager() -> AuthSessionManager:
+    """글로벌 AuthSessionManager 인스턴스 반환 (BASE_URL, LOGIN_PATH, AUTH_* 환경변수 사용)"""
+    global auth_session_manager
+    with _manager_lock:
+        if auth_session_manager is None:
+            auth_session_manager = AuthSessionManager(
+                os.getenv('BASE_URL', 'http://localhost/'),
+                os.getenv('LOGIN_PATH', 'LOG1000'),
+                enabled=os.getenv('AUTH_SESSION_REUSE', 'true').lower() == 'true',
+                token_keys=[key.strip() for key in os.getenv('AUTH_TOKEN_KEYS', DEFAULT_TOKEN_KEYS).split(',')
+                            if key.strip()],
+                login_form_selector=os.getenv('AUTH_LOGIN_FORM_SELECTOR', DEFAULT_LOGIN_FORM_SELECTOR),
+                language_storage_key=os.getenv('AUTH_LANGUAGE_STORAGE_KEY', '')
+            )
+        return auth_session_manager
@@ -0,0 +1,280 @@
+"""
+러너 오프라인 벤치마크
+mock_appium_server를 띄운 뒤 실제 러너 함수(run_pair_tests, execute_enhanced_test_case,
+scan_page_elements)를 실행하여 디바이스 없이 실행 시간과 WebDriver 왕복 횟수를 측정
+(adb는 임시 가짜 adb로 대체, 러너 모듈은 환경변수 설정 후 import)
+
+    python benchmark_runners.py --repeat 3 --latency-ms 50
+    python benchmark_runners.py --targets scan --elements 20 --json bench.json
+    python benchmark_runners.py --targets pair --replay recordings/session_xxx.jsonl --replay-speed 0
+    python benchmark_runners.py --targets shard --shard-devices 3   # 코디네이터 + 로컬 워커 프로세스
+    python benchmark_runners.py --smoke   # pair/shard 1회 실행 후 실패 결과가 있으면 종료 코드 1
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import stat
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from mock_appium_server import MockAppiumServer, add_mock_arguments, config_from_args
+
+TARGETS = ('pair', 'enhanced', 'scan', 'shard')
+MOCK_APP_PACKAGE = 'com.cesco.oversea.srs.viet'
+MOCK_APP_ACTIVITY = 'com.mcnc.bizmob.cesco.SlideFragmentActivity'
+MOCK_WEBVIEW = f'WEBVIEW_{MOCK_APP_PACKAGE}'
+
+# pidof는 항상 "프로세스 없음", 나머지 adb 명령은 성공으로 응답
+FAKE_ADB_SCRIPT = """#!/bin/sh
+case "$*" in
+    *pidof*) exit 1 ;;
+esac
+exit 0
+"""
+
+def install_fake_adb() -> str:
+    """가짜 adb를 임시 디렉터리에 만들고 PATH 앞에 추가"""
+    directory = tempfile.mkdtemp(prefix='fake_adb_')
+    path = os.path.join(directory, 'adb')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(FAKE_ADB_SCRIPT)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    os.environ['PATH'] = directory + os.pathsep + os.environ.get('PATH', '')
+    return directory
+
+def configure_environment(server: MockAppiumServer, args: argparse.Namespace):
+    """러너 모듈 import 전에 목 서버 주소와 대기 시간 설정"""
+    os.environ['APPIUM_HOST'] = server.host
+    os.environ['APPIUM_PORT'] = str(server.port)
+    os.environ['DEFAULT_UDID'] = 'MOCK0001'
+    os.environ['SLEEP_TIME'] = str(args.sleep_time)
+    os.environ.setdefault('IMPLICIT_WAIT', '0')
+    os.environ.setdefault('EXPLICIT_WAIT', '2')
+    os.environ.setdefault('APP_POLL_INTERVAL', '0.01')
+    os.environ.setdefault('READY_MIN_WAIT', '0')
+    if args.smoke:
+        # 결과 파일을 다시 읽어 검사하므로 CSV로 고정
+        os.environ['RESULT_BACKEND'] = 'csv'
+
+def mock_capabilities() -> Dict[str, Any]:
+    return dict(platformName='Android', automationName='uiautomator2', udid='MOCK0001',
+                appPackage=MOCK_APP_PACKAGE, appActivity=MOCK_APP_ACTIVITY)
+
+def bench_pair(server: MockAppiumServer, args: argparse.Namespace) -> Callable[[int], None]:
+    """appium_parallel_test_runner.run_pair_tests (가상 디바이스 1대, 사용자 1명)"""
+    import appium_parallel_test_runner as runner
+
+    device = runner.DeviceConfig('mock-device', 'MOCK0001', 'Android', '14',
+                                 MOCK_APP_PACKAGE, MOCK_APP_ACTIVITY, MOCK_WEBVIEW)
+    user = runner.UserConfig('mock_user', 'mock_pw', 'VN', MOCK_APP_PACKAGE, MOCK_WEBVIEW, 'benchmark user')
+    test_pair = runner.TestPair('BENCH', device, [user], args.languages, 'offline benchmark')
+    test_cases = runner.load_test_cases_from_csv()[:args.cases or None]
+
+    def run(_):
+        runner.run_pair_tests(test_pair, test_cases, server.port)
+    return run
+
+def bench_shard(server: MockAppiumServer, args: argparse.Namespace) -> Callable[[int], None]:
+    """appium_parallel_test_runner.run_coordinator (가상 디바이스 N대를 로컬 워커 프로세스 N개로 실행)"""
+    import appium_parallel_test_runner as runner
+
+    udids = [f'MOCK{index:04d}' for index in range(1, args.shard_devices + 1)]
+    # 워커 프로세스의 서버 풀이 모든 udid를 목 서버 포트(슬롯 0)로 연결하도록 포트 파일을 미리 작성
+    port_file = os.path.join(tempfile.mkdtemp(prefix='mock_ports_'), 'appium_ports.json')
+    with open(port_file, 'w', encoding='utf-8') as f:
+        json.dump({'slots': {udid: 0 for udid in udids}}, f)
+    os.environ['APPIUM_PORT_FILE'] = port_file
+    os.environ['APPIUM_SERVER_MODE'] = 'off'
+
+    user = runner.UserConfig('mock_user', 'mock_pw', 'VN', MOCK_APP_PACKAGE, MOCK_WEBVIEW, 'benchmark user')
+    test_pairs = [runner.TestPair(f'BENCH{index}', runner.DeviceConfig(f'mock-device-{index}', udid, 'Android', '14',
+                                                                      MOCK_APP_PACKAGE, MOCK_APP_ACTIVITY,
+                                                                      MOCK_WEBVIEW),
+                                  [user], args.languages, 'offline benchmark')
+                  for index, udid in enumerate(udids, 1)]
+    test_cases = runner.load_test_cases_from_csv()[:args.cases or None]
+
+    def run(_):
+        runner.run_coordinator(argparse.Namespace(bind='127.0.0.1', port=0, local_workers=len(udids)),
+                               test_pairs, test_cases)
+    return run
+
+def bench_enhanced(server: MockAppiumServer, args: argparse.Namespace) -> Callable[[int], None]:
+    """enhanced_test_runner.execute_enhanced_test_case (케이스 x 언어)"""
+    import enhanced_test_runner as runner
+    from enhanced_test_engine import EnhancedTestEngine
+
+    driver = runner.get_driver()
+    driver.switch_to.context(MOCK_WEBVIEW)
+    engine = EnhancedTestEngine(driver, int(os.environ['EXPLICIT_WAIT']), 'VN')
+    test_cases = runner.load_enhanced_test_cases()[:args.cases or None]
+    languages = args.languages.split(';')
+
+    def run(_):
+        for test_case in test_cases:
+            for lang in languages:
+                runner.execute_enhanced_test_case(engine, test_case, lang)
+    run.cleanup = driver.quit
+    return run
+
+def bench_scan(server: MockAppiumServer, args: argparse.Namespace) -> Callable[[int], None]:
+    """appium_webview.WebViewElementLogger.scan_page_elements (ELEMENT_SCAN_MODE 적용)"""
+    import appium_webview
+    from appium import webdriver
+    from appium.options.android import UiAutomator2Options
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    element_logger = appium_webview.WebViewElementLogger()
+    element_logger.driver = webdriver.Remote(server.url,
+                                             options=UiAutomator2Options().load_capabilities(mock_capabilities()))
+    element_logger.driver.switch_to.context(MOCK_WEBVIEW)
+    element_logger.wait = WebDriverWait(element_logger.driver, int(os.environ['EXPLICIT_WAIT']))
+
+    def run(index):
+        element_logger.scan_page_elements(f'bench_page_{index}')
+
+    def cleanup():
+        element_logger.element_log.close()
+        element_logger.driver.quit()
+    run.cleanup = cleanup
+    return run
+
+BENCHMARKS = {'pair': bench_pair, 'enhanced': bench_enhanced, 'scan': bench_scan, 'shard': bench_shard}
+
+def run_target(name: str, server: MockAppiumServer, args: argparse.Namespace) -> Dict[str, Any]:
+    """대상 1개를 repeat회 실행하여 실행 시간/명령 수 집계 (준비 단계는 측정에서 제외)"""
+    try:
+        run = BENCHMARKS[name](server, args)
+    except ImportError as e:
+        return {'target': name, 'error': f"{type(e).__name__}: {e}"}
+
+    durations: List[float] = []
+    commands: List[int] = []
+    try:
+        for index in range(max(1, args.repeat)):
+            before = server.get_report()['command_counts']
+            start = time.perf_counter()
+            run(index)
+            durations.append(time.perf_counter() - start)
+            after = server.get_report()['command_counts']
+            commands.append(sum(count - before.get(command, 0) for command, count in after.items()))
+    finally:
+        cleanup = getattr(run, 'cleanup', None)
+        if cleanup:
+            try:
+                cleanup()
+            except Exception as e:
+                print(f"⚠️ {name} 정리 실패: {e}")
+
+    return {
+        'target': name,
+        'runs': len(durations),
+        'median_s': round(statistics.median(durations), 3),
+        'min_s': round(min(durations), 3),
+        'max_s': round(max(durations), 3),
+        'commands_per_run': round(statistics.median(commands), 1)
+    }
+
+def close_runner_outputs():
+    """러너 모듈의 결과 기록기와 스크린샷 서비스 정리 (import된 모듈만)"""
+    for module_name in ('appium_parallel_test_runner', 'enhanced_test_runner'):
+        module = sys.modules.get(module_name)
+        if module is None:
+            continue
+        if module_name == 'appium_parallel_test_runner':
+            module.get_session_pool().close_all()
+        module.screenshots.close()
+        module.result_sink.close()
+
+def check_smoke(results: List[Dict[str, Any]]) -> List[str]:
+    """스모크 검사: pair/shard 실행이 오류 없이 끝나고 결과가 모두 PASS인지 확인 (문제 목록 반환)"""
+    problems = []
+    for result in results:
+        if 'error' in result:
+            problems.append(f"{result['target']}: {result['error']}")
+        elif not result['commands_per_run']:
+            problems.append(f"{result['target']}: WebDriver 명령이 실행되지 않음")
+
+    module = sys.modules.get('appium_parallel_test_runner')
+    if module is None:
+        return problems
+    path = module.result_sink.path
+    if not os.path.isfile(path):
+        return problems + [f"결과 파일 없음: {path}"]
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        problems.append(f"결과 행 없음: {path}")
+    for row in rows:
+        if row['status'] != 'PASS':
+            problems.append(f"{row['language']} {row['test_id']}: {row['status']} {row['message']}")
+    return problems
+
+def print_results(results: List[Dict[str, Any]]):
+    print("\n🏁 러너 오프라인 벤치마크 (중앙값):")
+    for result in results:
+        if 'error' in result:
+            print(f"   {result['target']:<10} 건너뜀 - {result['error']}")
+            continue
+        print(f"   {result['target']:<10} {result['median_s']:>8.3f}s "
+              f"(min {result['min_s']:.3f}s, max {result['max_s']:.3f}s, {result['runs']}회), "
+              f"WebDriver 명령 {result['commands_per_run']}회/실행")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='목 Appium 서버로 러너 실행 시간 측정')
+    parser.add_argument('--targets', nargs='+', choices=TARGETS, default=list(TARGETS), help='측정할 러너 함수')
+    parser.add_argument('--repeat', type=int, default=3, help='대상별 실행 횟수 (기본값: 3)')
+    parser.add_argument('--cases', type=int, default=0, help='사용할 테스트 케이스 수 (0: 전체)')
+    parser.add_argument('--languages', default='vi', help='세미콜론으로 구분된 언어 목록 (기본값: vi)')
+    parser.add_argument('--sleep-time', type=int, default=0, help='러너 SLEEP_TIME 값 (기본값: 0, 고정 대기 제외)')
+    parser.add_argument('--shard-devices', type=int, default=2, help='shard 대상의 가상 디바이스 수 (기본값: 2)')
+    parser.add_argument('--real-adb', action='store_true', help='가짜 adb 대신 PATH의 adb 사용')
+    parser.add_argument('--json', dest='json_path', help='결과를 저장할 JSON 파일 경로')
+    parser.add_argument('--smoke', action='store_true',
+                        help='pair, shard를 1회 실행하고 결과가 모두 PASS가 아니면 종료 코드 1 (목 서버 동작 확인용)')
+    add_mock_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.smoke:
+        args.targets, args.repeat = ['pair', 'shard'], 1
+    return args
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    server = MockAppiumServer(config_from_args(args)).start()
+    print(f"🧪 목 Appium 서버 시작: {server.url}")
+    if not args.real_adb:
+        print(f"🔧 가짜 adb 사용: {install_fake_adb()}")
+    configure_environment(server, args)
+
+    results = []
+    try:
+        for name in args.targets:
+            print(f"\n▶️ 벤치마크 실행: {name}")
+            results.append(run_target(name, server, args))
+        close_runner_outputs()
+    finally:
+        server.stop()
+
+    print_results(results)
+    server.print_report()
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'results': results, 'server': server.get_report()}, f, indent=2, ensure_ascii=False)
+        print(f"📁 결과 저장: {args.json_path}")
+
+    if args.smoke:
+        problems = check_smoke(results)
+        if problems:
+            print(f"\n❌ 스모크 검사 실패 ({len(problems)}건):")
+            for problem in problems:
+                print(f"   - {problem}")
+            sys.exit(1)
+        print("\n✅ 스모크 검사 통과")
+
+if __name__ == '__main__':
+    main()
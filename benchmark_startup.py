@@ -0,0 +1,106 @@
+"""
+시작 비용 벤치마크
+새 파이썬 프로세스에서 모듈 import 시간과 LocalizationManager 첫 로딩(preload) 시간을 측정
+import 시 파일을 읽는 부작용이 없는지 확인하는 용도
+
+    python benchmark_startup.py --repeat 5
+    python benchmark_startup.py --modules localization_manager enhanced_test_engine --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+DEFAULT_MODULES = [
+    'localization_manager',
+    'enhanced_test_engine',
+    'enhanced_test_runner',
+    'appium_parallel_test_runner',
+]
+
+# 새 프로세스에서 실행하는 측정 코드 (결과는 마지막 줄 JSON으로 출력)
+PROBE = '''
+import importlib, json, sys, time
+module_name, preload = sys.argv[1], sys.argv[2] == '1'
+result = {}
+start = time.perf_counter()
+try:
+    importlib.import_module(module_name)
+except Exception as e:
+    print(json.dumps({'error': f"{type(e).__name__}: {e}"}))
+    sys.exit(0)
+result['import'] = time.perf_counter() - start
+import localization_manager
+result['manager_loaded_on_import'] = localization_manager.localization_manager is not None
+if preload:
+    start = time.perf_counter()
+    localization_manager.preload_localization()
+    result['preload'] = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(10000):
+        localization_manager.get_localized_text('TC001', 'credential', 'user_id', 'vi')
+    result['lookup_us'] = (time.perf_counter() - start) / 10000 * 1_000_000
+print(json.dumps(result))
+'''
+
+def run_probe(module_name: str, preload: bool) -> Dict[str, Any]:
+    completed = subprocess.run([sys.executable, '-c', PROBE, module_name, '1' if preload else '0'],
+                               capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        return {'error': (completed.stderr.strip().splitlines() or ['unknown error'])[-1]}
+    return json.loads(lines[-1])
+
+def benchmark_module(module_name: str, repeat: int) -> Dict[str, Any]:
+    """모듈 1개를 repeat회 측정하여 중앙값 반환 (import 실패 시 error)"""
+    samples: List[Dict[str, Any]] = []
+    for _ in range(repeat):
+        sample = run_probe(module_name, preload=(module_name == 'localization_manager'))
+        if 'error' in sample:
+            return {'module': module_name, 'error': sample['error']}
+        samples.append(sample)
+    result: Dict[str, Any] = {
+        'module': module_name,
+        'import_ms': round(statistics.median(sample['import'] for sample in samples) * 1000, 2),
+        'manager_loaded_on_import': any(sample['manager_loaded_on_import'] for sample in samples)
+    }
+    if 'preload' in samples[0]:
+        result['preload_ms'] = round(statistics.median(sample['preload'] for sample in samples) * 1000, 2)
+        result['lookup_us'] = round(statistics.median(sample['lookup_us'] for sample in samples), 3)
+    return result
+
+def print_results(results: List[Dict[str, Any]]):
+    print("\n🚀 시작 비용 벤치마크 (중앙값):")
+    for result in results:
+        if 'error' in result:
+            print(f"   {result['module']:<30} 건너뜀 - {result['error']}")
+            continue
+        line = f"   {result['module']:<30} import {result['import_ms']:>8.2f}ms"
+        if 'preload_ms' in result:
+            line += f", preload {result['preload_ms']:.2f}ms, 조회 {result['lookup_us']:.3f}µs"
+        if result['manager_loaded_on_import']:
+            line += "  ⚠️ import 시 LocalizationManager 로딩됨"
+        print(line)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='모듈 import/초기화 시간 측정')
+    parser.add_argument('--modules', nargs='+', default=DEFAULT_MODULES, help='측정할 모듈 목록')
+    parser.add_argument('--repeat', type=int, default=5, help='모듈별 측정 횟수 (기본값: 5)')
+    parser.add_argument('--json', dest='json_path', help='결과를 저장할 JSON 파일 경로')
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    results = [benchmark_module(module_name, max(1, args.repeat)) for module_name in args.modules]
+    print_results(results)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"📁 결과 저장: {args.json_path}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+디바이스 탐색 모듈
+adb devices로 연결된 디바이스를 찾고 getprop을 디바이스별로 동시에 실행
+속성은 udid + ro.build.fingerprint 기준으로 디스크에 캐시하여
+빌드가 바뀐 디바이스만 전체 getprop을 다시 수행
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+DEVICE_CACHE_FILE = os.getenv('DEVICE_CACHE_FILE', '.device_cache.json')
+DEVICE_DISCOVERY_WORKERS = int(os.getenv('DEVICE_DISCOVERY_WORKERS', '8'))
+ADB_COMMAND_TIMEOUT = float(os.getenv('ADB_COMMAND_TIMEOUT', '15'))
+
+FINGERPRINT_PROPERTY = 'ro.build.fingerprint'
+
+# 캐시에 보관하는 속성
+CACHED_PROPERTIES = [
+    FINGERPRINT_PROPERTY,
+    'ro.build.version.release',
+    'ro.build.version.sdk',
+    'ro.product.model',
+    'ro.product.manufacturer',
+    'ro.product.locale',
+    'persist.sys.locale'
+]
+
+@dataclass
+class DeviceInfo:
+    """탐색된 디바이스 정보"""
+    udid: str
+    build_fingerprint: str = ''
+    properties: Dict[str, str] = field(default_factory=dict)
+    discovered_at: float = field(default_factory=time.time)
+
+    @property
+    def platform_version(self) -> str:
+        return self.properties.get('ro.build.version.release', '')
+
+    @property
+    def model(self) -> str:
+        return self.properties.get('ro.product.model', '')
+
+    def to_device_config(self) -> Dict[str, str]:
+        """병렬 러너 devices.csv 갱신용 정보"""
+        return {
+            'udid': self.udid,
+            'platform_name': 'Android',
+            'platform_version': self.platform_version,
+            'device_name': self.model
+        }
+
+def run_adb(args: List[str], udid: str = None, timeout: float = ADB_COMMAND_TIMEOUT) -> Optional[str]:
+    """adb 명령 실행 (실패 시 None)"""
+    command = ['adb'] + (['-s', udid] if udid else []) + args
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"⚠️ adb 명령 실패 ({' '.join(command)}): {e}")
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+def parse_getprop(output: str) -> Dict[str, str]:
+    """getprop 출력 파싱 ([key]: [value] 형식)"""
+    props = {}
+    for line in output.split('\n'):
+        if ': ' in line:
+            key, value = line.split(': ', 1)
+            props[key.strip().strip('[]')] = value.strip().strip('[]')
+    return props
+
+def list_adb_devices() -> Optional[List[str]]:
+    """adb devices에서 'device' 상태인 udid 목록 (adb 실행 실패 시 None)"""
+    output = run_adb(['devices'])
+    if output is None:
+        return None
+    udids = []
+    for line in output.strip().split('\n')[1:]:  # 첫 번째 헤더 라인 제외
+        parts = line.split()
+        if len(parts) >= 2 and parts[1] == 'device':
+            udids.append(parts[0])
+    return udids
+
+class DeviceDiscovery:
+    """동시 getprop + 디스크 캐시 기반 디바이스 탐색기"""
+
+    def __init__(self, cache_file: str = DEVICE_CACHE_FILE, max_workers: int = DEVICE_DISCOVERY_WORKERS):
+        self.cache_file = cache_file
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Dict[str, Any]] = self._load_cache()
+        self.cache_hits = 0
+        self.refreshed = 0
+        self.failed = 0
+        self.adb_error = False
+        self.last_elapsed = 0.0
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.isfile(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 디바이스 캐시 읽기 실패 ({self.cache_file}): {e}")
+            return {}
+
+    def _save_cache(self):
+        temp_path = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._cache, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.cache_file)
+        except OSError as e:
+            print(f"⚠️ 디바이스 캐시 저장 실패 ({self.cache_file}): {e}")
+
+    def _probe_device(self, udid: str) -> Optional[DeviceInfo]:
+        """빌드 지문만 먼저 조회하고 캐시와 다를 때만 전체 getprop 실행"""
+        fingerprint_output = run_adb(['shell', 'getprop', FINGERPRINT_PROPERTY], udid=udid)
+        fingerprint = fingerprint_output.strip() if fingerprint_output else ''
+
+        cached = self._cache.get(udid)
+        if fingerprint and cached and cached.get('build_fingerprint') == fingerprint:
+            with self._lock:
+                self.cache_hits += 1
+            return DeviceInfo(udid=udid, build_fingerprint=fingerprint,
+                              properties=dict(cached.get('properties', {})),
+                              discovered_at=cached.get('discovered_at', time.time()))
+
+        output = run_adb(['shell', 'getprop'], udid=udid)
+        if output is None:
+            with self._lock:
+                self.failed += 1
+            return None
+
+        props = parse_getprop(output)
+        info = DeviceInfo(
+            udid=udid,
+            build_fingerprint=props.get(FINGERPRINT_PROPERTY, fingerprint),
+            properties={key: props[key] for key in CACHED_PROPERTIES if key in props}
+        )
+        with self._lock:
+            self.refreshed += 1
+            self._cache[udid] = asdict(info)
+        return info
+
+    def discover(self) -> List[DeviceInfo]:
+        """연결된 디바이스 탐색 (adb devices 순서 유지)"""
+        start = time.time()
+        udids = list_adb_devices()
+        self.adb_error = udids is None
+        if udids is None:
+            print("Error running adb devices command")
+            return []
+        if not udids:
+            self.last_elapsed = time.time() - start
+            return []
+
+        hits_before, refreshed_before = self.cache_hits, self.refreshed
+        workers = max(1, min(self.max_workers, len(udids)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='adb-probe') as executor:
+            devices = [device for device in executor.map(self._probe_device, udids) if device]
+
+        if self.refreshed != refreshed_before:
+            self._save_cache()
+
+        self.last_elapsed = time.time() - start
+        print(f"📱 디바이스 탐색 완료: {len(devices)}대 ({self.last_elapsed:.2f}s, "
+              f"캐시 사용 {self.cache_hits - hits_before}대, 속성 갱신 {self.refreshed - refreshed_before}대)")
+        return devices
+
+    def get_cached_device(self, udid: str) -> Optional[DeviceInfo]:
+        """캐시된 디바이스 정보 조회 (adb 호출 없음)"""
+        cached = self._cache.get(udid)
+        if not cached:
+            return None
+        return DeviceInfo(udid=udid, build_fingerprint=cached.get('build_fingerprint', ''),
+                          properties=dict(cached.get('properties', {})),
+                          discovered_at=cached.get('discovered_at', time.time()))
+
+# 글로벌 인스턴스
+device_discovery = None
+
+def get_device_discovery() -> DeviceDiscovery:
+    """글로벌 DeviceDiscovery 인스턴스 반환"""
+    global device_discovery
+    if device_discovery is None:
+        device_discovery = DeviceDiscovery()
+    return device_discovery
+
+def discover_devices() -> List[DeviceInfo]:
+    """연결된 디바이스 탐색 (글로벌 탐색기 사용)"""
+    return get_device_discovery().discover()
@@ -0,0 +1,232 @@
+"""
+DOM 스텝 일괄 실행 모듈 (fast path)
+연속된 input/click/verify 스텝을 execute_script 1회로 묶어 브라우저 안에서 실행
+(스텝마다 조회, clear, send_keys, click, 페이지 준비 확인으로 나뉘던 WebDriver 왕복을 제거)
+배치에서 처리하지 못한 스텝부터는 기존 스텝 실행 함수(WebDriver 경로)로 이어서 실행
+
+    for step in run_dom_batches(driver, test_case.steps, lambda: wait_for_page_ready(driver, SLEEP_TIME)):
+        if not execute_test_step(driver, wait, step):
+            raise Exception(f"Step failed: {step.description}")
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from step_profiler import get_step_profiler
+
+# 설정은 러너의 load_dotenv 이후 호출 시점에 읽음 (.env의 DOM_BATCH, DOM_BATCH_EXCLUDE 반영)
+def dom_batch_enabled() -> bool:
+    return os.getenv('DOM_BATCH', 'false').lower() == 'true'
+
+def dom_batch_exclude() -> List[str]:
+    """실제 입력 이벤트가 필요한 선택자 (부분 문자열, 쉼표 구분) - 항상 WebDriver로 실행"""
+    return [value.strip() for value in os.getenv('DOM_BATCH_EXCLUDE', '').split(',') if value.strip()]
+
+BATCH_ACTIONS = ('input', 'click', 'verify')
+BATCH_SELECTOR_TYPES = ('CSS_SELECTOR', 'XPATH', 'ID', 'NAME', 'CLASS_NAME', 'TAG_NAME')
+
+# WebDriver 경로의 스텝당 대략적인 왕복 수 (조회, 상태 확인, 동작, 페이지 준비 확인)
+WEBDRIVER_ROUND_TRIPS = {'input': 4, 'click': 5, 'verify': 4}
+# 배치 1회 비용 (execute_script + 페이지 준비 확인)
+BATCH_ROUND_TRIPS = 2
+
+# 스텝 목록 [action, selector_type, selector_value, input_value]을 순서대로 실행하고
+# 완료한 스텝 수(done)와 멈춘 이유 반환 (클릭은 항상 배치의 마지막 스텝)
+DOM_BATCH_JS = """
+var steps = arguments[0];
+var NATIVE_INPUT_TYPES = ['file', 'checkbox', 'radio', 'date', 'time', 'datetime-local',
+                          'month', 'week', 'color', 'range'];
+
+function locate(type, value) {
+    switch (type) {
+        case 'XPATH':
+            return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        case 'ID': return document.getElementById(value);
+        case 'NAME': return document.getElementsByName(value)[0] || null;
+        case 'CLASS_NAME': return document.getElementsByClassName(value)[0] || null;
+        case 'TAG_NAME': return document.getElementsByTagName(value)[0] || null;
+        default: return document.querySelector(value);
+    }
+}
+
+function isDisplayed(el) {
+    if (!el.isConnected) { return false; }
+    var style = window.getComputedStyle(el);
+    if (style.display === 'none' || style.visibility === 'hidden' ||
+        style.visibility === 'collapse' || style.opacity === '0') { return false; }
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+
+function setValue(el, value) {
+    // 프레임워크가 감싼 value 속성을 우회하도록 네이티브 setter 사용 후 input/change 이벤트 발생
+    var proto = el.tagName.toLowerCase() === 'textarea' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    el.focus();
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.blur();
+}
+
+function click(el) {
+    el.scrollIntoView({block: 'center'});
+    ['pointerdown', 'mousedown', 'pointerup', 'mouseup'].forEach(function(type) {
+        el.dispatchEvent(new MouseEvent(type, {bubbles: true, cancelable: true, view: window}));
+    });
+    el.click();
+}
+
+for (var i = 0; i < steps.length; i++) {
+    var step = steps[i], el;
+    try {
+        el = locate(step[1], step[2]);
+    } catch (e) {
+        return {done: i, reason: 'invalid selector'};
+    }
+    if (!el) { return {done: i, reason: 'not found'}; }
+
+    if (step[0] === 'input') {
+        var tag = el.tagName.toLowerCase(), type = (el.type || '').toLowerCase();
+        if ((tag !== 'input' && tag !== 'textarea') || el.disabled || el.readOnly ||
+                NATIVE_INPUT_TYPES.indexOf(type) >= 0) {
+            return {done: i, reason: 'needs native input'};
+        }
+        setValue(el, step[3] || '');
+    } else if (step[0] === 'click') {
+        if (!isDisplayed(el) || el.disabled) { return {done: i, reason: 'not clickable'}; }
+        // 페이지 이동으로 스크립트 응답이 끊기지 않도록 응답 후 클릭
+        setTimeout(click.bind(null, el), 0);
+    } else if (step[0] === 'verify') {
+        if (!isDisplayed(el)) { return {done: i, reason: 'not visible'}; }
+        if (step[3] && (el.innerText || '').indexOf(step[3]) < 0) { return {done: i, reason: 'text mismatch'}; }
+    }
+}
+return {done: steps.length, reason: null};
+"""
+
+def _has_special_keys(value: str) -> bool:
+    """Selenium Keys(유니코드 사설 영역) 포함 여부 - 실제 키 입력 필요"""
+    return any('\ue000' <= char <= '\uf8ff' for char in value or '')
+
+def is_batchable(step, exclude: List[str] = None) -> bool:
+    """브라우저 안에서 바로 실행할 수 있는 DOM 스텝인지 확인"""
+    selector_value = step.selector_value or ''
+    exclude = dom_batch_exclude() if exclude is None else exclude
+    return (step.action.lower() in BATCH_ACTIONS and
+            (step.selector_type or '').upper() in BATCH_SELECTOR_TYPES and
+            not _has_special_keys(step.input_value) and
+            not any(excluded in selector_value for excluded in exclude))
+
+def plan_batches(steps: List[Any]) -> List[List[Any]]:
+    """
+    스텝을 배치 단위로 나누기
+
+    연속된 DOM 스텝을 묶되 클릭 뒤에서 끊음 (클릭 후에는 페이지가 바뀔 수 있음)
+    2개 이상 묶인 경우만 배치로 실행하고 나머지는 스텝 1개짜리 묶음으로 반환
+    """
+    plan: List[List[Any]] = []
+    current: List[Any] = []
+    exclude = dom_batch_exclude()
+
+    def flush():
+        if len(current) > 1:
+            plan.append(list(current))
+        else:
+            plan.extend([step] for step in current)
+        current.clear()
+
+    for step in steps:
+        if not is_batchable(step, exclude):
+            flush()
+            plan.append([step])
+            continue
+        current.append(step)
+        if step.action.lower() == 'click':
+            flush()
+    flush()
+    return plan
+
+class DomBatchStats:
+    """배치 실행 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.batched_steps = 0
+        self.fallback_steps = 0
+        self.round_trips_saved = 0
+        self.reasons: Dict[str, int] = {}
+
+    def add(self, steps: List[Any], done: int, reason: str = None):
+        saved = sum(WEBDRIVER_ROUND_TRIPS.get(step.action.lower(), 1) for step in steps[:done]) - BATCH_ROUND_TRIPS
+        with self._lock:
+            self.batches += 1
+            self.batched_steps += done
+            self.fallback_steps += len(steps) - done
+            self.round_trips_saved += saved
+            if reason:
+                self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def get_report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'batched_steps': self.batched_steps,
+                'fallback_steps': self.fallback_steps,
+                'round_trips_saved': self.round_trips_saved,
+                'fallback_reasons': dict(self.reasons)
+            }
+
+    def print_report(self):
+        report = self.get_report()
+        if not report['batches']:
+            return
+        print("\n⚡ DOM 배치 실행 리포트:")
+        print(f"   배치 {report['batches']}회, 배치로 실행한 스텝 {report['batched_steps']}개, "
+              f"WebDriver로 다시 실행한 스텝 {report['fallback_steps']}개")
+        print(f"   절감한 WebDriver 왕복 (추정): {report['round_trips_saved']}회")
+        for reason, count in report['fallback_reasons'].items():
+            print(f"     - {reason}: {count}회")
+
+# 글로벌 인스턴스
+dom_batch_stats = DomBatchStats()
+
+def get_dom_batch_stats() -> DomBatchStats:
+    """글로벌 DomBatchStats 인스턴스 반환"""
+    return dom_batch_stats
+
+def execute_batch(driver, steps: List[Any], page_ready: Callable[[], Any]) -> int:
+    """배치 1개 실행 후 완료한 스텝 수 반환 (스크립트 실행 실패 시 0)"""
+    profiler = get_step_profiler()
+    payload = [[step.action.lower(), step.selector_type.upper(), step.selector_value, step.input_value or '']
+               for step in steps]
+    with profiler.step(f"dom_batch {len(steps)} steps"):
+        try:
+            with profiler.span('action', 'dom_batch'):
+                result = driver.execute_script(DOM_BATCH_JS, payload) or {}
+            done, reason = int(result.get('done', 0)), result.get('reason')
+        except Exception as e:
+            done, reason = 0, f"script error: {type(e).__name__}"
+        if done:
+            with profiler.span('sleep', 'page_ready'):
+                page_ready()
+    get_dom_batch_stats().add(steps, done, reason)
+    return done
+
+def run_dom_batches(driver, steps: List[Any], page_ready: Callable[[], Any],
+                    enabled: Optional[bool] = None) -> Iterator[Any]:
+    """
+    배치로 실행할 수 있는 스텝은 바로 실행하고 WebDriver로 실행해야 하는 스텝만 순서대로 반환
+
+    반환된 스텝을 호출 측에서 실행한 뒤 다음 배치를 진행하므로 실행 순서는 원래 스텝 순서와 같음
+    (enabled가 None이면 DOM_BATCH 환경변수 사용)
+    """
+    if enabled is None:
+        enabled = dom_batch_enabled()
+    if not enabled:
+        yield from steps
+        return
+    for batch in plan_batches(steps):
+        done = execute_batch(driver, batch, page_ready) if len(batch) > 1 else 0
+        yield from batch[done:]
@@ -0,0 +1,167 @@
+"""
+스트리밍 요소 로그 모듈
+스캔한 페이지와 컨텍스트 전환 기록을 JSONL로 바로 기록하고(레코드마다 flush)
+메모리에는 요약용 집계(타입별 개수, 주요 요소 샘플)만 유지
+기존 webview_elements.json 형식은 필요할 때 JSONL에서 오프라인으로 재생성
+
+    python element_log_sink.py logs/webview_test_xxx/webview_elements.jsonl
+"""
+
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+# ELEMENT_LOG_LEGACY_JSON, ELEMENT_LOG_SAMPLE_SIZE는 load_dotenv 이후 값이 반영되도록 기록기 생성 시 읽음
+SAMPLE_ELEMENT_TYPES = ('inputs', 'buttons')
+
+class ElementLogSink:
+    """요소 로그 JSONL 기록기 (메모리에는 집계만 유지)"""
+
+    def __init__(self, path: str, session_info: Dict[str, Any], legacy_json: bool = None, sample_size: int = None):
+        self.path = path
+        self.session_info = dict(session_info)
+        # true면 세션 종료 시 기존 JSON 파일도 함께 생성 (대용량 세션에서는 false 권장)
+        if legacy_json is None:
+            legacy_json = os.getenv('ELEMENT_LOG_LEGACY_JSON', 'false').lower() == 'true'
+        self.legacy_json = legacy_json
+        # 요약 로그에 표시할 요소 타입별 샘플 개수
+        self.sample_size = sample_size if sample_size is not None else int(os.getenv('ELEMENT_LOG_SAMPLE_SIZE', '10'))
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8')
+        self.closed = False
+
+        self.total_pages = 0
+        self.total_elements = 0
+        self.context_switches = 0
+        self.type_stats: Dict[str, int] = {}
+        self.samples: Dict[str, List[Dict[str, Any]]] = {element_type: [] for element_type in SAMPLE_ELEMENT_TYPES}
+        self._write({'record': 'session', 'data': self.session_info})
+
+    def _write(self, record: Dict[str, Any]):
+        with self._lock:
+            if self.closed:
+                return
+            self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            self._file.flush()
+
+    def add_context_switch(self, info: Dict[str, Any]):
+        """컨텍스트 전환/로그인 기록 추가"""
+        self.context_switches += 1
+        self._write({'record': 'context_switch', 'data': info})
+
+    def add_page(self, page_data: Dict[str, Any]):
+        """스캔한 페이지 1개 기록 후 집계만 갱신"""
+        self.total_pages += 1
+        for elements in page_data.get('elements', {}).values():
+            for element in elements:
+                self.total_elements += 1
+                element_type = element.get('element_type', 'unknown')
+                self.type_stats[element_type] = self.type_stats.get(element_type, 0) + 1
+                samples = self.samples.get(element_type)
+                if samples is not None and len(samples) < self.sample_size:
+                    samples.append({key: value for key, value in element.items() if key != 'element'})
+        self._write({'record': 'page', 'data': page_data})
+
+    def close(self) -> Dict[str, Any]:
+        """세션 종료 정보 기록 후 파일 닫기 (최종 session_info 반환)"""
+        if self.closed:
+            return self.session_info
+        self.session_info.update({
+            'end_time': datetime.now().isoformat(),
+            'total_elements_found': self.total_elements,
+            'total_pages_scanned': self.total_pages
+        })
+        self._write({'record': 'session_end', 'data': self.session_info})
+        with self._lock:
+            self.closed = True
+            self._file.close()
+        return self.session_info
+
+    def get_report(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'pages': self.total_pages,
+            'elements': self.total_elements,
+            'context_switches': self.context_switches,
+            'type_stats': dict(self.type_stats)
+        }
+
+def read_element_log(path: str) -> Iterator[Dict[str, Any]]:
+    """JSONL 레코드 순회 (중간에 끊긴 마지막 줄은 무시)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                print(f"⚠️ 손상된 요소 로그 줄 건너뜀: {path}")
+
+def _dump_indented(value: Any, level: int) -> str:
+    """json.dump(indent=2) 결과와 같은 들여쓰기로 값 1개 직렬화"""
+    return json.dumps(value, ensure_ascii=False, indent=2, default=str).replace('\n', '\n' + '  ' * level)
+
+def _write_array(f, key: str, items: Iterator[Any], last: bool = False):
+    f.write(f'  "{key}": [')
+    first = True
+    for item in items:
+        f.write(('\n' if first else ',\n') + '    ' + _dump_indented(item, 2))
+        first = False
+    f.write(']' if first else '\n  ]')
+    f.write('\n' if last else ',\n')
+
+def rebuild_legacy_json(jsonl_path: str, json_path: Optional[str] = None) -> str:
+    """
+    JSONL 요소 로그에서 기존 webview_elements.json 형식 재생성
+    (session_info, context_switches, scanned_pages, all_elements)
+    페이지 단위로 여러 번 읽어 쓰므로 메모리에는 페이지 1개만 올라감
+    """
+    json_path = json_path or os.path.splitext(jsonl_path)[0] + '.json'
+    session_info: Dict[str, Any] = {}
+    for record in read_element_log(jsonl_path):
+        if record.get('record') in ('session', 'session_end'):
+            session_info.update(record.get('data', {}))
+
+    def records(kind: str) -> Iterator[Dict[str, Any]]:
+        return (record.get('data', {}) for record in read_element_log(jsonl_path) if record.get('record') == kind)
+
+    def pages() -> Iterator[Dict[str, Any]]:
+        # 기존 형식과 같이 페이지 안의 요소에도 page_name, element_type_category 추가
+        for page in records('page'):
+            for element_type, elements in page.get('elements', {}).items():
+                for element in elements:
+                    element['page_name'] = page.get('page_name')
+                    element['element_type_category'] = element_type
+            yield page
+
+    def all_elements() -> Iterator[Dict[str, Any]]:
+        for page in pages():
+            for elements in page.get('elements', {}).values():
+                yield from elements
+
+    if 'total_elements_found' not in session_info:
+        # 세션이 비정상 종료된 경우 집계를 다시 계산
+        session_info['total_pages_scanned'] = sum(1 for _ in records('page'))
+        session_info['total_elements_found'] = sum(1 for _ in all_elements())
+
+    with open(json_path, 'w', encoding='utf-8') as f:
+        f.write('{\n  "session_info": ' + _dump_indented(session_info, 1) + ',\n')
+        _write_array(f, 'context_switches', records('context_switch'))
+        _write_array(f, 'scanned_pages', pages())
+        _write_array(f, 'all_elements', all_elements(), last=True)
+        f.write('}')
+    return json_path
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("사용법: python element_log_sink.py <webview_elements.jsonl> [출력 json 경로]")
+        sys.exit(1)
+    output = rebuild_legacy_json(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"✅ 기존 형식 JSON 생성: {output}")
@@ -1,6 +1,4 @@
-import time
 import re
-import csv
 import os
 from datetime import datetime, timedelta
 from selenium.webdriver.support.ui import WebDriverWait
@@ -8,6 +6,19 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from appium.webdriver.common.appiumby import AppiumBy
 from localization_manager import get_localization_manager, get_localized_text
+from readiness_wait import wait_for_page_ready
+from screenshot_service import EXPLICIT_KIND, get_screenshot_service
+from step_profiler import get_step_profiler, wait_until
+
+# 셀렉터 타입 -> AppiumBy (알 수 없는 타입은 XPATH)
+SELECTOR_TYPES = {
+    'CSS_SELECTOR': AppiumBy.CSS_SELECTOR,
+    'XPATH': AppiumBy.XPATH,
+    'ID': AppiumBy.ID,
+    'CLASS_NAME': AppiumBy.CLASS_NAME,
+    'TAG_NAME': AppiumBy.TAG_NAME,
+    'NAME': AppiumBy.NAME
+}
 
 class EnhancedTestEngine:
     """향상된 테스트 실행 엔진 - 상세한 검증 로직 포함"""
@@ -16,71 +27,17 @@ class EnhancedTestEngine:
         self.driver = driver
         self.wait = WebDriverWait(driver, wait_timeout)
         self.country_code = country_code
+        # test_data.csv는 글로벌 LocalizationManager가 한 번만 로드하여 공유
         self.localization_manager = get_localization_manager()
-        self.test_data = {}
-        self.load_test_data()
         
-    def load_test_data(self):
-        """테스트 데이터 로딩 - 언어별 데이터 지원"""
-        try:
-            with open('test_data.csv', 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row['test_id'].startswith('#'):  # 주석 행 건너뛰기
-                        continue
-                        
-                    test_id = row['test_id']
-                    data_type = row['data_type']
-                    key = row['key']
-                    locale = row.get('locale', 'all')
-                    
-                    if test_id not in self.test_data:
-                        self.test_data[test_id] = {}
-                    if data_type not in self.test_data[test_id]:
-                        self.test_data[test_id][data_type] = {}
-                    
-                    # 언어별 키로 저장
-                    localized_key = f"{key}_{locale}"
-                    self.test_data[test_id][data_type][localized_key] = row['value']
-                    
-        except FileNotFoundError:
-            print("Warning: test_data.csv not found, using default values")
-            
     def get_test_data(self, test_id, data_type, key, language='ko', default=None):
-        """언어별 테스트 데이터 조회"""
-        # LocalizationManager를 사용한 조회
-        localized_value = self.localization_manager.get_localized_value(
-            test_id, data_type, key, language
-        )
-        if localized_value:
-            return localized_value
-        
-        # 기존 방식 폴백
-        # 1차: 특정 언어
-        localized_key = f"{key}_{language}"
-        value = self.test_data.get(test_id, {}).get(data_type, {}).get(localized_key)
-        if value:
-            return value
-        
-        # 2차: 공통 데이터
-        all_key = f"{key}_all"
-        value = self.test_data.get(test_id, {}).get(data_type, {}).get(all_key)
-        if value:
-            return value
-        
-        return default
+        """언어별 테스트 데이터 조회 (LocalizationManager 인덱스에서 폴백까지 한 번에 조회)"""
+        value = self.localization_manager.get_localized_value(test_id, data_type, key, language)
+        return value if value else default
     
     def get_locator(self, selector_type, selector_value):
         """셀렉터 타입에 따른 로케이터 생성"""
-        selector_map = {
-            'CSS_SELECTOR': AppiumBy.CSS_SELECTOR,
-            'XPATH': AppiumBy.XPATH,
-            'ID': AppiumBy.ID,
-            'CLASS_NAME': AppiumBy.CLASS_NAME,
-            'TAG_NAME': AppiumBy.TAG_NAME,
-            'NAME': AppiumBy.NAME
-        }
-        return (selector_map.get(selector_type.upper(), AppiumBy.XPATH), selector_value)
+        return (SELECTOR_TYPES.get(selector_type.upper(), AppiumBy.XPATH), selector_value)
     
     def execute_step(self, step, test_id, lang='ko'):
         """테스트 스텝 실행 - 다국가/다언어 지원 향상"""
@@ -110,7 +67,7 @@ class EnhancedTestEngine:
             except Exception as e:
                 if attempt == retry_count - 1:  # 마지막 시도
                     raise e
-                time.sleep(1)  # 재시도 전 잠시 대기
+                get_step_profiler().sleep(1)  # 재시도 전 잠시 대기
         return False
     
     def _execute_action(self, action, selector_type, selector_value, input_value, 
@@ -187,24 +144,24 @@ class EnhancedTestEngine:
         wait = WebDriverWait(self.driver, wait_time)
         
         if condition == 'visible':
-            wait.until(EC.visibility_of_element_located(locator))
+            wait_until(self.driver, wait, EC.visibility_of_element_located(locator))
         elif condition == 'clickable':
-            wait.until(EC.element_to_be_clickable(locator))
+            wait_until(self.driver, wait, EC.element_to_be_clickable(locator))
         elif condition == 'present':
-            wait.until(EC.presence_of_element_located(locator))
+            wait_until(self.driver, wait, EC.presence_of_element_located(locator))
         elif condition == 'invisible':
-            wait.until(EC.invisibility_of_element_located(locator))
+            wait_until(self.driver, wait, EC.invisibility_of_element_located(locator))
         
         return True
     
     def _clear_and_input(self, selector_type, selector_value, input_value, wait_time):
         """입력 필드 클리어 후 입력"""
         locator = self.get_locator(selector_type, selector_value)
-        element = self.wait.until(EC.presence_of_element_located(locator))
+        element = wait_until(self.driver, self.wait, EC.presence_of_element_located(locator))
         element.clear()
-        time.sleep(0.5)  # 클리어 후 잠시 대기
+        get_step_profiler().sleep(0.5)  # 클리어 후 잠시 대기
         element.send_keys(input_value)
-        time.sleep(wait_time)
+        get_step_profiler().sleep(wait_time)
         return True
     
     def _verify_input_value(self, selector_type, selector_value, expected_value):
@@ -219,9 +176,9 @@ class EnhancedTestEngine:
         locator = self.get_locator(selector_type, selector_value)
         
         if condition == 'enabled':
-            element = self.wait.until(EC.element_to_be_clickable(locator))
+            element = wait_until(self.driver, self.wait, EC.element_to_be_clickable(locator))
         else:
-            element = self.wait.until(EC.presence_of_element_located(locator))
+            element = wait_until(self.driver, self.wait, EC.presence_of_element_located(locator))
         
         # JavaScript 클릭도 시도 (일반 클릭 실패 시)
         try:
@@ -229,7 +186,7 @@ class EnhancedTestEngine:
         except:
             self.driver.execute_script("arguments[0].click();", element)
         
-        time.sleep(wait_time)
+        get_step_profiler().sleep(wait_time)
         return True
     
     def _wait_for_page_load(self, selector_type, selector_value, condition, wait_time):
@@ -239,7 +196,7 @@ class EnhancedTestEngine:
         else:
             # JavaScript readyState 확인
             wait = WebDriverWait(self.driver, wait_time)
-            wait.until(lambda driver: driver.execute_script("return document.readyState") == "complete")
+            wait_until(self.driver, wait, lambda driver: driver.execute_script("return document.readyState") == "complete")
             return True
     
     def _verify_url_contains(self, expected_url_part):
@@ -259,8 +216,8 @@ class EnhancedTestEngine:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         screenshot_path = f"screenshots/test_{timestamp}/{filename}_{timestamp}.png"
         os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
-        self.driver.save_screenshot(screenshot_path)
-        return True
+        # 시나리오가 직접 요청한 스크린샷은 SCREENSHOT_POLICY와 관계없이 저장
+        return get_screenshot_service().capture(self.driver, screenshot_path, EXPLICIT_KIND) is not None
     
     def _wait_for_loading(self, selector_type, selector_value, condition, wait_time):
         """로딩 스피너 사라질 때까지 대기"""
@@ -304,7 +261,7 @@ class EnhancedTestEngine:
     def _scroll_to_bottom(self):
         """페이지 하단으로 스크롤"""
         self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
+        get_step_profiler().sleep(2)
         return True
     
     def _click_each_tab(self, selector_type, selector_value):
@@ -315,7 +272,7 @@ class EnhancedTestEngine:
         for i, tab in enumerate(tabs):
             try:
                 tab.click()
-                time.sleep(2)
+                get_step_profiler().sleep(2)
                 # 탭 내용 로딩 확인
                 self.driver.execute_script("return document.readyState") == "complete"
             except Exception as e:
@@ -349,7 +306,7 @@ class EnhancedTestEngine:
         
         # 옵션 찾아서 클릭
         option_locator = (AppiumBy.XPATH, f"//option[@value='{option_value}'] | //li[contains(text(), '{option_value}')]")
-        option = self.wait.until(EC.element_to_be_clickable(option_locator))
+        option = wait_until(self.driver, self.wait, EC.element_to_be_clickable(option_locator))
         option.click()
         return True
     
@@ -394,7 +351,7 @@ class EnhancedTestEngine:
         """성공 메시지 확인"""
         try:
             locator = self.get_locator(selector_type, selector_value)
-            element = self.wait.until(EC.visibility_of_element_located(locator))
+            element = wait_until(self.driver, self.wait, EC.visibility_of_element_located(locator))
             return expected_message in element.text
         except TimeoutException:
             return False
@@ -404,17 +361,17 @@ class EnhancedTestEngine:
         locator = self.get_locator(selector_type, selector_value)
         
         if action == 'click':
-            element = self.wait.until(EC.element_to_be_clickable(locator))
+            element = wait_until(self.driver, self.wait, EC.element_to_be_clickable(locator))
             element.click()
         elif action == 'input':
-            element = self.wait.until(EC.presence_of_element_located(locator))
+            element = wait_until(self.driver, self.wait, EC.presence_of_element_located(locator))
             element.clear()
             element.send_keys(input_value)
         elif action == 'verify':
-            element = self.wait.until(EC.presence_of_element_located(locator))
+            element = wait_until(self.driver, self.wait, EC.presence_of_element_located(locator))
             assert element.is_displayed(), "Element not visible"
         
-        time.sleep(2)  # 기본 대기
+        wait_for_page_ready(self.driver, 2)  # 기본 대기 (최대 2초)
         return True
     
     def _replace_test_data(self, test_id, value, lang='ko'):
@@ -10,6 +10,15 @@ from appium.options.android import UiAutomator2Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from enhanced_test_engine import EnhancedTestEngine
+from readiness_wait import get_readiness_stats
+from result_sink import create_result_sink
+from scenario_cache import get_scenario_cache
+import scenario_loader
+from scenario_loader import EnhancedTestCase, EnhancedTestStep
+from step_profiler import get_step_profiler
+from localization_manager import get_localization_manager, preload_localization
+from screenshot_service import get_screenshot_service
+from webdriver_recorder import record_driver
 
 # Load environment variables
 load_dotenv()
@@ -22,6 +31,11 @@ os.makedirs(SCREENSHOT_DIR, exist_ok=True)
 RESULT_CSV_FILE = f'test_results_enhanced_{start_time}.csv'
 TEST_STEPS_FILE = os.getenv('TEST_STEPS_ENHANCED_CSV', 'test_steps_enhanced.csv')
 TEST_CASES_FILE = os.getenv('TEST_CASES_CSV', 'test_cases.csv')
+result_sink = create_result_sink(RESULT_CSV_FILE, [
+    'timestamp', 'language', 'test_id', 'step_order', 'step_description',
+    'status', 'message', 'execution_time_ms', 'screenshot_path'
+])
+screenshots = get_screenshot_service()
 
 # App settings from environment
 BASE_URL = os.getenv('BASE_URL', 'http://localhost/')
@@ -33,30 +47,6 @@ APP_PACKAGE = os.getenv('VI_APP_PACKAGE', 'com.cesco.oversea.srs.viet')
 APP_ACTIVITY = os.getenv('DEFAULT_APP_ACTIVITY', 'com.mcnc.bizmob.cesco.SlideFragmentActivity')
 UDID = os.getenv('DEFAULT_UDID', 'RFCM902ZM9K')
 
-class EnhancedTestCase:
-    """향상된 테스트 케이스 클래스"""
-    def __init__(self, test_id, description, url, steps):
-        self.test_id = test_id
-        self.description = description
-        self.url = url
-        self.steps = steps
-
-class EnhancedTestStep:
-    """향상된 테스트 스텝 클래스"""
-    def __init__(self, step_order, action, selector_type, selector_value, 
-                 input_value=None, expected_value=None, wait_time=3, 
-                 description=None, validation_type='basic', retry_count=1):
-        self.step_order = int(step_order)
-        self.action = action
-        self.selector_type = selector_type
-        self.selector_value = selector_value
-        self.input_value = input_value
-        self.expected_value = expected_value
-        self.wait_time = int(wait_time)
-        self.description = description
-        self.validation_type = validation_type
-        self.retry_count = int(retry_count)
-
 def get_driver():
     """Appium 드라이버 초기화"""
     capabilities = dict(
@@ -90,95 +80,42 @@ def get_driver():
     appium_host = os.getenv('APPIUM_HOST', 'localhost')
     appium_port = os.getenv('APPIUM_PORT', '4723')
     driver = webdriver.Remote(f'http://{appium_host}:{appium_port}', options=options)
+    driver = record_driver(driver, UDID)
     driver.implicitly_wait(int(os.getenv('IMPLICIT_WAIT', '10')))
     return driver
 
 def load_enhanced_test_cases():
     """향상된 테스트 케이스 로딩"""
     try:
-        # 테스트 케이스 기본 정보 로딩
-        test_cases_data = {}
-        with open(TEST_CASES_FILE, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                test_cases_data[row['test_id']] = {
-                    'description': row['description'],
-                    'url': row['url']
-                }
-        
-        # 테스트 스텝 로딩
-        test_steps_data = {}
-        with open(TEST_STEPS_FILE, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # 주석 행 스킵
-                if row['test_id'].startswith('#'):
-                    continue
-                    
-                test_id = row['test_id']
-                if test_id not in test_steps_data:
-                    test_steps_data[test_id] = []
-                
-                step = EnhancedTestStep(
-                    step_order=row['step_order'],
-                    action=row['action'],
-                    selector_type=row['selector_type'],
-                    selector_value=row['selector_value'],
-                    input_value=row.get('input_value'),
-                    expected_value=row.get('expected_value'),
-                    wait_time=row.get('wait_time', 3),
-                    description=row.get('description'),
-                    validation_type=row.get('validation_type', 'basic'),
-                    retry_count=row.get('retry_count', 1)
-                )
-                test_steps_data[test_id].append(step)
-        
-        # 테스트 케이스 생성
-        test_cases = []
-        for test_id, case_info in test_cases_data.items():
-            if test_id in test_steps_data:
-                # 스텝을 순서대로 정렬
-                steps = sorted(test_steps_data[test_id], key=lambda x: x.step_order)
-                test_case = EnhancedTestCase(
-                    test_id=test_id,
-                    description=case_info['description'],
-                    url=case_info['url'],
-                    steps=steps
-                )
-                test_cases.append(test_case)
-            else:
-                print(f"Warning: No steps found for test case {test_id}")
-        
-        return test_cases
+        return scenario_loader.load_enhanced_test_cases(TEST_CASES_FILE, TEST_STEPS_FILE)
     except Exception as e:
         print(f"Error loading enhanced test cases: {str(e)}")
         return []
 
 def log_enhanced_result(lang, test_id, step_order, step_description, status, 
                        message, execution_time=None, screenshot_path=None):
-    """향상된 테스트 결과 로깅"""
-    file_exists = os.path.isfile(RESULT_CSV_FILE)
-    with open(RESULT_CSV_FILE, mode='a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow([
-                'timestamp', 'language', 'test_id', 'step_order', 'step_description',
-                'status', 'message', 'execution_time_ms', 'screenshot_path'
-            ])
-        writer.writerow([
-            datetime.now().isoformat(),
-            lang,
-            test_id,
-            step_order,
-            step_description,
-            status,
-            message,
-            execution_time,
-            screenshot_path
-        ])
+    """향상된 테스트 결과 로깅 (백그라운드 기록기 큐에 추가)"""
+    result_sink.write({
+        'timestamp': datetime.now().isoformat(),
+        'language': lang,
+        'test_id': test_id,
+        'step_order': step_order,
+        'step_description': step_description,
+        'status': status,
+        'message': message,
+        'execution_time_ms': execution_time,
+        'screenshot_path': screenshot_path
+    })
 
 def execute_enhanced_test_case(engine, test_case, lang):
     """향상된 테스트 케이스 실행"""
+    # 테스트 데이터 리로드는 케이스 사이에만 반영 (케이스 진행 중에는 시작 시점 데이터 고정)
+    with get_step_profiler().context(device=UDID, language=lang, test_id=test_case.test_id), \
+            get_localization_manager().test_case_scope():
+        return _execute_enhanced_test_case(engine, test_case, lang)
+
+def _execute_enhanced_test_case(engine, test_case, lang):
+    profiler = get_step_profiler()
     test_start_time = time.time()
     
     print(f"\n🚀 Starting test case: {test_case.test_id} - {test_case.description}")
@@ -186,8 +123,9 @@ def execute_enhanced_test_case(engine, test_case, lang):
     # URL 이동 (필요한 경우)
     if test_case.url:
         full_url = BASE_URL + test_case.url
-        engine.driver.get(full_url)
-        time.sleep(SLEEP_TIME)
+        with profiler.span('action', 'navigate'):
+            engine.driver.get(full_url)
+        profiler.sleep(SLEEP_TIME)
         print(f"📍 Navigated to: {full_url}")
     
     total_steps = len(test_case.steps)
@@ -213,7 +151,8 @@ def execute_enhanced_test_case(engine, test_case, lang):
                 'retry_count': step.retry_count
             }
             
-            success = engine.execute_step(step_dict, test_case.test_id, lang)
+            with profiler.step(f"{step.action} {step.selector_value}"):
+                success = engine.execute_step(step_dict, test_case.test_id, lang)
             
             step_execution_time = int((time.time() - step_start_time) * 1000)
             
@@ -242,7 +181,7 @@ def execute_enhanced_test_case(engine, test_case, lang):
             screenshot_filename = f"{lang}_{test_case.test_id}_step{step.step_order}_error.png"
             screenshot_path = os.path.join(SCREENSHOT_DIR, screenshot_filename)
             try:
-                engine.driver.save_screenshot(screenshot_path)
+                screenshot_path = screenshots.capture(engine.driver, screenshot_path, 'error')
             except:
                 screenshot_path = None
             
@@ -255,7 +194,7 @@ def execute_enhanced_test_case(engine, test_case, lang):
     final_screenshot = f"{lang}_{test_case.test_id}_final.png"
     final_screenshot_path = os.path.join(SCREENSHOT_DIR, final_screenshot)
     try:
-        engine.driver.save_screenshot(final_screenshot_path)
+        final_screenshot_path = screenshots.capture(engine.driver, final_screenshot_path, 'final')
     except:
         final_screenshot_path = None
     
@@ -295,6 +234,9 @@ class TestEnhancedScenarios(unittest.TestCase):
         for case in test_cases:
             print(f"  - {case.test_id}: {case.description} ({len(case.steps)} steps)")
         
+        # 테스트 데이터/언어 설정 미리 로드
+        preload_localization()
+        
         # 드라이버 초기화
         driver = get_driver()
         wait = WebDriverWait(driver, int(os.getenv('EXPLICIT_WAIT', '20')))
@@ -362,8 +304,15 @@ class TestEnhancedScenarios(unittest.TestCase):
             print(f"   - Passed Tests: {passed_tests}")
             print(f"   - Failed Tests: {completed_tests - passed_tests}")
             print(f"   - Success Rate: {success_rate:.1f}%")
-            print(f"📁 Results saved to: {RESULT_CSV_FILE}")
+            result_sink.flush()
+            print(f"📁 Results saved to: {result_sink.path}")
             print(f"📸 Screenshots saved to: {SCREENSHOT_DIR}")
+            get_readiness_stats().print_report()
+            get_scenario_cache().print_report()
+            get_step_profiler().print_report()
+            get_step_profiler().save('enhanced_profile')
+            screenshots.close()
+            screenshots.print_report()
             
         finally:
             driver.quit()
@@ -0,0 +1,184 @@
+"""
+언어 매트릭스 병렬 실행 모듈
+기준 디바이스와 같은 기종(모델 + Android 버전)의 디바이스가 더 연결되어 있으면
+언어마다 다른 디바이스에서 동시에 실행 (디바이스마다 드라이버 1개, Appium 서버/포트는 서버 풀에서 할당)
+남는 디바이스가 없는 언어는 먼저 끝난 디바이스에서 이어서 순차 실행하고,
+결과는 러너의 공용 result_sink에 그대로 기록되어 하나의 리포트로 합쳐짐
+
+    run_language_matrix(UDID, LANGUAGES, open_device, lambda device, lang: run_language(device, lang, cases),
+                        close_device)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from appium_server_pool import get_appium_server_pool
+from device_discovery import discover_devices
+
+# LANGUAGE_MATRIX, LANGUAGE_MATRIX_UDIDS는 러너의 load_dotenv 이후 호출 시점에 읽음
+
+def find_matrix_devices(primary_udid: str, limit: int) -> List[str]:
+    """기준 디바이스와 같은 기종의 디바이스 목록 (기준 디바이스가 첫 번째, 최대 limit대)"""
+    # 사용할 디바이스 (쉼표 구분, 비어 있으면 adb로 기준 디바이스와 같은 기종 탐색)
+    configured = [value.strip() for value in os.getenv('LANGUAGE_MATRIX_UDIDS', '').split(',') if value.strip()]
+    if configured:
+        udids = [primary_udid] + [udid for udid in configured if udid != primary_udid]
+        return udids[:max(1, limit)]
+
+    devices = discover_devices()
+    primary = next((device for device in devices if device.udid == primary_udid), None)
+    if primary is None:
+        print(f"⚠️ 기준 디바이스를 찾을 수 없음 ({primary_udid}) - 순차 실행")
+        return [primary_udid]
+    identical = [device.udid for device in devices
+                 if device.udid != primary_udid and device.model == primary.model
+                 and device.platform_version == primary.platform_version]
+    return ([primary_udid] + identical)[:max(1, limit)]
+
+class LanguageMatrix:
+    """언어 큐를 디바이스별 스레드가 하나씩 가져가 실행 (디바이스가 언어보다 적으면 남은 언어는 순차 실행)"""
+
+    def __init__(self, languages: List[str], udids: List[str]):
+        self.languages = list(languages)
+        self.udids = list(udids)
+        self._lock = threading.Lock()
+        self._pending = deque(self.languages)
+        self.runs: Dict[str, Dict[str, Any]] = {}
+        self.failed_devices: Dict[str, str] = {}
+        self.elapsed = 0.0
+
+    def _next_language(self) -> Optional[str]:
+        with self._lock:
+            return self._pending.popleft() if self._pending else None
+
+    def _record(self, lang: str, udid: str, status: str, duration: float, error: Optional[str] = None):
+        with self._lock:
+            self.runs[lang] = {'device': udid, 'status': status, 'duration': round(duration, 2)}
+            if error is not None:
+                self.runs[lang]['error'] = error
+
+    def _run_device(self, udid: str, appium_port: Optional[int], open_device: Callable[..., Any],
+                    run_language: Callable[[Any, str], Any], close_device: Callable[[Any], Any],
+                    propagate: bool):
+        """디바이스 1대에서 큐가 빌 때까지 언어 실행 (propagate가 아니면 오류 시 이 디바이스만 중단)"""
+        try:
+            device = open_device(udid, appium_port)
+        except Exception as e:
+            if propagate:
+                raise
+            print(f"❌ 디바이스 준비 실패 ({udid}): {e}")
+            with self._lock:
+                self.failed_devices[udid] = str(e)
+            return
+
+        try:
+            while True:
+                lang = self._next_language()
+                if lang is None:
+                    break
+                start = time.time()
+                try:
+                    run_language(device, lang)
+                except Exception as e:
+                    self._record(lang, udid, 'error', time.time() - start, str(e))
+                    if propagate:
+                        raise
+                    # 드라이버 상태를 알 수 없으므로 이 디바이스는 중단하고 남은 언어는 다른 디바이스가 실행
+                    print(f"❌ 언어 테스트 오류 ({udid}, {lang}): {e}")
+                    with self._lock:
+                        self.failed_devices[udid] = str(e)
+                    break
+                self._record(lang, udid, 'done', time.time() - start)
+        finally:
+            try:
+                close_device(device)
+            except Exception as e:
+                print(f"⚠️ 디바이스 정리 실패 ({udid}): {e}")
+
+    def run(self, open_device: Callable[..., Any], run_language: Callable[[Any, str], Any],
+            close_device: Callable[[Any], Any], appium_ports: Optional[Dict[str, int]] = None):
+        """
+        open_device(udid, appium_port) -> device, run_language(device, lang), close_device(device)
+
+        디바이스가 1대면 기존과 같이 순차 실행하고 오류도 그대로 전달
+        (appium_port가 None이면 러너의 APPIUM_PORT 사용)
+        """
+        start = time.time()
+        try:
+            if len(self.udids) == 1:
+                self._run_device(self.udids[0], None, open_device, run_language, close_device, True)
+                return
+            appium_ports = appium_ports or {}
+            with ThreadPoolExecutor(max_workers=len(self.udids), thread_name_prefix='language-matrix') as executor:
+                futures = [executor.submit(self._run_device, udid, appium_ports.get(udid), open_device,
+                                           run_language, close_device, False) for udid in self.udids]
+                for future in futures:
+                    future.result()
+        finally:
+            self.elapsed = time.time() - start
+
+    def skipped_languages(self) -> List[str]:
+        """실행할 디바이스가 남지 않아 실행되지 못한 언어"""
+        with self._lock:
+            return [lang for lang in self.languages if lang not in self.runs]
+
+    def failed_languages(self) -> List[Tuple[str, str]]:
+        """실행 중 오류로 중단된 언어와 오류 메시지 (해당 디바이스는 중단됨)"""
+        with self._lock:
+            return [(lang, self.runs[lang]['error']) for lang in self.languages
+                    if self.runs.get(lang, {}).get('status') == 'error']
+
+    def get_report(self) -> Dict[str, Any]:
+        with self._lock:
+            runs = dict(self.runs)
+            failed_devices = dict(self.failed_devices)
+        return {
+            'devices': list(self.udids),
+            'languages': runs,
+            'skipped': [lang for lang in self.languages if lang not in runs],
+            'failed_devices': failed_devices,
+            'elapsed': round(self.elapsed, 2),
+            # 같은 언어를 한 디바이스에서 순서대로 실행했을 때의 시간 (추정)
+            'sequential_estimate': round(sum(run['duration'] for run in runs.values()), 2)
+        }
+
+    def print_report(self):
+        report = self.get_report()
+        print("\n🌍 언어 매트릭스 실행 리포트:")
+        print(f"   디바이스 {len(report['devices'])}대, 언어 {len(self.languages)}개: "
+              f"{report['elapsed']}s (순차 실행 추정 {report['sequential_estimate']}s)")
+        for lang, run in report['languages'].items():
+            error = f" - {run['error']}" if run.get('error') else ''
+            print(f"   🌐 {lang}: {run['device']} ({run['status']}, {run['duration']}s){error}")
+        for udid, error in report['failed_devices'].items():
+            print(f"   ❌ {udid}: {error}")
+        if report['skipped']:
+            print(f"   ⚠️ 실행하지 못한 언어: {', '.join(report['skipped'])}")
+
+def run_language_matrix(primary_udid: str, languages: List[str], open_device: Callable[..., Any],
+                        run_language: Callable[[Any, str], Any], close_device: Callable[[Any], Any],
+                        enabled: Optional[bool] = None) -> LanguageMatrix:
+    """
+    언어 목록을 사용 가능한 디바이스에 나눠 실행 (비활성화 또는 추가 디바이스가 없으면 기준 디바이스에서 순차 실행)
+    (enabled가 None이면 LANGUAGE_MATRIX 환경변수 사용)
+    """
+    if enabled is None:
+        enabled = os.getenv('LANGUAGE_MATRIX', 'false').lower() == 'true'
+    udids = [primary_udid]
+    if enabled and len(languages) > 1:
+        udids = find_matrix_devices(primary_udid, len(languages))
+
+    matrix = LanguageMatrix(languages, udids)
+    if len(udids) == 1:
+        matrix.run(open_device, run_language, close_device)
+        return matrix
+
+    print(f"🌍 언어 매트릭스: 언어 {len(languages)}개를 디바이스 {len(udids)}대에서 동시 실행 ({', '.join(udids)})")
+    appium_ports = get_appium_server_pool().prepare(udids)
+    matrix.run(open_device, run_language, close_device, appium_ports)
+    matrix.print_report()
+    return matrix
@@ -6,10 +6,24 @@ CESCO SRS 모바일 앱 테스트의 언어별 설정과 데이터 관리
 import os
 import csv
 import json
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import threading
+import contextvars
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Iterable, Mapping, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
+from scenario_cache import load_cached
+
+# LOCALIZATION_FREEZE, LOCALIZATION_HOT_RELOAD, LOCALIZATION_RELOAD_INTERVAL은
+# 러너의 load_dotenv 이후 글로벌 관리자가 처음 생성될 때 읽음
+FALLBACK_LANGUAGE = 'en'
+COMMON_LOCALE = 'all'
+ANY_LANGUAGE = '*'   # 인덱스 생성 시 알 수 없던 언어용 항목 (all → en)
+
+LookupKey = Tuple[str, str, str, str]   # (test_id, data_type, key, language)
+
 class SupportedCountry(Enum):
     """지원 국가 코드"""
     VIETNAM = "VN"
@@ -51,22 +65,170 @@ class LocalizedData:
     value: str
     description: str
 
+@dataclass(frozen=True)
+class LocaleIndex:
+    """
+    test_data.csv 평면 조회 인덱스
+    lookup: 언어별 폴백 체인(language → all → en)을 미리 해석한 값
+    entries: CSV에 있는 그대로의 (test_id, data_type, key, locale) 값 (fallback=False 조회용)
+    """
+    lookup: Mapping[LookupKey, str] = field(default_factory=dict)
+    entries: Mapping[LookupKey, str] = field(default_factory=dict)
+    languages: frozenset = frozenset()
+
+    @classmethod
+    def build(cls, localized_data: Dict[str, Dict[str, Dict[str, 'LocalizedData']]],
+              languages: Iterable[str] = (), freeze: bool = True) -> 'LocaleIndex':
+        entries: Dict[LookupKey, str] = {}
+        for test_id, data_types in localized_data.items():
+            for data_type, items in data_types.items():
+                for item in items.values():
+                    entries[(test_id, data_type, item.key, item.language)] = item.value
+
+        known_languages = set(languages) | {FALLBACK_LANGUAGE}
+        known_languages.update(locale for _, _, _, locale in entries if locale != COMMON_LOCALE)
+        lookup: Dict[LookupKey, str] = {}
+        for test_id, data_type, key in {entry_key[:3] for entry_key in entries}:
+            for language in known_languages | {ANY_LANGUAGE}:
+                chain = (language, COMMON_LOCALE)
+                if language != FALLBACK_LANGUAGE:
+                    chain += (FALLBACK_LANGUAGE,)
+                for locale in chain:
+                    value = entries.get((test_id, data_type, key, locale))
+                    if value is not None:
+                        lookup[(test_id, data_type, key, language)] = value
+                        break
+
+        if freeze:
+            return cls(MappingProxyType(lookup), MappingProxyType(entries), frozenset(known_languages))
+        return cls(lookup, entries, frozenset(known_languages))
+
+    def get(self, test_id: str, data_type: str, key: str, language: str = 'ko',
+            fallback: bool = True) -> Optional[str]:
+        if fallback:
+            if language not in self.languages:
+                language = ANY_LANGUAGE
+            return self.lookup.get((test_id, data_type, key, language))
+        value = self.entries.get((test_id, data_type, key, language))
+        if value is None:
+            value = self.entries.get((test_id, data_type, key, COMMON_LOCALE))
+        return value
+
+@dataclass(frozen=True)
+class LocaleSnapshot:
+    """한 시점의 국가 설정 + 테스트 데이터 + 조회 인덱스 (리로드 시 통째로 교체)"""
+    country_configs: Dict[str, CountryConfig]
+    localized_data: Dict[str, Dict[str, Dict[str, LocalizedData]]]
+    index: LocaleIndex
+    signature: Tuple[Any, ...] = ()   # 로드 시점의 원본 파일 (mtime, 크기)
+
 class LocalizationManager:
     """다국가/다언어 지원 통합 관리자"""
     
-    def __init__(self, config_path: str = None):
+    def __init__(self, config_path: str = None, freeze: bool = None):
         self.config_path = config_path or os.path.join(os.path.dirname(__file__), 'localization_config.json')
         self.test_data_path = 'test_data.csv'
+        # true면 조회 인덱스를 읽기 전용(MappingProxyType)으로 고정 - 워커 스레드가 잠금 없이 공유
+        if freeze is None:
+            freeze = os.getenv('LOCALIZATION_FREEZE', 'true').lower() == 'true'
+        self.freeze = freeze
         
-        # 국가별 설정 초기화
-        self.country_configs: Dict[str, CountryConfig] = {}
-        self.localized_data: Dict[str, Dict[str, Dict[str, LocalizedData]]] = {}
-        
-        self._initialize_default_configs()
-        self._load_configurations()
-        self._load_test_data()
+        # 테스트 케이스 실행 중에는 시작 시점의 스냅샷을 고정하여 사용 (pinned)
+        self._pinned: contextvars.ContextVar = contextvars.ContextVar(f'localization_snapshot_{id(self)}', default=None)
+        self._snapshot = self._build_snapshot()
+        self.reload_count = 0
+        self._reload_lock = threading.Lock()
+        self._watch_stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+    
+    @property
+    def snapshot(self) -> LocaleSnapshot:
+        return self._pinned.get() or self._snapshot
+    
+    @property
+    def country_configs(self) -> Dict[str, CountryConfig]:
+        return self.snapshot.country_configs
+    
+    @property
+    def localized_data(self) -> Dict[str, Dict[str, Dict[str, LocalizedData]]]:
+        return self.snapshot.localized_data
+    
+    @property
+    def index(self) -> LocaleIndex:
+        return self.snapshot.index
     
-    def _initialize_default_configs(self):
+    def _file_signature(self) -> Tuple[Any, ...]:
+        signature = []
+        for path in (self.config_path, self.test_data_path):
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+    
+    def _build_snapshot(self, strict: bool = False) -> LocaleSnapshot:
+        """설정/테스트 데이터를 읽어 새 스냅샷 생성 (strict면 읽기 실패 시 예외 전파)"""
+        signature = self._file_signature()
+        country_configs = self._initialize_default_configs()
+        self._load_configurations(country_configs, strict)
+        localized_data = self._load_test_data(strict)
+        return LocaleSnapshot(country_configs, localized_data,
+                              self._build_index(country_configs, localized_data), signature)
+    
+    def reload(self) -> bool:
+        """설정/테스트 데이터 다시 로드 - 실패하면 기존 스냅샷 유지"""
+        with self._reload_lock:
+            try:
+                snapshot = self._build_snapshot(strict=True)
+            except Exception as e:
+                print(f"⚠️ 로컬라이즈 데이터 리로드 실패 - 기존 데이터 유지: {e}")
+                return False
+            # 참조 1개만 교체하므로 조회 중인 스레드는 이전/새 스냅샷 중 하나를 온전히 보게 됨
+            self._snapshot = snapshot
+            self.reload_count += 1
+        print(f"🔄 로컬라이즈 데이터 리로드 완료 ({len(snapshot.index.entries)}개 항목, "
+              f"{self.reload_count}번째) - 다음 테스트 케이스부터 적용")
+        return True
+    
+    @contextmanager
+    def test_case_scope(self):
+        """테스트 케이스 1개 동안 같은 스냅샷 사용 (리로드는 케이스 사이에만 반영)"""
+        token = self._pinned.set(self._snapshot)
+        try:
+            yield self._pinned.get()
+        finally:
+            self._pinned.reset(token)
+    
+    def start_watching(self, interval: float = None):
+        """원본 파일 변경 감시 스레드 시작 (변경 후 한 주기 동안 그대로면 백그라운드에서 리로드)"""
+        if self._watcher and self._watcher.is_alive():
+            return
+        interval = interval or float(os.getenv('LOCALIZATION_RELOAD_INTERVAL', '2.0'))
+        self._watch_stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,),
+                                         name='localization-watcher', daemon=True)
+        self._watcher.start()
+        print(f"👀 로컬라이즈 파일 감시 시작 ({interval}s 간격): {self.config_path}, {self.test_data_path}")
+    
+    def stop_watching(self):
+        self._watch_stop.set()
+    
+    def _watch(self, interval: float):
+        last_seen = self._snapshot.signature
+        failed = None
+        while not self._watch_stop.wait(interval):
+            signature = self._file_signature()
+            if signature != last_seen:
+                # 저장 중인 파일을 읽지 않도록 다음 주기까지 변경이 없을 때 리로드
+                last_seen = signature
+                continue
+            if signature in (self._snapshot.signature, failed):
+                continue
+            if not self.reload():
+                failed = signature   # 실패한 내용은 파일이 다시 바뀔 때까지 재시도하지 않음
+    
+    def _initialize_default_configs(self) -> Dict[str, CountryConfig]:
         """기본 국가 설정 초기화"""
         default_configs = {
             'VN': CountryConfig(
@@ -131,59 +293,75 @@ class LocalizationManager:
             )
         }
         
-        self.country_configs = default_configs
+        return default_configs
     
-    def _load_configurations(self):
+    def _load_configurations(self, country_configs: Dict[str, CountryConfig], strict: bool = False):
         """설정 파일에서 국가 구성 로드"""
         if os.path.exists(self.config_path):
             try:
                 with open(self.config_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     for country_code, config_data in data.items():
-                        if country_code in self.country_configs:
+                        if country_code in country_configs:
                             # 기존 설정 업데이트
                             for key, value in config_data.items():
-                                setattr(self.country_configs[country_code], key, value)
+                                setattr(country_configs[country_code], key, value)
             except Exception as e:
+                if strict:
+                    raise
                 print(f"Warning: Failed to load localization config: {e}")
     
-    def _load_test_data(self):
+    def _load_test_data(self, strict: bool = False) -> Dict[str, Dict[str, Dict[str, LocalizedData]]]:
         """테스트 데이터 CSV에서 언어별 데이터 로드"""
         if not os.path.exists(self.test_data_path):
             print(f"Warning: {self.test_data_path} not found")
-            return
+            return {}
         
         try:
-            with open(self.test_data_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row['test_id'].startswith('#'):  # 주석 행 건너뛰기
-                        continue
-                    
-                    test_id = row['test_id']
-                    data_type = row['data_type']
-                    key = row['key']
-                    locale = row.get('locale', 'all')
-                    
-                    localized_data = LocalizedData(
-                        test_id=test_id,
-                        data_type=data_type,
-                        key=key,
-                        language=locale,
-                        value=row['value'],
-                        description=row.get('description', '')
-                    )
-                    
-                    # 데이터 구조화
-                    if test_id not in self.localized_data:
-                        self.localized_data[test_id] = {}
-                    if data_type not in self.localized_data[test_id]:
-                        self.localized_data[test_id][data_type] = {}
-                    
-                    self.localized_data[test_id][data_type][f"{key}_{locale}"] = localized_data
-                    
+            return load_cached('localized_data', [self.test_data_path], self._parse_test_data)
         except Exception as e:
+            if strict:
+                raise
             print(f"Error loading test data: {e}")
+            return {}
+    
+    def _build_index(self, country_configs: Dict[str, CountryConfig],
+                     localized_data: Dict[str, Dict[str, Dict[str, LocalizedData]]]) -> LocaleIndex:
+        """localized_data로 평면 조회 인덱스 생성 (설정의 지원 언어도 미리 펼침)"""
+        languages = {language for config in country_configs.values() for language in config.supported_languages}
+        return LocaleIndex.build(localized_data, languages, self.freeze)
+    
+    def _parse_test_data(self) -> Dict[str, Dict[str, Dict[str, LocalizedData]]]:
+        """테스트 데이터 CSV 파싱 (시나리오 캐시 미스 시에만 호출)"""
+        localized_data: Dict[str, Dict[str, Dict[str, LocalizedData]]] = {}
+        with open(self.test_data_path, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                if row['test_id'].startswith('#'):  # 주석 행 건너뛰기
+                    continue
+                
+                test_id = row['test_id']
+                data_type = row['data_type']
+                key = row['key']
+                locale = row.get('locale', 'all')
+                
+                entry = LocalizedData(
+                    test_id=test_id,
+                    data_type=data_type,
+                    key=key,
+                    language=locale,
+                    value=row['value'],
+                    description=row.get('description', '')
+                )
+                
+                # 데이터 구조화
+                if test_id not in localized_data:
+                    localized_data[test_id] = {}
+                if data_type not in localized_data[test_id]:
+                    localized_data[test_id][data_type] = {}
+                
+                localized_data[test_id][data_type][f"{key}_{locale}"] = entry
+        return localized_data
     
     def get_country_config(self, country_code: str) -> Optional[CountryConfig]:
         """국가별 설정 조회"""
@@ -201,26 +379,8 @@ class LocalizationManager:
     
     def get_localized_value(self, test_id: str, data_type: str, key: str, 
                            language: str = 'ko', fallback: bool = True) -> Optional[str]:
-        """언어별 로컬라이즈 값 조회"""
-        # 1차: 특정 언어로 조회
-        specific_key = f"{key}_{language}"
-        if (test_id in self.localized_data and 
-            data_type in self.localized_data[test_id] and
-            specific_key in self.localized_data[test_id][data_type]):
-            return self.localized_data[test_id][data_type][specific_key].value
-        
-        # 2차: 'all' 언어로 조회 (공통 데이터)
-        all_key = f"{key}_all"
-        if (test_id in self.localized_data and 
-            data_type in self.localized_data[test_id] and
-            all_key in self.localized_data[test_id][data_type]):
-            return self.localized_data[test_id][data_type][all_key].value
-        
-        # 3차: 폴백 언어로 조회 (영어)
-        if fallback and language != 'en':
-            return self.get_localized_value(test_id, data_type, key, 'en', False)
-        
-        return None
+        """언어별 로컬라이즈 값 조회 (특정 언어 → 'all' 공통 데이터 → 영어 순서, 인덱스 1회 조회)"""
+        return self.index.get(test_id, data_type, key, language, fallback)
     
     def get_error_message(self, error_type: str, language: str = 'ko') -> str:
         """언어별 에러 메시지 조회"""
@@ -358,25 +518,40 @@ class LocalizationManager:
         
         return report
 
-# 글로벌 인스턴스
-localization_manager = LocalizationManager()
+# 글로벌 인스턴스 (import 시에는 파일을 읽지 않고 첫 사용 시 생성)
+localization_manager = None
+_manager_lock = threading.Lock()
 
 def get_localization_manager() -> LocalizationManager:
-    """글로벌 LocalizationManager 인스턴스 반환"""
-    return localization_manager
+    """글로벌 LocalizationManager 인스턴스 반환 (LOCALIZATION_* 환경변수 사용)"""
+    global localization_manager
+    manager = localization_manager
+    if manager is None:
+        with _manager_lock:
+            if localization_manager is None:
+                localization_manager = LocalizationManager()
+                # true면 localization_config.json / test_data.csv 변경을 감시하여 실행 중에 다시 로드
+                if os.getenv('LOCALIZATION_HOT_RELOAD', 'false').lower() == 'true':
+                    localization_manager.start_watching()
+            manager = localization_manager
+    return manager
+
+def preload_localization() -> LocalizationManager:
+    """설정/테스트 데이터를 미리 로드 (워커 스레드 시작 전 호출하면 첫 스텝에서 로딩 지연 없음)"""
+    return get_localization_manager()
 
 # 편의 함수들
 def get_localized_text(test_id: str, data_type: str, key: str, language: str = 'ko') -> str:
     """간편한 로컬라이즈 텍스트 조회"""
-    return localization_manager.get_localized_value(test_id, data_type, key, language) or key
+    return get_localization_manager().get_localized_value(test_id, data_type, key, language) or key
 
 def is_language_supported(country: str, language: str) -> bool:
     """언어 지원 여부 확인"""
-    return localization_manager.validate_language_support(country, language)
+    return get_localization_manager().validate_language_support(country, language)
 
 def get_app_package(country: str) -> str:
     """국가별 앱 패키지명 조회"""
-    config = localization_manager.get_country_config(country)
+    config = get_localization_manager().get_country_config(country)
     return config.app_package if config else ""
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+"""
+로케이터 캐시 모듈
+화면(screen_id)과 논리 선택자(selector_id)별로 마지막에 성공한 선택자를 기억하여
+다음 조회 때 가장 먼저 시도 (실패하면 나머지 후보를 원래 순서대로 시도하고 다시 학습)
+선택자별 적중/실패 통계는 파일에 저장하여 다음 실행에서도 바로 동작하는 선택자부터 사용
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# LOCATOR_CACHE, LOCATOR_CACHE_FILE은 load_dotenv 이후 값이 반영되도록 글로벌 캐시가 처음 생성될 때 읽음
+
+class LocatorCache:
+    """(screen_id, 논리 선택자) -> 마지막 성공 선택자 캐시 (스레드 안전)"""
+
+    def __init__(self, cache_file: str = None, enabled: bool = None):
+        if enabled is None:
+            enabled = os.getenv('LOCATOR_CACHE', 'true').lower() == 'true'
+        self.cache_file = cache_file or os.getenv('LOCATOR_CACHE_FILE', '.locator_cache.json')
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load_cache() if enabled else {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.not_found = 0
+        self.skipped_lookups = 0
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.isfile(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 로케이터 캐시 읽기 실패 ({self.cache_file}): {e}")
+            return {}
+
+    def save(self):
+        """변경된 경우에만 캐시 파일 저장"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = json.loads(json.dumps(self._entries))
+            self._dirty = False
+        temp_path = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.cache_file)
+        except OSError as e:
+            print(f"⚠️ 로케이터 캐시 저장 실패 ({self.cache_file}): {e}")
+
+    @staticmethod
+    def _key(screen_id: str, logical: str) -> str:
+        return f"{screen_id}|{logical}"
+
+    def order(self, screen_id: str, logical: str, candidates: List[str]) -> List[str]:
+        """마지막 성공 선택자를 맨 앞으로 옮긴 후보 목록"""
+        if not self.enabled:
+            return list(candidates)
+        with self._lock:
+            preferred = self._entries.get(self._key(screen_id, logical), {}).get('selector')
+        if preferred in candidates:
+            return [preferred] + [candidate for candidate in candidates if candidate != preferred]
+        return list(candidates)
+
+    def record(self, screen_id: str, logical: str, candidates: List[str], selector: Optional[str], attempts: int):
+        """조회 결과 기록 (selector가 None이면 모든 후보 실패)"""
+        if not self.enabled:
+            return
+        key = self._key(screen_id, logical)
+        with self._lock:
+            entry = self._entries.setdefault(key, {'selector': None, 'hits': 0, 'misses': 0, 'not_found': 0})
+            if selector is None:
+                self.not_found += 1
+                entry['not_found'] += 1
+            elif attempts == 1 and entry['selector'] == selector:
+                self.hits += 1
+                entry['hits'] += 1
+                # 캐시가 없었다면 원래 순서대로 시도했을 조회 수
+                self.skipped_lookups += candidates.index(selector)
+            else:
+                self.misses += 1
+                entry['misses'] += 1
+                entry['selector'] = selector
+            entry['last_used'] = datetime.now().isoformat()
+            self._dirty = True
+
+    def resolve(self, driver, screen_id: str, logical: str, candidates: List[str], by: str,
+                accept: Callable[[Any], bool]):
+        """
+        후보 선택자를 캐시 순서대로 조회하여 accept를 통과한 첫 요소 반환 (없으면 None)
+
+        by는 AppiumBy 값 (예: AppiumBy.CSS_SELECTOR)
+        """
+        attempts = 0
+        for selector in self.order(screen_id, logical, candidates):
+            attempts += 1
+            try:
+                elements = driver.find_elements(by, selector)
+                if elements and accept(elements[0]):
+                    self.record(screen_id, logical, candidates, selector, attempts)
+                    return elements[0]
+            except Exception:
+                continue
+        self.record(screen_id, logical, candidates, None, attempts)
+        return None
+
+    def get_report(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.not_found
+            return {
+                'entries': len(self._entries),
+                'lookups': lookups,
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_found': self.not_found,
+                'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0.0,
+                'skipped_lookups': self.skipped_lookups
+            }
+
+    def print_report(self):
+        if not self.enabled:
+            return
+        report = self.get_report()
+        if not report['lookups']:
+            return
+        print("\n🎯 로케이터 캐시 리포트:")
+        print(f"   조회 {report['lookups']}회: 적중 {report['hits']}회 ({report['hit_rate']}%), "
+              f"학습 {report['misses']}회, 찾지 못함 {report['not_found']}회")
+        print(f"   건너뛴 선택자 조회: {report['skipped_lookups']}회, 저장된 항목: {report['entries']}개")
+
+# 글로벌 인스턴스 (첫 호출 시 생성)
+locator_cache = None
+
+def get_locator_cache() -> LocatorCache:
+    """글로벌 LocatorCache 인스턴스 반환 (LOCATOR_CACHE, LOCATOR_CACHE_FILE 환경변수 사용)"""
+    global locator_cache
+    if locator_cache is None:
+        locator_cache = LocatorCache()
+    return locator_cache
@@ -0,0 +1,600 @@
+"""
+오프라인 Appium/WebDriver 목(mock) 서버
+실제 디바이스/Appium 없이 러너 오버헤드를 측정하기 위한 로컬 W3C WebDriver 서버
+세션, 컨텍스트, find_element(s), click, send_keys, execute_script, page_source,
+screenshot 명령을 흉내내고 명령별 지연 시간, 실패 주입, 기록된 세션(JSONL) 응답 재생을 지원
+
+    python mock_appium_server.py --port 4723 --latency-ms 80 --jitter-ms 20
+    python mock_appium_server.py --command-latency findElement=150 --fail clickElement=0.05
+    python mock_appium_server.py --replay recordings/session_xxx.jsonl --replay-speed 0.5
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from async_orchestrator import W3C_ELEMENT_KEY
+from webdriver_recorder import read_trace
+
+MOCK_LATENCY_MS = float(os.getenv('MOCK_APPIUM_LATENCY_MS', '0'))
+MOCK_JITTER_MS = float(os.getenv('MOCK_APPIUM_JITTER_MS', '0'))
+MOCK_FAILURE_RATE = float(os.getenv('MOCK_APPIUM_FAILURE_RATE', '0'))
+# find_elements 1회에 반환할 요소 개수
+MOCK_ELEMENTS_PER_SELECTOR = int(os.getenv('MOCK_APPIUM_ELEMENTS', '3'))
+MOCK_ELEMENT_TEXT = os.getenv('MOCK_APPIUM_ELEMENT_TEXT', 'mock text')
+
+NATIVE_CONTEXT = 'NATIVE_APP'
+
+# 1x1 PNG (스크린샷 응답)
+BLANK_PNG_BASE64 = ('iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==')
+
+# W3C 에러 코드 -> HTTP 상태
+ERROR_STATUS = {
+    'no such element': 404,
+    'no such window': 404,
+    'invalid session id': 404,
+    'unknown command': 404,
+    'stale element reference': 404,
+    'invalid argument': 400,
+    'timeout': 500,
+    'unknown error': 500,
+}
+
+# (HTTP 메서드, 경로, Selenium/Appium 명령 이름) - 명령 이름은 webdriver_recorder 기록과 동일
+ROUTES = [
+    ('GET', '/status', 'status'),
+    ('POST', '/session', 'newSession'),
+    ('DELETE', '/session/{sid}', 'quit'),
+    ('POST', '/session/{sid}/timeouts', 'setTimeouts'),
+    ('POST', '/session/{sid}/url', 'get'),
+    ('GET', '/session/{sid}/url', 'getCurrentUrl'),
+    ('GET', '/session/{sid}/title', 'getTitle'),
+    ('POST', '/session/{sid}/back', 'goBack'),
+    ('POST', '/session/{sid}/refresh', 'refresh'),
+    ('GET', '/session/{sid}/source', 'getPageSource'),
+    ('GET', '/session/{sid}/screenshot', 'screenshot'),
+    ('POST', '/session/{sid}/execute/sync', 'w3cExecuteScript'),
+    ('POST', '/session/{sid}/execute/async', 'w3cExecuteScriptAsync'),
+    ('POST', '/session/{sid}/element', 'findElement'),
+    ('POST', '/session/{sid}/elements', 'findElements'),
+    ('POST', '/session/{sid}/element/{eid}/element', 'findChildElement'),
+    ('POST', '/session/{sid}/element/{eid}/elements', 'findChildElements'),
+    ('POST', '/session/{sid}/element/{eid}/click', 'clickElement'),
+    ('POST', '/session/{sid}/element/{eid}/clear', 'clearElement'),
+    ('POST', '/session/{sid}/element/{eid}/value', 'sendKeysToElement'),
+    ('GET', '/session/{sid}/element/{eid}/text', 'getElementText'),
+    ('GET', '/session/{sid}/element/{eid}/name', 'getElementTagName'),
+    ('GET', '/session/{sid}/element/{eid}/displayed', 'isElementDisplayed'),
+    ('GET', '/session/{sid}/element/{eid}/enabled', 'isElementEnabled'),
+    ('GET', '/session/{sid}/element/{eid}/selected', 'isElementSelected'),
+    ('GET', '/session/{sid}/element/{eid}/rect', 'getElementRect'),
+    ('GET', '/session/{sid}/element/{eid}/attribute/{name}', 'getElementAttribute'),
+    ('GET', '/session/{sid}/element/{eid}/property/{name}', 'getElementProperty'),
+    ('GET', '/session/{sid}/contexts', 'getContexts'),
+    ('GET', '/session/{sid}/context', 'getCurrentContext'),
+    ('POST', '/session/{sid}/context', 'switchToContext'),
+    ('POST', '/session/{sid}/appium/device/terminate_app', 'terminateApp'),
+    ('POST', '/session/{sid}/appium/device/activate_app', 'activateApp'),
+    ('POST', '/session/{sid}/appium/device/app_state', 'queryAppState'),
+]
+
+# 지연/실패 주입 대상에서 제외하는 관리용 명령
+CONTROL_COMMANDS = ('status', 'newSession', 'quit')
+
+def _compile_route(path: str) -> 're.Pattern':
+    return re.compile('^' + re.sub(r'\{(\w+)\}', r'(?P<\1>[^/]+)', path) + '$')
+
+_ROUTES = [(method, _compile_route(path), command) for method, path, command in ROUTES]
+
+class MockCommandError(Exception):
+    """W3C 에러 응답으로 변환되는 예외"""
+
+    def __init__(self, error: str, message: str = ''):
+        super().__init__(message or error)
+        self.error = error
+        self.message = message or error
+
+@dataclass
+class MockConfig:
+    """목 서버 동작 설정 (지연 시간 단위: 초)"""
+    latency: float = MOCK_LATENCY_MS / 1000
+    jitter: float = MOCK_JITTER_MS / 1000
+    command_latency: Dict[str, float] = field(default_factory=dict)
+    failure_rate: float = MOCK_FAILURE_RATE
+    command_failures: Dict[str, float] = field(default_factory=dict)
+    elements_per_selector: int = MOCK_ELEMENTS_PER_SELECTOR
+    element_text: str = MOCK_ELEMENT_TEXT
+    # 이 문자열을 포함하는 선택자는 요소가 없는 것으로 응답
+    missing_selectors: List[str] = field(default_factory=list)
+    replay_path: Optional[str] = None
+    # 재생 시 기록된 지연 시간 배율 (1.0: 기록 속도, 0: 지연 없음, None: latency 설정 사용)
+    replay_speed: Optional[float] = 1.0
+    seed: Optional[int] = None
+
+@dataclass
+class MockElement:
+    """조회된 요소 1개 (같은 선택자/순번이면 같은 요소를 반환하여 입력값 유지)"""
+    element_id: str
+    using: str
+    selector: str
+    index: int
+    value: str = ''
+
+    @property
+    def tag_name(self) -> str:
+        match = re.match(r'[a-zA-Z][\w-]*', self.selector.lstrip('/').split('[')[0])
+        return match.group(0).lower() if match and self.using in ('css selector', 'tag name', 'xpath') else 'div'
+
+@dataclass
+class MockSession:
+    """세션 1개의 가짜 앱/WEBVIEW 상태"""
+    session_id: str
+    capabilities: Dict[str, Any]
+    webview: str
+    context: str = NATIVE_CONTEXT
+    url: str = 'about:blank'
+    app_running: bool = True
+    logged_in: bool = False
+    typed: bool = False
+    elements: Dict[str, MockElement] = field(default_factory=dict)
+    locators: Dict[Tuple[str, str, int], str] = field(default_factory=dict)
+
+class ReplayTrace:
+    """webdriver_recorder가 기록한 JSONL에서 명령별 응답을 순서대로 꺼내는 재생기"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._responses: Dict[str, Deque[Dict[str, Any]]] = {}
+        self.loaded = 0
+        for record in read_trace(path):
+            if record.get('record') != 'command' or record.get('command') in CONTROL_COMMANDS:
+                continue
+            self._responses.setdefault(record['command'], deque()).append(record)
+            self.loaded += 1
+
+    def next(self, command: str) -> Optional[Dict[str, Any]]:
+        """명령의 다음 기록 응답 (모두 소진되면 None -> 합성 응답 사용)"""
+        with self._lock:
+            responses = self._responses.get(command)
+            return responses.popleft() if responses else None
+
+class MockAppiumServer:
+    """스레드 기반 로컬 WebDriver 서버 (세션별 상태 유지, 스레드 안전)"""
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = '127.0.0.1', port: int = 0):
+        self.config = config or MockConfig()
+        self.host = host
+        self.port = port
+        self.replay = ReplayTrace(self.config.replay_path) if self.config.replay_path else None
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.sessions: Dict[str, MockSession] = {}
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self.command_counts: Dict[str, int] = {}
+        self.injected_failures = 0
+        self.replayed = 0
+        self.latency_total = 0.0
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    def start(self) -> 'MockAppiumServer':
+        """백그라운드 스레드에서 서버 시작 (port=0이면 빈 포트 자동 할당)"""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _RequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='mock-appium', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> 'MockAppiumServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---- 요청 처리 ----
+
+    def handle(self, method: str, path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """HTTP 요청 1개 처리 후 (상태 코드, 응답 JSON) 반환"""
+        path = path.split('?', 1)[0].rstrip('/') or '/'
+        for route_method, pattern, command in _ROUTES:
+            if route_method != method:
+                continue
+            match = pattern.match(path)
+            if match:
+                break
+        else:
+            return self._error('unknown command', f'{method} {path}')
+
+        params = match.groupdict()
+        with self._lock:
+            self.command_counts[command] = self.command_counts.get(command, 0) + 1
+        try:
+            recorded = self.replay.next(command) if self.replay and command not in CONTROL_COMMANDS else None
+            self._delay(command, recorded)
+            if command not in CONTROL_COMMANDS and self._should_fail(command):
+                with self._lock:
+                    self.injected_failures += 1
+                raise MockCommandError('unknown error', f'injected failure: {command}')
+            # 크기 제한으로 값 없이 기록된 응답(스크린샷 등)은 지연 시간만 재생하고 합성 응답 사용
+            if recorded is not None and not recorded.get('omitted'):
+                with self._lock:
+                    self.replayed += 1
+                if recorded.get('status') == 'error':
+                    raise MockCommandError(recorded.get('error_code') or 'unknown error', recorded.get('error') or '')
+                return 200, {'value': recorded.get('response')}
+            return 200, {'value': self._dispatch(command, params, body)}
+        except MockCommandError as e:
+            return self._error(e.error, e.message)
+
+    def _error(self, error: str, message: str) -> Tuple[int, Dict[str, Any]]:
+        return ERROR_STATUS.get(error, 500), {'value': {'error': error, 'message': message, 'stacktrace': ''}}
+
+    def _delay(self, command: str, recorded: Optional[Dict[str, Any]]):
+        if command in CONTROL_COMMANDS:
+            return
+        if recorded is not None and self.config.replay_speed is not None:
+            delay = float(recorded.get('latency') or 0) * self.config.replay_speed
+        else:
+            delay = self.config.command_latency.get(command, self.config.latency)
+            if self.config.jitter:
+                with self._lock:
+                    delay += self._random.uniform(-self.config.jitter, self.config.jitter)
+        if delay > 0:
+            with self._lock:
+                self.latency_total += delay
+            time.sleep(delay)
+
+    def _should_fail(self, command: str) -> bool:
+        rate = self.config.command_failures.get(command, self.config.failure_rate)
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+
+    def _session(self, params: Dict[str, str]) -> MockSession:
+        session = self.sessions.get(params.get('sid', ''))
+        if session is None:
+            raise MockCommandError('invalid session id', params.get('sid', ''))
+        return session
+
+    def _dispatch(self, command: str, params: Dict[str, str], body: Dict[str, Any]) -> Any:
+        if command == 'status':
+            return {'ready': True, 'message': 'mock appium server', 'build': {'version': 'mock'}}
+        if command == 'newSession':
+            return self._new_session(body)
+        session = self._session(params)
+        if command == 'quit':
+            with self._lock:
+                self.sessions.pop(session.session_id, None)
+            return None
+        if command in ('setTimeouts', 'goBack', 'refresh'):
+            return None
+        if command == 'get':
+            session.url = body.get('url', session.url)
+            return None
+        if command == 'getCurrentUrl':
+            return session.url
+        if command == 'getTitle':
+            return f"Mock {session.url.rstrip('/').rsplit('/', 1)[-1]}"
+        if command == 'getPageSource':
+            return f'<html><head><title>mock</title></head><body data-url="{session.url}"></body></html>'
+        if command == 'screenshot':
+            return BLANK_PNG_BASE64
+        if command in ('w3cExecuteScript', 'w3cExecuteScriptAsync'):
+            return self._execute_script(session, body.get('script', ''), body.get('args') or [])
+        if command in ('findElement', 'findChildElement'):
+            return self._find(session, body, single=True)
+        if command in ('findElements', 'findChildElements'):
+            return self._find(session, body, single=False)
+        if command == 'getContexts':
+            return [NATIVE_CONTEXT, session.webview] if session.app_running else [NATIVE_CONTEXT]
+        if command == 'getCurrentContext':
+            return session.context
+        if command == 'switchToContext':
+            name = body.get('name')
+            if name not in (NATIVE_CONTEXT, session.webview):
+                raise MockCommandError('no such window', f'context {name} not found')
+            session.context = name
+            return None
+        if command in ('terminateApp', 'activateApp', 'queryAppState'):
+            return self._app_command(session, command)
+
+        element = self._element(session, params.get('eid', ''))
+        if command == 'clickElement':
+            # 입력 후 클릭하면 로그인 폼 제출로 간주
+            if session.typed:
+                session.logged_in = True
+            return None
+        if command == 'clearElement':
+            element.value = ''
+            return None
+        if command == 'sendKeysToElement':
+            element.value += body.get('text') or ''.join(body.get('value') or [])
+            session.typed = True
+            return None
+        if command == 'getElementText':
+            return self.config.element_text
+        if command == 'getElementTagName':
+            return element.tag_name
+        if command in ('isElementDisplayed', 'isElementEnabled'):
+            return True
+        if command == 'isElementSelected':
+            return False
+        if command == 'getElementRect':
+            return {'x': 0, 'y': element.index * 40, 'width': 320, 'height': 40}
+        if command in ('getElementAttribute', 'getElementProperty'):
+            return self._attribute(element, params.get('name', ''))
+        raise MockCommandError('unknown command', command)
+
+    def _new_session(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        capabilities = dict((body.get('capabilities') or {}).get('alwaysMatch') or body.get('desiredCapabilities') or {})
+        app_package = capabilities.get('appium:appPackage') or capabilities.get('appPackage') or 'mock.app'
+        session = MockSession(uuid.uuid4().hex, capabilities, f'WEBVIEW_{app_package}')
+        with self._lock:
+            self.sessions[session.session_id] = session
+        return {'sessionId': session.session_id, 'capabilities': capabilities}
+
+    def _app_command(self, session: MockSession, command: str) -> Any:
+        if command == 'terminateApp':
+            session.app_running = False
+            session.context = NATIVE_CONTEXT
+            return True
+        if command == 'activateApp':
+            session.app_running = True
+            return None
+        return 4 if session.app_running else 1
+
+    def _element(self, session: MockSession, element_id: str) -> MockElement:
+        element = session.elements.get(element_id)
+        if element is None:
+            # 재생 모드에서는 기록된 요소 ID가 그대로 들어오므로 임시 요소로 응답
+            element = MockElement(element_id, 'css selector', 'div', 0)
+            session.elements[element_id] = element
+        return element
+
+    def _is_missing(self, selector: str) -> bool:
+        return any(missing in selector for missing in self.config.missing_selectors)
+
+    def _locate(self, session: MockSession, using: str, selector: str, index: int) -> MockElement:
+        key = (using, selector, index)
+        element_id = session.locators.get(key)
+        if element_id is None:
+            element_id = f'mock-{next(self._ids)}'
+            session.locators[key] = element_id
+            session.elements[element_id] = MockElement(element_id, using, selector, index)
+        return session.elements[element_id]
+
+    def _find(self, session: MockSession, body: Dict[str, Any], single: bool) -> Any:
+        using, selector = body.get('using', 'css selector'), body.get('value', '')
+        if self._is_missing(selector):
+            if single:
+                raise MockCommandError('no such element', f'{using}={selector}')
+            return []
+        count = 1 if single else self.config.elements_per_selector
+        references = [{W3C_ELEMENT_KEY: self._locate(session, using, selector, index).element_id}
+                      for index in range(count)]
+        return references[0] if single else references
+
+    def _attribute(self, element: MockElement, name: str) -> Optional[str]:
+        if name == 'value':
+            return element.value
+        if name == 'id':
+            return element.element_id
+        if name in ('class', 'className'):
+            return f'mock {element.tag_name}'
+        return None
+
+    def _execute_script(self, session: MockSession, script: str, args: List[Any]) -> Any:
+        """러너가 사용하는 스크립트를 본문으로 구분하여 그럴듯한 결과 반환"""
+        if script.startswith('mobile:'):
+            name = script[len('mobile:'):].strip()
+            return self._app_command(session, name) if name in ('terminateApp', 'activateApp', 'queryAppState') else None
+        if '__readinessProbe' in script:
+            return {'readyState': 'complete', 'pending': 0, 'quietMs': 60000, 'resourceQuietMs': 60000, 'fresh': False}
+        if 'loginForm' in script:
+            keys = args[0] if args and isinstance(args[0], list) else []
+            return {'url': session.url, 'tokens': keys[:1] if session.logged_in else [],
+                    'loginForm': not session.logged_in}
+        if 'NATIVE_INPUT_TYPES' in script:
+            return self._dom_batch(session, args[0] if args else [])
+        if 'groups: results' in script:
+            return self._extract_elements(session, args[0] if args else [], args[1] if len(args) > 1 else [])
+        if 'function domPath' in script:
+            return [self._dom_path(self._reference(session, reference)) for reference in (args[0] if args else [])]
+        if '/* isDisplayed */' in script:
+            return True
+        if '/* getAttribute */' in script:
+            element = self._reference(session, args[0] if args else None)
+            return self._attribute(element, args[1] if len(args) > 1 else '')
+        if 'document.readyState' in script:
+            return 'complete'
+        return None
+
+    def _reference(self, session: MockSession, reference: Any) -> MockElement:
+        element_id = reference.get(W3C_ELEMENT_KEY, '') if isinstance(reference, dict) else ''
+        return self._element(session, element_id)
+
+    def _dom_batch(self, session: MockSession, steps: List[Any]) -> Dict[str, Any]:
+        """DOM_BATCH_JS 응답 형식: 완료한 스텝 수와 멈춘 이유"""
+        for index, (action, selector_type, selector, text) in enumerate(steps):
+            if self._is_missing(selector):
+                return {'done': index, 'reason': 'not found'}
+            using = 'xpath' if selector_type == 'XPATH' else 'css selector'
+            if action == 'input':
+                self._locate(session, using, selector, 0).value = text
+                session.typed = True
+            elif action == 'click' and session.typed:
+                session.logged_in = True
+        return {'done': len(steps), 'reason': None}
+
+    @staticmethod
+    def _dom_path(element: MockElement) -> str:
+        return f'html>body:nth-of-type(1)>{element.tag_name}:nth-of-type({element.element_id})'
+
+    def _extract_elements(self, session: MockSession, groups: List[Any], attribute_names: List[str]) -> Dict[str, Any]:
+        """
+        EXTRACT_ELEMENTS_JS 응답 형식
+        nodes: 노드별 [tag, displayed, enabled, location, size, attributes, text, innerHTML, dom_path]
+        groups: 그룹별 [nodes 위치, index] 목록
+        """
+        nodes: List[Any] = []
+        positions: Dict[str, int] = {}
+        results = []
+        for _, selector, limit in groups:
+            if self._is_missing(selector):
+                results.append([])
+                continue
+            count = min(limit, self.config.elements_per_selector) if limit else self.config.elements_per_selector
+            entries = []
+            for index in range(count):
+                element = self._locate(session, 'css selector', selector, index)
+                if element.element_id not in positions:
+                    positions[element.element_id] = len(nodes)
+                    attributes = {name: value for name in attribute_names
+                                  for value in [self._attribute(element, name)] if value}
+                    nodes.append([
+                        element.tag_name, True, True,
+                        {'x': 0, 'y': index * 40}, {'height': 40, 'width': 320},
+                        attributes, self.config.element_text, self.config.element_text, self._dom_path(element)
+                    ])
+                entries.append([positions[element.element_id], index])
+            results.append(entries)
+        return {'nodes': nodes, 'groups': results, 'skipped': 0}
+
+    # ---- 리포트 ----
+
+    def get_report(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self.command_counts)
+        return {
+            'url': self.url,
+            'commands': sum(count for command, count in counts.items() if command != 'status'),
+            'command_counts': dict(sorted(counts.items(), key=lambda item: item[1], reverse=True)),
+            'injected_failures': self.injected_failures,
+            'replayed': self.replayed,
+            'injected_latency': round(self.latency_total, 2)
+        }
+
+    def print_report(self):
+        report = self.get_report()
+        print("\n🧪 목 Appium 서버 리포트:")
+        print(f"   명령 {report['commands']}회, 주입 지연 {report['injected_latency']}s, "
+              f"주입 실패 {report['injected_failures']}회, 재생 응답 {report['replayed']}회")
+        for command, count in list(report['command_counts'].items())[:10]:
+            print(f"     - {command}: {count}회")
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _handle(self, method: str):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+        status, payload = self.server.mock.handle(method, self.path, body if isinstance(body, dict) else {})
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def log_message(self, format, *args):
+        pass
+
+def _parse_pairs(values: List[str], scale: float = 1.0) -> Dict[str, float]:
+    """['findElement=50', ...] -> {'findElement': 50 * scale}"""
+    pairs = {}
+    for value in values or []:
+        command, _, number = value.partition('=')
+        pairs[command.strip()] = float(number) * scale
+    return pairs
+
+def add_mock_arguments(parser: argparse.ArgumentParser):
+    """목 서버 설정 인자 추가 (benchmark_runners와 공용)"""
+    parser.add_argument('--latency-ms', type=float, default=MOCK_LATENCY_MS, help='명령당 기본 지연 시간(ms)')
+    parser.add_argument('--jitter-ms', type=float, default=MOCK_JITTER_MS, help='지연 시간 편차(ms, ±)')
+    parser.add_argument('--command-latency', action='append', metavar='COMMAND=MS',
+                        help='명령별 지연 시간 (예: findElement=150)')
+    parser.add_argument('--failure-rate', type=float, default=MOCK_FAILURE_RATE, help='전체 명령 실패 확률 (0~1)')
+    parser.add_argument('--fail', action='append', metavar='COMMAND=RATE',
+                        help='명령별 실패 확률 (예: clickElement=0.05)')
+    parser.add_argument('--elements', type=int, default=MOCK_ELEMENTS_PER_SELECTOR, help='선택자당 반환할 요소 개수')
+    parser.add_argument('--missing', action='append', default=[], metavar='SELECTOR',
+                        help='요소가 없는 것으로 응답할 선택자 (부분 문자열)')
+    parser.add_argument('--replay', help='webdriver_recorder JSONL 경로 (기록된 응답 재생)')
+    parser.add_argument('--replay-speed', type=float, default=1.0,
+                        help='기록된 지연 시간 배율 (0: 지연 없음, 음수: --latency-ms 사용)')
+    parser.add_argument('--seed', type=int, help='지연/실패 주입 난수 시드')
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        command_latency=_parse_pairs(args.command_latency, 1 / 1000),
+        failure_rate=args.failure_rate,
+        command_failures=_parse_pairs(args.fail),
+        elements_per_selector=args.elements,
+        missing_selectors=args.missing,
+        replay_path=args.replay,
+        replay_speed=args.replay_speed if args.replay_speed >= 0 else None,
+        seed=args.seed
+    )
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='오프라인 벤치마크용 목 Appium 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=4723)
+    add_mock_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = MockAppiumServer(config_from_args(args), args.host, args.port).start()
+    print(f"🧪 목 Appium 서버 실행 중: {server.url} (Ctrl+C로 종료)")
+    if server.replay:
+        print(f"   재생 파일: {server.replay.path} ({server.replay.loaded}개 응답)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        server.print_report()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""
+적응형 페이지 준비 대기 모듈
+고정 time.sleep 대신 document.readyState, 진행 중인 XHR/fetch 요청 수,
+DOM 변경 중단 여부, 최근 완료된 리소스(resource timing)를 확인하여 페이지가 안정되는 즉시 반환
+
+XHR/fetch 계측은 문서마다 처음 실행된 프로브가 설치하므로 같은 문서에서는 이전 대기의 프로브가
+다음 액션 전에 이미 설치되어 있고, 페이지 이동 직후에는 arm_page_probe로 액션 전에 다시 설치
+제한: 계측 설치 전에 시작된 요청(클릭으로 이동한 새 페이지의 초기 요청 등)은 진행 중 수에 잡히지 않음
+완료되는 순간 resource timing으로 조용한 시간이 다시 시작되지만, READY_QUIET_MS보다 오래 걸리는
+요청은 완료 전에 준비 완료로 판단될 수 있음
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+@dataclass(frozen=True)
+class ReadinessSettings:
+    """대기 설정 (READINESS_WAIT, READY_QUIET_MS, READY_MIN_WAIT, READY_POLL_INTERVAL)"""
+    enabled: bool
+    quiet_ms: int
+    min_wait: float
+    poll_interval: float
+
+def readiness_settings() -> ReadinessSettings:
+    """현재 환경변수의 대기 설정 (러너의 load_dotenv 이후 값이 반영되도록 호출 시점에 읽음)"""
+    return ReadinessSettings(
+        enabled=os.getenv('READINESS_WAIT', 'true').lower() == 'true',
+        quiet_ms=int(os.getenv('READY_QUIET_MS', '500')),
+        min_wait=float(os.getenv('READY_MIN_WAIT', '0.2')),
+        poll_interval=float(os.getenv('READY_POLL_INTERVAL', '0.2'))
+    )
+
+# 페이지에 한 번만 설치되는 XHR/fetch/MutationObserver/resource timing 계측 스크립트
+# (fresh: 이번 호출에서 설치됨 = 새 문서, 설치 전 요청은 pending에 포함되지 않음)
+READINESS_PROBE_JS = """
+var w = window, fresh = false;
+if (!w.__readinessProbe) {
+    fresh = true;
+    var probe = {pending: 0, lastMutation: Date.now(), lastResource: 0};
+    w.__readinessProbe = probe;
+    var perf = w.performance, origin = perf && (perf.timeOrigin || (perf.timing && perf.timing.navigationStart));
+    var resourceDone = function(entries) {
+        for (var i = 0; i < entries.length; i++) {
+            probe.lastResource = Math.max(probe.lastResource, origin + entries[i].responseEnd);
+        }
+    };
+    // 설치 전에 시작된 요청도 완료 시점은 resource timing으로 확인
+    if (origin && perf.getEntriesByType) { resourceDone(perf.getEntriesByType('resource')); }
+    if (origin && w.PerformanceObserver) {
+        try {
+            new PerformanceObserver(function(list) { resourceDone(list.getEntries()); })
+                .observe({entryTypes: ['resource']});
+        } catch (e) {}
+    }
+    var done = function() { probe.pending = Math.max(0, probe.pending - 1); };
+    if (w.XMLHttpRequest) {
+        var originalSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function() {
+            probe.pending++;
+            this.addEventListener('loadend', done);
+            return originalSend.apply(this, arguments);
+        };
+    }
+    if (w.fetch) {
+        var originalFetch = w.fetch;
+        w.fetch = function() {
+            probe.pending++;
+            return originalFetch.apply(this, arguments).then(
+                function(response) { done(); return response; },
+                function(error) { done(); throw error; }
+            );
+        };
+    }
+    if (w.MutationObserver && document.documentElement) {
+        new MutationObserver(function() { probe.lastMutation = Date.now(); })
+            .observe(document.documentElement,
+                     {childList: true, subtree: true, attributes: true, characterData: true});
+    }
+}
+return {
+    readyState: document.readyState,
+    pending: w.__readinessProbe.pending,
+    quietMs: Date.now() - w.__readinessProbe.lastMutation,
+    resourceQuietMs: Date.now() - w.__readinessProbe.lastResource,
+    fresh: fresh
+};
+"""
+
+def is_page_settled(state: Dict[str, Any], quiet_ms: int) -> bool:
+    """프로브 결과 기준 안정화 여부 (로드 완료, 진행 중 요청 없음, DOM/리소스 모두 quiet_ms 이상 조용함)"""
+    return (state.get('readyState') == 'complete' and
+            not state.get('pending') and
+            state.get('quietMs', 0) >= quiet_ms and
+            state.get('resourceQuietMs', quiet_ms) >= quiet_ms)
+
+def arm_page_probe(driver) -> bool:
+    """
+    액션 전에 현재 문서에 계측 설치 (driver.get 등 페이지 이동 직후 호출)
+
+    이후 액션이 시작한 XHR/fetch가 진행 중 요청으로 집계됨 (스크립트 실행 불가 시 False)
+    """
+    if not readiness_settings().enabled:
+        return False
+    try:
+        driver.execute_script(READINESS_PROBE_JS)
+        return True
+    except Exception:
+        return False
+
+@dataclass
+class ReadinessResult:
+    """단일 대기 결과"""
+    waited: float
+    fixed_sleep: float
+    settled: bool
+    reason: str
+    ready_state: Optional[str] = None
+    pending_requests: Optional[int] = None
+
+    @property
+    def saved(self) -> float:
+        return max(self.fixed_sleep - self.waited, 0.0)
+
+class ReadinessStats:
+    """실행 전체의 대기 시간 절감 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.settled = 0
+        self.timeouts = 0
+        self.fallbacks = 0
+        self.total_waited = 0.0
+        self.total_fixed = 0.0
+
+    def add(self, result: ReadinessResult):
+        with self._lock:
+            self.waits += 1
+            self.total_waited += result.waited
+            self.total_fixed += result.fixed_sleep
+            if result.settled:
+                self.settled += 1
+            elif result.reason == 'timeout':
+                self.timeouts += 1
+            else:
+                self.fallbacks += 1
+
+    def get_report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'waits': self.waits,
+                'settled': self.settled,
+                'timeouts': self.timeouts,
+                'fallbacks': self.fallbacks,
+                'total_waited': round(self.total_waited, 2),
+                'total_fixed_sleep': round(self.total_fixed, 2),
+                'total_saved': round(max(self.total_fixed - self.total_waited, 0.0), 2)
+            }
+
+    def print_report(self):
+        report = self.get_report()
+        if not report['waits']:
+            return
+        print("\n⏱️ 적응형 대기 리포트:")
+        print(f"   대기 횟수: {report['waits']} (안정화 {report['settled']}, "
+              f"최대 대기 도달 {report['timeouts']}, 고정 대기 폴백 {report['fallbacks']})")
+        print(f"   실제 대기: {report['total_waited']}s / 기존 고정 대기: {report['total_fixed_sleep']}s")
+        print(f"   절감 시간: {report['total_saved']}s")
+
+# 글로벌 통계
+readiness_stats = ReadinessStats()
+
+def get_readiness_stats() -> ReadinessStats:
+    """글로벌 ReadinessStats 인스턴스 반환"""
+    return readiness_stats
+
+def wait_for_page_ready(driver, ceiling: float, quiet_ms: int = None,
+                        verbose: bool = True) -> ReadinessResult:
+    """
+    페이지 안정화 대기
+
+    Args:
+        driver: Appium/Selenium 드라이버 (WEBVIEW 컨텍스트)
+        ceiling: 최대 대기 시간 (기존 고정 sleep 값)
+        quiet_ms: DOM 변경이 없어야 하는 최소 시간 (밀리초)
+        verbose: 단계별 절감 시간 출력 여부
+
+    Returns:
+        ReadinessResult: 대기 결과 (실제 대기 시간, 절감 시간 포함)
+    """
+    settings = readiness_settings()
+    quiet_ms = settings.quiet_ms if quiet_ms is None else quiet_ms
+    start = time.time()
+
+    if not settings.enabled:
+        time.sleep(ceiling)
+        result = ReadinessResult(waited=time.time() - start, fixed_sleep=ceiling,
+                                 settled=False, reason='disabled')
+        readiness_stats.add(result)
+        return result
+
+    # 클릭 직후 내비게이션이 시작될 시간을 짧게 허용
+    time.sleep(min(settings.min_wait, ceiling))
+
+    state = None
+    reason = 'timeout'
+    settled = False
+    while True:
+        try:
+            state = driver.execute_script(READINESS_PROBE_JS) or {}
+        except Exception:
+            # NATIVE_APP 컨텍스트 등 스크립트 실행 불가 시 기존 고정 대기
+            remaining = ceiling - (time.time() - start)
+            if remaining > 0:
+                time.sleep(remaining)
+            reason = 'fallback'
+            break
+
+        if is_page_settled(state, quiet_ms):
+            settled = True
+            reason = 'settled'
+            break
+
+        if time.time() - start + settings.poll_interval >= ceiling:
+            remaining = ceiling - (time.time() - start)
+            if remaining > 0:
+                time.sleep(remaining)
+            break
+
+        time.sleep(settings.poll_interval)
+
+    result = ReadinessResult(
+        waited=time.time() - start,
+        fixed_sleep=ceiling,
+        settled=settled,
+        reason=reason,
+        ready_state=state.get('readyState') if state else None,
+        pending_requests=state.get('pending') if state else None
+    )
+    readiness_stats.add(result)
+
+    if verbose:
+        print(f"   ⏱️ 페이지 준비 대기 {result.waited:.2f}s ({result.reason}), "
+              f"고정 대기 대비 {result.saved:.2f}s 절감")
+    return result
@@ -0,0 +1,268 @@
+"""
+버퍼링 결과 기록 모듈
+테스트 결과 행을 메모리 큐에 넣고 백그라운드 스레드가 일정 시간/개수마다
+묶어서 기록하여 디바이스 스레드가 파일 I/O에 막히지 않도록 함
+(CSV, JSONL, SQLite, HTTP 백엔드 지원)
+"""
+
+import atexit
+import csv
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+# RESULT_BACKEND, RESULT_QUEUE_SIZE, RESULT_FLUSH_INTERVAL, RESULT_BATCH_SIZE는
+# 러너의 load_dotenv 이후 create_result_sink 호출 시점에 읽음
+
+class ResultBackend:
+    """결과 저장 백엔드 기본 클래스 (모든 메서드는 writer 스레드에서 호출됨)"""
+
+    def __init__(self, path: str, fieldnames: List[str]):
+        self.path = path
+        self.fieldnames = fieldnames
+
+    def open(self):
+        pass
+
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class CsvResultBackend(ResultBackend):
+    """CSV 백엔드 (파일을 한 번만 열고 헤더는 새 파일일 때만 기록)"""
+
+    def open(self):
+        is_new = not os.path.isfile(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, mode='a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        if is_new:
+            self._writer.writerow(self.fieldnames)
+            self._file.flush()
+
+    def write_rows(self, rows):
+        self._writer.writerows([[row.get(name) for name in self.fieldnames] for row in rows])
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class JsonlResultBackend(ResultBackend):
+    """JSON Lines 백엔드 (한 행당 JSON 객체 하나)"""
+
+    def open(self):
+        self._file = open(self.path, mode='a', encoding='utf-8')
+
+    def write_rows(self, rows):
+        self._file.write(''.join(
+            json.dumps({name: row.get(name) for name in self.fieldnames}, ensure_ascii=False) + '\n'
+            for row in rows
+        ))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class SqliteResultBackend(ResultBackend):
+    """SQLite 백엔드 (results 테이블에 기록)"""
+
+    TABLE_NAME = 'results'
+
+    def open(self):
+        self._conn = sqlite3.connect(self.path)
+        columns = ', '.join(f'"{name}" TEXT' for name in self.fieldnames)
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} ({columns})')
+        self._conn.commit()
+        placeholders = ', '.join('?' for _ in self.fieldnames)
+        column_names = ', '.join(f'"{name}"' for name in self.fieldnames)
+        self._insert_sql = f'INSERT INTO {self.TABLE_NAME} ({column_names}) VALUES ({placeholders})'
+
+    def write_rows(self, rows):
+        self._conn.executemany(self._insert_sql, [
+            tuple(None if row.get(name) is None else str(row.get(name)) for name in self.fieldnames)
+            for row in rows
+        ])
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+class HttpResultBackend(ResultBackend):
+    """HTTP 백엔드 (샤딩 워커가 코디네이터의 /results로 배치 전송, path는 URL)"""
+
+    RETRIES = 3
+
+    def write_rows(self, rows):
+        body = json.dumps({'rows': [{name: row.get(name) for name in self.fieldnames} for row in rows]},
+                          ensure_ascii=False).encode('utf-8')
+        for attempt in range(self.RETRIES):
+            try:
+                request = urllib.request.Request(self.path, data=body, method='POST',
+                                                 headers={'Content-Type': 'application/json'})
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                return
+            except OSError:
+                if attempt == self.RETRIES - 1:
+                    raise
+                time.sleep(2 ** attempt)
+
+RESULT_BACKENDS = {
+    'csv': (CsvResultBackend, '.csv'),
+    'jsonl': (JsonlResultBackend, '.jsonl'),
+    'sqlite': (SqliteResultBackend, '.db'),
+    'http': (HttpResultBackend, '')
+}
+
+class ResultSink:
+    """백그라운드 결과 기록기
+
+    write()는 큐에 행을 넣고 바로 반환한다. writer 스레드는
+    batch_size개가 모이거나 flush_interval이 지나면 백엔드에 기록하고,
+    close() 시 남은 행을 모두 기록한다.
+    """
+
+    _STOP = object()
+
+    def __init__(self, backend: ResultBackend, max_queue: int = None,
+                 flush_interval: float = None, batch_size: int = None):
+        self.backend = backend
+        self.flush_interval = flush_interval or float(os.getenv('RESULT_FLUSH_INTERVAL', '1.0'))
+        self.batch_size = batch_size or int(os.getenv('RESULT_BATCH_SIZE', '100'))
+        max_queue = max_queue or int(os.getenv('RESULT_QUEUE_SIZE', '10000'))
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self.rows_written = 0
+        self.batches_written = 0
+        self.write_errors = 0
+
+    @property
+    def path(self) -> str:
+        return self.backend.path
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='ResultSinkWriter', daemon=True)
+                self._thread.start()
+
+    def write(self, row: Dict[str, Any]):
+        """결과 행 기록 요청 (큐가 가득 찬 경우에만 대기)"""
+        if self._closed:
+            raise RuntimeError(f"Result sink already closed: {self.path}")
+        self._ensure_started()
+        self._queue.put(row)
+
+    def flush(self, timeout: float = None):
+        """현재까지 요청된 행이 모두 기록될 때까지 대기"""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        """남은 행 기록 후 writer 스레드 종료"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+    def _run(self):
+        try:
+            self.backend.open()
+        except Exception as e:
+            print(f"❌ 결과 파일 열기 실패 ({self.path}): {e}")
+            self._drain_without_backend()
+            return
+
+        batch: List[Dict[str, Any]] = []
+        deadline = time.time() + self.flush_interval
+        stop = False
+        while not stop:
+            events = []
+            try:
+                item = self._queue.get(timeout=max(deadline - time.time(), 0.01))
+                if item is self._STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    events.append(item)
+                else:
+                    batch.append(item)
+            except queue.Empty:
+                pass
+
+            if batch and (stop or events or len(batch) >= self.batch_size or time.time() >= deadline):
+                self._write_batch(batch)
+                batch = []
+            if time.time() >= deadline:
+                deadline = time.time() + self.flush_interval
+            for event in events:
+                event.set()
+
+        try:
+            self.backend.close()
+        except Exception as e:
+            print(f"⚠️ 결과 파일 닫기 실패 ({self.path}): {e}")
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        try:
+            self.backend.write_rows(batch)
+            self.rows_written += len(batch)
+            self.batches_written += 1
+        except Exception as e:
+            self.write_errors += 1
+            print(f"❌ 결과 기록 실패 ({self.path}, {len(batch)}행): {e}")
+
+    def _drain_without_backend(self):
+        while True:
+            item = self._queue.get()
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is self._STOP:
+                return
+
+_open_sinks: List[ResultSink] = []
+
+def create_result_sink(path: str, fieldnames: List[str], backend: str = None) -> ResultSink:
+    """
+    결과 기록기 생성
+
+    Args:
+        path: 결과 파일 경로 (백엔드에 맞게 확장자 변경)
+        fieldnames: 컬럼 목록 (CSV 헤더 순서)
+        backend: 'csv', 'jsonl', 'sqlite', 'http' (기본값: RESULT_BACKEND 환경변수)
+    """
+    backend = (backend or os.getenv('RESULT_BACKEND', 'csv')).lower()
+    if backend not in RESULT_BACKENDS:
+        print(f"Warning: Unknown result backend '{backend}', using csv")
+        backend = 'csv'
+
+    backend_class, extension = RESULT_BACKENDS[backend]
+    if backend != 'http':
+        root, _ = os.path.splitext(path)
+        path = root + extension
+    sink = ResultSink(backend_class(path, list(fieldnames)))
+    _open_sinks.append(sink)
+    return sink
+
+@atexit.register
+def close_all_sinks():
+    """프로세스 종료 시 남은 결과 기록"""
+    for sink in _open_sinks:
+        try:
+            sink.close()
+        except Exception as e:
+            print(f"⚠️ 결과 기록기 종료 실패 ({sink.path}): {e}")
@@ -0,0 +1,186 @@
+"""
+컴파일된 시나리오 캐시
+CSV/JSON 시나리오 파일을 파싱한 결과를 캐시 디렉터리에 pickle로 저장하고
+원본 파일의 mtime/크기/내용 해시가 그대로면 파싱 없이 바로 로드
+(병렬 러너가 띄운 워커 프로세스와 반복 실행 모두 캐시 공유)
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+SCENARIO_CACHE_ENABLED = os.getenv('SCENARIO_CACHE', 'true').lower() == 'true'
+SCENARIO_CACHE_DIR = os.getenv('SCENARIO_CACHE_DIR', '.scenario_cache')
+
+# 캐시 형식 변경 시 증가 (이전 캐시 자동 무효화)
+CACHE_FORMAT_VERSION = 1
+
+SourceSignature = Tuple[int, int, str]
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ScenarioCache:
+    """시나리오 파싱 결과 캐시
+
+    원본 파일의 mtime과 크기가 같으면 해시 계산 없이 히트로 처리하고,
+    mtime만 바뀐 경우(checkout, touch 등)에는 내용 해시를 비교하여
+    내용이 같으면 히트로 처리한 뒤 캐시 메타데이터를 갱신한다.
+    """
+
+    def __init__(self, cache_dir: str = SCENARIO_CACHE_DIR, enabled: bool = SCENARIO_CACHE_ENABLED):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.parse_time = 0.0
+        self.load_time = 0.0
+        self.time_saved = 0.0
+
+    def _cache_path(self, namespace: str, sources: Sequence[str]) -> str:
+        key = '|'.join([namespace] + [os.path.abspath(path) for path in sources])
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{namespace}_{name}.pkl")
+
+    def _signature(self, path: str, content_hash: str = None) -> SourceSignature:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size, content_hash or _file_hash(path))
+
+    def _read_entry(self, cache_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(cache_path, 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        if not isinstance(entry, dict) or entry.get('version') != CACHE_FORMAT_VERSION:
+            return None
+        return entry
+
+    def _is_fresh(self, entry: Dict[str, Any], sources: Sequence[str]) -> Tuple[bool, bool]:
+        """(유효 여부, 메타데이터 갱신 필요 여부)"""
+        cached = entry.get('sources', {})
+        touched = False
+        for path in sources:
+            signature = cached.get(path)
+            if signature is None:
+                return False, False
+            stat = os.stat(path)
+            if (stat.st_mtime_ns, stat.st_size) == tuple(signature[:2]):
+                continue
+            if stat.st_size != signature[1] or _file_hash(path) != signature[2]:
+                return False, False
+            touched = True
+        return True, touched
+
+    def _write_entry(self, cache_path: str, entry: Dict[str, Any]):
+        # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+
+    def load(self, namespace: str, sources: Sequence[str], builder: Callable[[], Any]) -> Any:
+        """
+        캐시된 파싱 결과 반환 (없거나 원본이 바뀌었으면 builder 실행 후 저장)
+
+        Args:
+            namespace: 결과 종류 (예: 'test_cases', 'test_data')
+            sources: 결과가 의존하는 원본 파일 목록
+            builder: 원본을 파싱하여 결과를 만드는 함수 (pickle 가능한 값 반환)
+        """
+        sources = [path for path in sources if path]
+        if not self.enabled or not all(os.path.isfile(path) for path in sources):
+            return builder()
+
+        cache_path = self._cache_path(namespace, sources)
+        start = time.time()
+        entry = self._read_entry(cache_path)
+        if entry is not None:
+            try:
+                fresh, touched = self._is_fresh(entry, sources)
+            except OSError:
+                fresh, touched = False, False
+            if fresh:
+                if touched:
+                    entry['sources'] = {path: self._signature(path) for path in sources}
+                    self._save_quietly(cache_path, entry)
+                load_time = time.time() - start
+                with self._lock:
+                    self.hits += 1
+                    self.load_time += load_time
+                    self.time_saved += max(entry.get('parse_time', 0.0) - load_time, 0.0)
+                return entry['data']
+
+        # 파싱 전에 서명을 떠서, 파싱 중 파일이 바뀌면 다음 실행에서 다시 파싱되도록 함
+        signatures = {path: self._signature(path) for path in sources}
+        parse_start = time.time()
+        data = builder()
+        parse_time = time.time() - parse_start
+        with self._lock:
+            self.misses += 1
+            self.parse_time += parse_time
+
+        self._save_quietly(cache_path, {
+            'version': CACHE_FORMAT_VERSION,
+            'namespace': namespace,
+            'sources': signatures,
+            'parse_time': parse_time,
+            'data': data
+        })
+        return data
+
+    def _save_quietly(self, cache_path: str, entry: Dict[str, Any]):
+        try:
+            self._write_entry(cache_path, entry)
+        except Exception as e:
+            print(f"⚠️ 시나리오 캐시 저장 실패 ({cache_path}): {e}")
+
+    def clear(self) -> int:
+        """캐시 파일 모두 삭제 (삭제한 파일 수 반환)"""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pkl'):
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+        return removed
+
+    def get_report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'parse_time': round(self.parse_time, 3),
+                'load_time': round(self.load_time, 3),
+                'time_saved': round(self.time_saved, 3)
+            }
+
+    def print_report(self):
+        report = self.get_report()
+        if not report['hits'] and not report['misses']:
+            return
+        print("\n🗃️ 시나리오 캐시 리포트:")
+        print(f"   히트: {report['hits']}회, 미스: {report['misses']}회")
+        print(f"   파싱 시간: {report['parse_time']}s, 캐시 로드 시간: {report['load_time']}s")
+        print(f"   절감 시간: {report['time_saved']}s")
+
+# 글로벌 인스턴스
+scenario_cache = ScenarioCache()
+
+def get_scenario_cache() -> ScenarioCache:
+    """글로벌 ScenarioCache 인스턴스 반환"""
+    return scenario_cache
+
+def load_cached(namespace: str, sources: List[str], builder: Callable[[], Any]) -> Any:
+    """글로벌 캐시를 통한 시나리오 로드"""
+    return scenario_cache.load(namespace, sources, builder)
@@ -0,0 +1,240 @@
+"""
+공용 테스트 시나리오 로더
+테스트 케이스/스텝 CSV를 한 번에 읽어 test_id별로 그룹화하고
+step_order, 셀렉터 타입, 액션 이름을 검증한 뒤 TestCase/TestStep 객체를 생성
+"""
+
+import csv
+import os
+from typing import Dict, List, Optional, Tuple
+
+from scenario_cache import load_cached
+
+# 지원 셀렉터 타입 (AppiumBy 속성명)
+VALID_SELECTOR_TYPES = {
+    'CSS_SELECTOR', 'XPATH', 'ID', 'CLASS_NAME', 'TAG_NAME', 'NAME',
+    'LINK_TEXT', 'PARTIAL_LINK_TEXT', 'ACCESSIBILITY_ID',
+    'ANDROID_UIAUTOMATOR', 'ANDROID_VIEWTAG'
+}
+
+# 기본 러너(병렬/CSV/Excel) 지원 액션
+BASIC_ACTIONS = {'click', 'input', 'verify'}
+
+# EnhancedTestEngine 지원 액션
+ENHANCED_ACTIONS = BASIC_ACTIONS | {
+    'wait_for_element', 'clear_and_input', 'verify_input_value', 'wait_for_page_load',
+    'verify_url_contains', 'verify_element_text', 'take_screenshot', 'wait_for_loading',
+    'verify_element_exists', 'verify_result_count', 'verify_search_highlight',
+    'scroll_to_bottom', 'click_each_tab', 'verify_current_month', 'apply_date_filter',
+    'select_customer', 'input_amount', 'input_collection_date', 'input_remarks',
+    'verify_form_validation', 'verify_registration_success'
+}
+
+MAX_PRINTED_ISSUES = 10
+
+class TestStep:
+    def __init__(self, action, selector_type, selector_value, input_value=None, description=None):
+        self.action = action
+        self.selector_type = selector_type
+        self.selector_value = selector_value
+        self.input_value = input_value
+        self.description = description
+
+class TestCase:
+    def __init__(self, test_id, screen_id, url, description, steps, expected_result=None):
+        self.test_id = test_id
+        self.screen_id = screen_id
+        self.url = url
+        self.description = description
+        self.steps = steps
+        self.expected_result = expected_result
+
+class EnhancedTestCase:
+    """향상된 테스트 케이스 클래스"""
+    def __init__(self, test_id, description, url, steps):
+        self.test_id = test_id
+        self.description = description
+        self.url = url
+        self.steps = steps
+
+class EnhancedTestStep:
+    """향상된 테스트 스텝 클래스"""
+    def __init__(self, step_order, action, selector_type, selector_value,
+                 input_value=None, expected_value=None, wait_time=3,
+                 description=None, validation_type='basic', retry_count=1):
+        self.step_order = int(step_order)
+        self.action = action
+        self.selector_type = selector_type
+        self.selector_value = selector_value
+        self.input_value = input_value
+        self.expected_value = expected_value
+        self.wait_time = int(wait_time)
+        self.description = description
+        self.validation_type = validation_type
+        self.retry_count = int(retry_count)
+
+def read_scenario_rows(file_path: str) -> List[Dict[str, str]]:
+    """CSV 행 읽기 (주석 행, 빈 행 제외)"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return [
+            row for row in csv.DictReader(f)
+            if row.get('test_id') and not row['test_id'].startswith('#')
+        ]
+
+def group_steps_by_test_id(step_rows: List[Dict[str, str]]) -> Dict[str, List[Dict[str, str]]]:
+    """스텝 행을 test_id별로 한 번에 그룹화 (파일 내 순서 유지)"""
+    steps_by_test: Dict[str, List[Dict[str, str]]] = {}
+    for row in step_rows:
+        steps_by_test.setdefault(row['test_id'], []).append(row)
+    return steps_by_test
+
+def validate_steps(test_id: str, step_rows: List[Dict[str, str]], valid_actions: set) -> List[str]:
+    """스텝 검증 (step_order 정수/중복, 셀렉터 타입, 액션 이름)"""
+    issues = []
+    seen_orders = set()
+    for row in step_rows:
+        order = row.get('step_order')
+        try:
+            order_value = int(order)
+        except (TypeError, ValueError):
+            issues.append(f"{test_id}: step_order '{order}' is not an integer")
+            continue
+        if order_value in seen_orders:
+            issues.append(f"{test_id}: duplicate step_order {order_value}")
+        seen_orders.add(order_value)
+
+        action = (row.get('action') or '').strip().lower()
+        if action not in valid_actions:
+            issues.append(f"{test_id} step {order_value}: unknown action '{row.get('action')}'")
+
+        selector_type = (row.get('selector_type') or '').strip().upper()
+        if selector_type and selector_type not in VALID_SELECTOR_TYPES:
+            issues.append(f"{test_id} step {order_value}: unknown selector type '{row.get('selector_type')}'")
+        elif not selector_type and action in BASIC_ACTIONS:
+            issues.append(f"{test_id} step {order_value}: missing selector type for '{action}'")
+    return issues
+
+def report_issues(source: str, issues: List[str]):
+    """검증 경고 출력"""
+    if not issues:
+        return
+    print(f"⚠️ {source}: 시나리오 검증 경고 {len(issues)}건")
+    for issue in issues[:MAX_PRINTED_ISSUES]:
+        print(f"   - {issue}")
+    if len(issues) > MAX_PRINTED_ISSUES:
+        print(f"   ... 외 {len(issues) - MAX_PRINTED_ISSUES}건")
+
+def _sorted_valid_steps(step_rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    valid = []
+    for row in step_rows:
+        try:
+            int(row['step_order'])
+            valid.append(row)
+        except (TypeError, ValueError):
+            continue
+    return sorted(valid, key=lambda row: int(row['step_order']))
+
+def _build_step(row: Dict[str, str]) -> TestStep:
+    return TestStep(
+        action=row['action'],
+        selector_type=row['selector_type'],
+        selector_value=row['selector_value'],
+        input_value=row.get('input_value') or None,
+        description=row.get('description') or None
+    )
+
+def load_test_cases(cases_file: Optional[str], steps_file: str) -> List[TestCase]:
+    """
+    기본 러너용 테스트 케이스 로딩 (원본이 바뀌지 않았으면 시나리오 캐시에서 로드)
+
+    Args:
+        cases_file: 테스트 케이스 CSV (None이면 스텝 파일의 test_id로 케이스 생성)
+        steps_file: 테스트 스텝 CSV
+    """
+    test_cases, issues = load_cached(
+        'test_cases', [cases_file, steps_file],
+        lambda: _parse_test_cases(cases_file, steps_file)
+    )
+    report_issues(os.path.basename(steps_file), issues)
+    return test_cases
+
+def _parse_test_cases(cases_file: Optional[str], steps_file: str) -> Tuple[List[TestCase], List[str]]:
+    steps_by_test = group_steps_by_test_id(read_scenario_rows(steps_file))
+
+    issues = []
+    for test_id, step_rows in steps_by_test.items():
+        issues.extend(validate_steps(test_id, step_rows, BASIC_ACTIONS))
+
+    if cases_file:
+        case_rows = read_scenario_rows(cases_file)
+    else:
+        # 케이스 메타데이터가 없는 단일 시나리오 파일
+        case_rows = [{
+            'test_id': test_id,
+            'screen_id': f"{test_id}_SCREEN",
+            'url': "",
+            'description': f"테스트 케이스 {test_id}",
+            'expected_result': None
+        } for test_id in steps_by_test]
+
+    test_cases = []
+    for case in case_rows:
+        steps = [_build_step(row) for row in _sorted_valid_steps(steps_by_test.get(case['test_id'], []))]
+        test_cases.append(TestCase(
+            test_id=case['test_id'],
+            screen_id=case['screen_id'],
+            url=case['url'],
+            description=case['description'],
+            steps=steps,
+            expected_result=case.get('expected_result') or None
+        ))
+    return test_cases, issues
+
+def load_enhanced_test_cases(cases_file: str, steps_file: str) -> List[EnhancedTestCase]:
+    """향상된 러너용 테스트 케이스 로딩 (스텝이 없는 케이스는 제외)"""
+    test_cases, issues, missing = load_cached(
+        'enhanced_test_cases', [cases_file, steps_file],
+        lambda: _parse_enhanced_test_cases(cases_file, steps_file)
+    )
+    report_issues(os.path.basename(steps_file), issues)
+    for test_id in missing:
+        print(f"Warning: No steps found for test case {test_id}")
+    return test_cases
+
+def _parse_enhanced_test_cases(cases_file: str, steps_file: str):
+    steps_by_test = group_steps_by_test_id(read_scenario_rows(steps_file))
+
+    issues = []
+    for test_id, step_rows in steps_by_test.items():
+        issues.extend(validate_steps(test_id, step_rows, ENHANCED_ACTIONS))
+
+    test_cases = []
+    missing = []
+    for case in read_scenario_rows(cases_file):
+        test_id = case['test_id']
+        if test_id not in steps_by_test:
+            missing.append(test_id)
+            continue
+
+        steps = [
+            EnhancedTestStep(
+                step_order=row['step_order'],
+                action=row['action'],
+                selector_type=row['selector_type'],
+                selector_value=row['selector_value'],
+                input_value=row.get('input_value'),
+                expected_value=row.get('expected_value'),
+                wait_time=row.get('wait_time') or 3,
+                description=row.get('description'),
+                validation_type=row.get('validation_type') or 'basic',
+                retry_count=row.get('retry_count') or 1
+            )
+            for row in _sorted_valid_steps(steps_by_test[test_id])
+        ]
+        test_cases.append(EnhancedTestCase(
+            test_id=test_id,
+            description=case['description'],
+            url=case['url'],
+            steps=steps
+        ))
+    return test_cases, issues, missing
@@ -0,0 +1,345 @@
+"""
+스크린샷 서비스
+디바이스 스레드에서는 base64 이미지만 가져오고 디코딩/저장은 백그라운드 워커에서 처리
+- 정책: step(모든 스크린샷), case(스텝별 스크린샷 제외), fail(실패만), sample(실패 + N번째마다)
+  시나리오가 직접 요청한 스크린샷(kind='explicit')은 실패와 같이 정책과 관계없이 항상 저장
+- 중복 제거: 완전히 같은 이미지는 원본에 하드링크로 연결하여 결과에 기록된 경로는 그대로 유효
+  SCREENSHOT_DEDUP_DISTANCE > 0이면 같은 (device, language, test_id) 안에서만 dHash로 비슷한 프레임을 찾고
+  비슷한 프레임은 저장하지 않고 near_duplicates.json에 기록 (다른 언어/케이스의 이미지를 이 경로에 연결하지 않음)
+- 보관 용량 제한: SCREENSHOT_MAX_MB 초과 시 오래된 성공 스크린샷부터 삭제 (실패 스크린샷은 유지)
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+
+from step_profiler import get_step_profiler
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow 없으면 동일 이미지 해시로만 중복 판단
+    Image = None
+
+# SCREENSHOT_* 설정은 러너의 load_dotenv 이후 글로벌 서비스가 처음 생성될 때 읽음
+
+POLICIES = ('step', 'case', 'fail', 'sample')
+FAILURE_KINDS = ('fail', 'error')
+EXPLICIT_KIND = 'explicit'
+# 정책/중복 제거/용량 제한과 관계없이 항상 별도 파일로 보관하는 종류
+KEPT_KINDS = FAILURE_KINDS + (EXPLICIT_KIND,)
+DUPLICATE_INDEX_FILE = 'duplicates.json'
+NEAR_DUPLICATE_INDEX_FILE = 'near_duplicates.json'
+# 비슷한 프레임 비교 범위를 정하는 프로파일러 태그
+SCOPE_TAGS = ('device', 'language', 'test_id')
+
+def image_dhash(data: bytes) -> Optional[int]:
+    """PNG 바이트의 64bit difference hash (Pillow 없거나 디코딩 실패 시 None)"""
+    if Image is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            pixels = list(image.convert('L').resize((9, 8)).getdata())
+    except Exception:
+        return None
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            value = (value << 1) | (1 if left > pixels[row * 9 + col + 1] else 0)
+    return value
+
+class ScreenshotService:
+    """스크린샷 수집/비동기 저장/중복 제거/용량 관리"""
+
+    def __init__(self, policy: str = None, sample_rate: int = None, dedup: bool = None,
+                 max_bytes: int = None, workers: int = None, dedup_distance: int = None):
+        policy = (policy or os.getenv('SCREENSHOT_POLICY', 'step')).lower()
+        sample_rate = max(1, sample_rate or int(os.getenv('SCREENSHOT_SAMPLE_RATE', '5')))
+        if dedup is None:
+            dedup = os.getenv('SCREENSHOT_DEDUP', 'true').lower() == 'true'
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv('SCREENSHOT_MAX_MB', '0')) * 1024 * 1024)   # 0: 제한 없음
+        workers = workers or int(os.getenv('SCREENSHOT_WORKERS', '2'))
+        # dHash(64bit) 해밍 거리 허용치 (0이면 완전히 같은 프레임만 중복 처리)
+        # 9x8 dHash는 같은 화면의 언어별 렌더링을 구분하지 못하므로 기본값은 0
+        if dedup_distance is None:
+            dedup_distance = int(os.getenv('SCREENSHOT_DEDUP_DISTANCE', '0'))
+        if policy not in POLICIES:
+            print(f"⚠️ 알 수 없는 SCREENSHOT_POLICY '{policy}' - step 사용")
+            policy = 'step'
+        self.policy = policy
+        self.sample_rate = sample_rate
+        self.dedup = dedup
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.dedup_distance = dedup_distance
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 저장 대기 중인 이미지 수 제한 (초과 시 디바이스 스레드가 잠시 대기)
+        self._pending = threading.BoundedSemaphore(int(os.getenv('SCREENSHOT_MAX_PENDING', '32')))
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._inflight = 0
+        self._sample_counter = 0
+
+        self._exact: Dict[str, str] = {}                              # sha1 -> 원본 경로
+        self._recent: deque = deque(maxlen=int(os.getenv('SCREENSHOT_DEDUP_WINDOW', '64')))  # (dhash, 범위, 원본 경로)
+        self._stored: 'OrderedDict[str, List[Any]]' = OrderedDict()  # 원본 경로 -> [크기, kind, 링크 목록, sha1]
+        self._aliases: Dict[str, str] = {}                            # 하드링크 실패한 중복 경로 -> 원본
+        self._near: Dict[str, Dict[str, Any]] = {}                    # 저장하지 않은 경로 -> {original, distance}
+        self._stored_bytes = 0
+
+        self.stats = {
+            'requested': 0, 'skipped': 0, 'captured': 0, 'written': 0, 'duplicates': 0, 'near_duplicates': 0,
+            'bytes_written': 0, 'bytes_saved': 0, 'evicted': 0, 'failed': 0,
+            'fetch_time': 0.0, 'write_time': 0.0
+        }
+
+    def should_capture(self, kind: str = 'pass') -> bool:
+        """현재 정책에서 이 종류의 스크린샷을 찍을지 여부 (찍지 않으면 skipped로 집계)"""
+        with self._lock:
+            self.stats['requested'] += 1
+            if kind in KEPT_KINDS or self.policy == 'step':
+                capture = True
+            elif self.policy == 'case':
+                capture = kind != 'step'
+            elif self.policy == 'sample':
+                self._sample_counter += 1
+                capture = (self._sample_counter - 1) % self.sample_rate == 0
+            else:
+                capture = False
+            if not capture:
+                self.stats['skipped'] += 1
+            return capture
+
+    def current_scope(self) -> Optional[tuple]:
+        """현재 스레드/태스크의 (device, language, test_id) - 태그가 하나라도 없으면 None (비슷한 프레임 비교 안 함)"""
+        tags = get_step_profiler().current_tags()
+        scope = tuple(tags.get(name) for name in SCOPE_TAGS)
+        return scope if all(value is not None for value in scope) else None
+
+    def capture(self, driver, path: str, kind: str = 'pass') -> Optional[str]:
+        """
+        스크린샷 요청 - 정책상 건너뛰면 None, 아니면 저장될 경로 반환
+        디바이스에서 이미지를 가져오는 부분만 호출 스레드에서 실행 (실패 시 예외 전파)
+        """
+        if not self.should_capture(kind):
+            return None
+        scope = self.current_scope()
+        start = time.time()
+        with get_step_profiler().span('screenshot', os.path.basename(path)):
+            data = driver.get_screenshot_as_base64()
+        with self._lock:
+            self.stats['fetch_time'] += time.time() - start
+        self._submit(data, path, kind, scope)
+        return path
+
+    def submit(self, data: Union[bytes, str], path: str, kind: str = 'pass', scope: Optional[tuple] = None) -> str:
+        """이미 가져온 이미지(PNG 바이트 또는 base64) 저장 예약 - asyncio 러너용 (scope: current_scope() 값)"""
+        self._submit(data, path, kind, scope)
+        return path
+
+    def _submit(self, data: Union[bytes, str], path: str, kind: str, scope: Optional[tuple]):
+        self._pending.acquire()
+        with self._lock:
+            self.stats['captured'] += 1
+            self._inflight += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='screenshot')
+            executor = self._executor
+        executor.submit(self._store, data, path, kind, scope)
+
+    def _store(self, data: Union[bytes, str], path: str, kind: str, scope: Optional[tuple]):
+        start = time.time()
+        try:
+            png = base64.b64decode(data) if isinstance(data, str) else data
+            digest = hashlib.sha1(png).hexdigest()
+            # 실패/명시적 스크린샷은 용량 제한 삭제 대상이 되지 않도록 항상 별도 파일로 저장
+            dedup = self.dedup and kind not in KEPT_KINDS
+            dhash = image_dhash(png) if dedup and self.dedup_distance > 0 and scope else None
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            original = self._find_exact(digest) if dedup else None
+            if original and self._link(original, path):
+                with self._lock:
+                    self.stats['duplicates'] += 1
+                    self.stats['bytes_saved'] += len(png)
+                return
+
+            near = self._find_near(dhash, scope) if dhash is not None else None
+            if near:
+                # 내용이 다른 이미지이므로 링크하지 않고 건너뛴 사실만 기록
+                with self._lock:
+                    self._near[path] = {'original': near[0], 'distance': near[1]}
+                    self.stats['near_duplicates'] += 1
+                    self.stats['bytes_saved'] += len(png)
+                return
+
+            with open(path, 'wb') as f:
+                f.write(png)
+            with self._lock:
+                self.stats['written'] += 1
+                self.stats['bytes_written'] += len(png)
+                self._exact[digest] = path
+                if dhash is not None:
+                    self._recent.append((dhash, scope, path))
+                self._stored[path] = [len(png), kind, [], digest]
+                self._stored_bytes += len(png)
+            self._enforce_limit()
+        except Exception as e:
+            with self._lock:
+                self.stats['failed'] += 1
+            print(f"⚠️ 스크린샷 저장 실패 ({path}): {e}")
+        finally:
+            with self._lock:
+                self.stats['write_time'] += time.time() - start
+                self._inflight -= 1
+                if self._inflight == 0:
+                    self._idle.notify_all()
+            self._pending.release()
+
+    def _find_exact(self, digest: str) -> Optional[str]:
+        with self._lock:
+            return self._exact.get(digest)
+
+    def _find_near(self, dhash: int, scope: tuple) -> Optional[tuple]:
+        """같은 범위의 최근 프레임 중 dHash 거리가 허용치 이내인 (원본 경로, 거리)"""
+        with self._lock:
+            for recent_hash, recent_scope, recent_path in reversed(self._recent):
+                if recent_scope != scope:
+                    continue
+                distance = bin(recent_hash ^ dhash).count('1')
+                if distance <= self.dedup_distance:
+                    return recent_path, distance
+        return None
+
+    def _link(self, original: str, path: str) -> bool:
+        """중복 프레임을 원본에 하드링크 (지원하지 않는 파일시스템이면 duplicates.json에 기록)"""
+        if os.path.abspath(original) == os.path.abspath(path):
+            return True
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+            os.link(original, path)
+        except OSError:
+            with self._lock:
+                if original not in self._stored:
+                    return False
+                self._aliases[path] = original
+            return True
+        with self._lock:
+            if original in self._stored:
+                self._stored[original][2].append(path)
+        return True
+
+    def _enforce_limit(self):
+        """보관 용량 초과 시 오래된 비실패 스크린샷부터 삭제 (명시적 요청 스크린샷도 유지)"""
+        if not self.max_bytes:
+            return
+        removed = []
+        with self._lock:
+            for path in list(self._stored):
+                if self._stored_bytes <= self.max_bytes:
+                    break
+                size, kind, links, digest = self._stored[path]
+                if kind in KEPT_KINDS:
+                    continue
+                del self._stored[path]
+                self._stored_bytes -= size
+                self.stats['evicted'] += 1
+                if self._exact.get(digest) == path:
+                    del self._exact[digest]
+                self._recent = deque((entry for entry in self._recent if entry[2] != path), maxlen=self._recent.maxlen)
+                self._aliases = {alias: original for alias, original in self._aliases.items() if original != path}
+                self._near = {skipped: entry for skipped, entry in self._near.items() if entry['original'] != path}
+                removed.extend([path] + links)
+        for path in removed:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """예약된 저장이 모두 끝날 때까지 대기"""
+        with self._lock:
+            return self._idle.wait_for(lambda: self._inflight == 0, timeout)
+
+    def close(self):
+        """저장 완료 대기 후 워커 종료 및 중복 인덱스 기록"""
+        self.flush()
+        with self._lock:
+            executor, self._executor = self._executor, None
+            aliases = dict(self._aliases)
+            near = dict(self._near)
+        if executor:
+            executor.shutdown(wait=True)
+        self._write_index(DUPLICATE_INDEX_FILE, aliases)
+        self._write_index(NEAR_DUPLICATE_INDEX_FILE, near)
+
+    @staticmethod
+    def _write_index(filename: str, entries: Dict[str, Any]):
+        """디렉터리별 인덱스 파일 기록 (파일명 -> 원본 정보)"""
+        by_directory: Dict[str, Dict[str, Any]] = {}
+        for path, original in entries.items():
+            by_directory.setdefault(os.path.dirname(path), {})[os.path.basename(path)] = original
+        for directory, directory_entries in by_directory.items():
+            index_path = os.path.join(directory, filename)
+            try:
+                with open(index_path, 'w', encoding='utf-8') as f:
+                    json.dump(directory_entries, f, indent=2, ensure_ascii=False)
+            except OSError as e:
+                print(f"⚠️ 중복 스크린샷 인덱스 저장 실패 ({index_path}): {e}")
+
+    def get_report(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stored_bytes = self._stored_bytes
+        return {
+            'policy': self.policy,
+            'requested': stats['requested'],
+            'skipped': stats['skipped'],
+            'captured': stats['captured'],
+            'written': stats['written'],
+            'duplicates': stats['duplicates'],
+            'near_duplicates': stats['near_duplicates'],
+            'evicted': stats['evicted'],
+            'failed': stats['failed'],
+            'stored_mb': round(stored_bytes / 1024 / 1024, 2),
+            'saved_mb': round(stats['bytes_saved'] / 1024 / 1024, 2),
+            'fetch_time': round(stats['fetch_time'], 2),
+            'write_time': round(stats['write_time'], 2),
+            'perceptual_hash': Image is not None
+        }
+
+    def print_report(self):
+        report = self.get_report()
+        if not report['requested'] and not report['captured']:
+            return
+        print("\n📸 스크린샷 리포트:")
+        print(f"   정책: {report['policy']} - 요청 {report['requested']}, 건너뜀 {report['skipped']}, "
+              f"촬영 {report['captured']}")
+        print(f"   저장 {report['written']}개 ({report['stored_mb']}MB), 중복 {report['duplicates']}개, "
+              f"비슷한 프레임 건너뜀 {report['near_duplicates']}개 ({report['saved_mb']}MB 절약)")
+        print(f"   디바이스 스레드 {report['fetch_time']}s, 백그라운드 저장 {report['write_time']}s")
+        if report['evicted'] or report['failed']:
+            print(f"   용량 제한 삭제 {report['evicted']}개, 저장 실패 {report['failed']}개")
+
+# 글로벌 인스턴스 (러너의 load_dotenv 이후 첫 호출 시 생성)
+screenshot_service = None
+_service_lock = threading.Lock()
+
+def get_screenshot_service() -> ScreenshotService:
+    """글로벌 ScreenshotService 인스턴스 반환 (SCREENSHOT_* 환경변수 사용)"""
+    global screenshot_service
+    with _service_lock:
+        if screenshot_service is None:
+            screenshot_service = ScreenshotService()
+        return screenshot_service
@@ -0,0 +1,175 @@
+"""
+Appium 세션 풀
+디바이스 udid, 앱 패키지, Appium 포트별로 webdriver.Remote 세션을 재사용하여
+사용자/언어가 바뀔 때마다 UiAutomator2 세션을 새로 만드는 비용 제거
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+SessionKey = Tuple[str, str, int]
+
+@dataclass
+class PooledSession:
+    """풀에 보관된 세션 정보"""
+    key: SessionKey
+    driver: Any
+    creation_time: float
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    reuse_count: int = 0
+    in_use: bool = False
+
+@dataclass
+class SessionPoolStats:
+    """세션 풀 통계"""
+    sessions_created: int = 0
+    sessions_reused: int = 0
+    dead_sessions: int = 0
+    session_creation_time: float = 0.0
+    probe_time: float = 0.0
+    test_time: float = 0.0
+
+class AppiumSessionPool:
+    """Appium 세션 풀
+
+    acquire()는 키에 해당하는 유휴 세션이 살아 있으면 그대로 반환하고,
+    죽은 세션이면 폐기 후 factory로 새 세션을 만든다.
+    release()는 세션을 종료하지 않고 풀에 되돌린다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks: Dict[SessionKey, threading.Lock] = {}
+        self._sessions: Dict[SessionKey, PooledSession] = {}
+        self._unpooled: Dict[int, PooledSession] = {}
+        self.stats = SessionPoolStats()
+
+    def _get_key_lock(self, key: SessionKey) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def is_alive(self, driver) -> bool:
+        """세션 생존 확인 (가벼운 Appium 호출 1회)"""
+        start = time.time()
+        try:
+            driver.current_context
+            return True
+        except Exception:
+            return False
+        finally:
+            with self._lock:
+                self.stats.probe_time += time.time() - start
+
+    def acquire(self, key: SessionKey, factory: Callable[[], Any]):
+        """세션 대여 (살아 있는 세션 재사용, 없으면 생성)"""
+        with self._get_key_lock(key):
+            pooled = self._sessions.get(key)
+
+            if pooled and not pooled.in_use:
+                if self.is_alive(pooled.driver):
+                    pooled.in_use = True
+                    pooled.reuse_count += 1
+                    pooled.last_used = time.time()
+                    with self._lock:
+                        self.stats.sessions_reused += 1
+                    print(f"♻️ 기존 Appium 세션 재사용: {key[0]} ({key[1]}, port {key[2]})")
+                    return pooled.driver
+
+                print(f"⚠️ 풀의 Appium 세션이 종료됨 - 새 세션 생성: {key[0]}")
+                self._quit_quietly(pooled.driver)
+                del self._sessions[key]
+                with self._lock:
+                    self.stats.dead_sessions += 1
+                pooled = None
+
+            start = time.time()
+            driver = factory()
+            creation_time = time.time() - start
+
+            session = PooledSession(key=key, driver=driver, creation_time=creation_time, in_use=True)
+            with self._lock:
+                self.stats.sessions_created += 1
+                self.stats.session_creation_time += creation_time
+
+            if pooled is None:
+                self._sessions[key] = session
+            else:
+                # 같은 키의 세션이 사용 중이면 풀에 넣지 않고 반환 시 종료
+                self._unpooled[id(driver)] = session
+
+            print(f"🚀 Appium 세션 생성 완료: {key[0]} ({creation_time:.1f}s)")
+            return driver
+
+    def release(self, driver, healthy: bool = True):
+        """세션 반환 (healthy=False이면 종료 후 풀에서 제거)"""
+        unpooled = self._unpooled.pop(id(driver), None)
+        if unpooled:
+            self._quit_quietly(driver)
+            return
+
+        for key, pooled in list(self._sessions.items()):
+            if pooled.driver is driver:
+                with self._get_key_lock(key):
+                    pooled.in_use = False
+                    pooled.last_used = time.time()
+                    if not healthy:
+                        self._quit_quietly(driver)
+                        del self._sessions[key]
+                return
+
+        self._quit_quietly(driver)
+
+    def record_test_time(self, seconds: float):
+        """세션 생성 시간과 분리된 테스트 실행 시간 기록"""
+        with self._lock:
+            self.stats.test_time += seconds
+
+    def close_all(self):
+        """모든 세션 종료"""
+        for key, pooled in list(self._sessions.items()):
+            self._quit_quietly(pooled.driver)
+            del self._sessions[key]
+        for driver_id, pooled in list(self._unpooled.items()):
+            self._quit_quietly(pooled.driver)
+            del self._unpooled[driver_id]
+
+    def _quit_quietly(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def get_report(self) -> Dict[str, Any]:
+        """세션 풀 리포트 생성"""
+        with self._lock:
+            stats = self.stats
+            return {
+                'sessions_created': stats.sessions_created,
+                'sessions_reused': stats.sessions_reused,
+                'dead_sessions': stats.dead_sessions,
+                'session_creation_time': round(stats.session_creation_time, 2),
+                'average_creation_time': round(stats.session_creation_time / stats.sessions_created, 2)
+                    if stats.sessions_created else 0,
+                'probe_time': round(stats.probe_time, 2),
+                'test_time': round(stats.test_time, 2)
+            }
+
+    def print_report(self):
+        """세션 풀 리포트 출력"""
+        report = self.get_report()
+        print("\n📊 Appium 세션 풀 리포트:")
+        print(f"   세션 생성: {report['sessions_created']}회 "
+              f"(총 {report['session_creation_time']}s, 평균 {report['average_creation_time']}s)")
+        print(f"   세션 재사용: {report['sessions_reused']}회, 종료된 세션 교체: {report['dead_sessions']}회")
+        print(f"   생존 확인: {report['probe_time']}s")
+        print(f"   테스트 실행: {report['test_time']}s")
+
+# 글로벌 인스턴스
+session_pool = AppiumSessionPool()
+
+def get_session_pool() -> AppiumSessionPool:
+    """글로벌 AppiumSessionPool 인스턴스 반환"""
+    return session_pool
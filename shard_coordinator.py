@@ -0,0 +1,409 @@
+"""
+멀티 호스트 디바이스 샤딩 모듈
+코디네이터가 테스트 페어/케이스를 로드하고 전역 작업 큐를 HTTP API로 제공하면
+각 호스트의 워커가 자신에게 연결된 디바이스를 등록한 뒤 작업을 가져가
+로컬 Appium 서버에서 실행하고 결과를 코디네이터로 스트리밍
+(한 대의 리눅스 머신에서는 워커를 로컬 프로세스로 띄워 테스트 가능)
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from work_scheduler import WorkItem, build_scheduler
+
+COORDINATOR_BIND = os.getenv('COORDINATOR_BIND', '127.0.0.1')
+COORDINATOR_PORT = int(os.getenv('COORDINATOR_PORT', '8765'))
+# 작업을 가져간 워커가 이 시간 동안 응답이 없으면 작업을 큐에 되돌림
+WORKER_LEASE_TIMEOUT = float(os.getenv('WORKER_LEASE_TIMEOUT', '900'))
+# 등록된 디바이스가 모두 끝났는데 작업이 남은 경우 새 워커를 기다리는 시간
+COORDINATOR_IDLE_TIMEOUT = float(os.getenv('COORDINATOR_IDLE_TIMEOUT', '120'))
+# 시작 후 이 시간 동안 등록한 워커가 없으면 남은 작업을 실패로 처리하고 종료
+COORDINATOR_REGISTER_TIMEOUT = float(os.getenv('COORDINATOR_REGISTER_TIMEOUT', '300'))
+COORDINATOR_HTTP_TIMEOUT = 30
+
+def to_wire(obj: Any) -> Any:
+    """설정/테스트 케이스 객체를 JSON 직렬화 가능한 형태로 변환"""
+    if isinstance(obj, (list, tuple)):
+        return [to_wire(value) for value in obj]
+    if isinstance(obj, dict):
+        return {key: to_wire(value) for key, value in obj.items()}
+    if hasattr(obj, '__dict__'):
+        return {key: to_wire(value) for key, value in vars(obj).items() if not key.startswith('_')}
+    return obj
+
+def from_wire(data: Any) -> Any:
+    """to_wire 결과를 속성 접근 가능한 객체로 복원 (러너는 속성만 사용)"""
+    if isinstance(data, list):
+        return [from_wire(value) for value in data]
+    if isinstance(data, dict):
+        return SimpleNamespace(**{key: from_wire(value) for key, value in data.items()})
+    return data
+
+class ShardCoordinator:
+    """전역 작업 큐를 HTTP로 제공하는 코디네이터
+
+    POST /register  {host, udids}            -> 디바이스별 페어 정보와 테스트 케이스
+    POST /next      {udid, current_key}      -> 다음 작업 (없으면 null)
+    POST /record    {udid, kind, seconds, completed}
+    POST /drop      {key}
+    POST /finish    {udid}
+    POST /results   {rows}                   -> 결과 기록기로 전달
+    GET  /status
+    """
+
+    def __init__(self, test_pairs, test_cases, write_result: Callable[[Dict[str, Any]], None],
+                 host: str = COORDINATOR_BIND, port: int = COORDINATOR_PORT):
+        self.test_cases = list(test_cases)
+        self.write_result = write_result
+        self.scheduler = build_scheduler(test_pairs, self.test_cases)
+        self._case_index = {id(test_case): i for i, test_case in enumerate(self.test_cases)}
+        self._device_pairs: Dict[str, list] = {}
+        for pair in test_pairs:
+            self._device_pairs.setdefault(pair.device_config.udid, []).append(pair)
+
+        self._lock = threading.Lock()
+        self._workers: Dict[str, Dict[str, Any]] = {}
+        self._device_workers: Dict[str, str] = {}
+        self._finished: set = set()
+        self._leases: Dict[str, Tuple[WorkItem, float]] = {}
+        self._last_activity = time.time()
+        self._started_at = time.time()
+        self.results_received = 0
+        self.requeued_items = 0
+        self.unrun_items: List[WorkItem] = []
+
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._started_at = time.time()
+        self._thread = threading.Thread(target=self.server.serve_forever, name='ShardCoordinator', daemon=True)
+        self._thread.start()
+        print(f"🛰️ 코디네이터 시작: {self.url} ({self.scheduler.total_items}개 작업, "
+              f"디바이스 {len(self._device_pairs)}대)")
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    # --- API 처리 ---
+
+    def register(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        host = payload.get('host', 'unknown')
+        accepted, rejected = [], []
+        with self._lock:
+            worker_id = f"{host}-{len(self._workers) + 1}"
+            for udid in payload.get('udids', []):
+                pairs = self._device_pairs.get(udid)
+                if not pairs or udid in self._device_workers:
+                    rejected.append(udid)
+                    continue
+                self._device_workers[udid] = worker_id
+                self._finished.discard(udid)
+                accepted.append(udid)
+            self._workers[worker_id] = {'host': host, 'udids': accepted, 'last_seen': time.time()}
+            self._last_activity = time.time()
+
+        devices = []
+        for udid in accepted:
+            pairs = self._device_pairs[udid]
+            self.scheduler.register_device(pairs[0].device_config.device_id, udid, [p.pair_id for p in pairs])
+            devices.append({'udid': udid, 'pair': to_wire(pairs[0])})
+
+        print(f"🛰️ 워커 등록: {worker_id} - 디바이스 {accepted}" +
+              (f" (거부: {rejected})" if rejected else ""))
+        return {'worker_id': worker_id, 'devices': devices, 'rejected': rejected,
+                'test_cases': to_wire(self.test_cases)}
+
+    def _touch(self, udid: str):
+        with self._lock:
+            self._last_activity = time.time()
+            worker = self._workers.get(self._device_workers.get(udid, ''))
+            if worker:
+                worker['last_seen'] = time.time()
+
+    def next_item(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        udid = payload['udid']
+        self._touch(udid)
+        with self._lock:
+            self._leases.pop(udid, None)
+        item = self.scheduler.next_item(udid, tuple(payload.get('current_key') or (None, None)))
+        if item is None:
+            return {'item': None}
+        with self._lock:
+            self._leases[udid] = (item, time.time())
+        return {'item': {
+            'case_index': self._case_index[id(item.test_case)],
+            'user': to_wire(item.user_config),
+            'language': item.language,
+            'pair_id': item.pair_id
+        }}
+
+    def record(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        udid = payload['udid']
+        self._touch(udid)
+        if payload.get('completed'):
+            with self._lock:
+                self._leases.pop(udid, None)
+        self.scheduler.record(udid, payload['kind'], float(payload['seconds']), bool(payload.get('completed')))
+        return {}
+
+    def drop(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {'dropped': self.scheduler.drop_bucket(tuple(payload['key']))}
+
+    def finish(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        udid = payload['udid']
+        self._release_device(udid)
+        self.scheduler.finish_device(udid)
+        return {}
+
+    def add_results(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        rows = payload.get('rows', [])
+        for row in rows:
+            self.write_result(row)
+        with self._lock:
+            self.results_received += len(rows)
+            self._last_activity = time.time()
+        return {'received': len(rows)}
+
+    def _release_device(self, udid: str):
+        with self._lock:
+            item = self._leases.pop(udid, None)
+            self._finished.add(udid)
+            self._device_workers.pop(udid, None)
+            self._last_activity = time.time()
+        if item:
+            # 작업 도중 종료된 경우 다른 디바이스가 가져가도록 되돌림
+            self.scheduler.requeue(item[0])
+            with self._lock:
+                self.requeued_items += 1
+
+    def expire_leases(self):
+        """응답 없는 워커의 디바이스를 종료 처리하고 작업을 큐에 되돌림"""
+        now = time.time()
+        with self._lock:
+            expired = [udid for udid, (_, leased_at) in self._leases.items()
+                       if now - leased_at > WORKER_LEASE_TIMEOUT]
+        for udid in expired:
+            print(f"⚠️ 워커 응답 없음 - 작업 반환: {udid}")
+            self._release_device(udid)
+            self.scheduler.finish_device(udid)
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'remaining': self.scheduler.remaining(),
+                'in_flight': len(self._leases),
+                'active_devices': sorted(self._device_workers),
+                'finished_devices': sorted(self._finished),
+                'workers': {worker_id: {'host': info['host'], 'udids': info['udids'],
+                                        'last_seen': round(time.time() - info['last_seen'], 1)}
+                            for worker_id, info in self._workers.items()},
+                'results_received': self.results_received,
+                'requeued_items': self.requeued_items
+            }
+
+    def _stop_reason(self, processes: Optional[List[subprocess.Popen]] = None) -> Optional[str]:
+        """대기를 끝낼 이유 (계속 기다려야 하면 None)"""
+        if processes and all(process.poll() is not None for process in processes):
+            return '로컬 워커 프로세스 모두 종료'
+        with self._lock:
+            registered = bool(self._workers)
+            active = bool(self._device_workers)
+            now = time.time()
+            idle = now - self._last_activity
+            waiting = now - self._started_at
+        if active:
+            return None
+        if not registered:
+            return '등록된 워커 없음' if waiting > COORDINATOR_REGISTER_TIMEOUT else None
+        if self.scheduler.remaining() == 0:
+            return '작업 완료'
+        return '남은 작업을 받을 워커 없음' if idle > COORDINATOR_IDLE_TIMEOUT else None
+
+    def is_complete(self, processes: Optional[List[subprocess.Popen]] = None) -> bool:
+        return self._stop_reason(processes) is not None
+
+    def wait(self, poll_interval: float = 1.0, timeout: float = None,
+             processes: Optional[List[subprocess.Popen]] = None) -> bool:
+        """
+        모든 작업이 끝나거나 남은 작업을 받을 워커가 없을 때까지 대기
+
+        processes를 주면 로컬 워커 프로세스가 모두 종료된 시점에 끝냄 (등록 전 비정상 종료 포함)
+        끝날 때 실행되지 않은 작업은 큐에서 꺼내 unrun_items에 보관 (호출 측에서 FAIL로 기록)
+        """
+        deadline = time.time() + timeout if timeout else None
+        reason = self._stop_reason(processes)
+        while reason is None:
+            if deadline and time.time() >= deadline:
+                reason = '대기 시간 초과'
+                break
+            self.expire_leases()
+            time.sleep(poll_interval)
+            reason = self._stop_reason(processes)
+
+        # 종료된 워커가 잡고 있던 디바이스와 작업 회수
+        with self._lock:
+            orphaned = list(self._device_workers) if processes and reason != '작업 완료' else []
+        for udid in orphaned:
+            self._release_device(udid)
+            self.scheduler.finish_device(udid)
+
+        self.unrun_items = self.scheduler.drain()
+        if self.unrun_items:
+            print(f"⚠️ 실행되지 않은 작업 {len(self.unrun_items)}개 ({reason})")
+        return not self.unrun_items
+
+    def _make_handler(self):
+        coordinator = self
+        routes = {
+            '/register': coordinator.register,
+            '/next': coordinator.next_item,
+            '/record': coordinator.record,
+            '/drop': coordinator.drop,
+            '/finish': coordinator.finish,
+            '/results': coordinator.add_results
+        }
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, value: Any):
+                body = json.dumps(value, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == '/status':
+                    self._send(200, coordinator.get_status())
+                else:
+                    self._send(404, {'error': f'unknown path {self.path}'})
+
+            def do_POST(self):
+                handler = routes.get(self.path)
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b'{}')
+                    if handler is None:
+                        self._send(404, {'error': f'unknown path {self.path}'})
+                    else:
+                        self._send(200, handler(payload))
+                except Exception as e:
+                    self._send(400, {'error': str(e)})
+
+        return Handler
+
+class CoordinatorClient:
+    """코디네이터 HTTP API 클라이언트"""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+
+    def post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        request = urllib.request.Request(
+            self.base_url + path, data=json.dumps(payload, ensure_ascii=False).encode('utf-8'),
+            method='POST', headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=COORDINATOR_HTTP_TIMEOUT) as response:
+            return json.loads(response.read() or b'{}')
+
+    def status(self) -> Dict[str, Any]:
+        with urllib.request.urlopen(self.base_url + '/status', timeout=COORDINATOR_HTTP_TIMEOUT) as response:
+            return json.loads(response.read())
+
+class RemoteScheduler:
+    """WorkStealingScheduler와 같은 인터페이스로 코디네이터 작업 큐 사용 (run_device_worker에 전달)"""
+
+    def __init__(self, client: CoordinatorClient, test_cases: List[Any]):
+        self.client = client
+        self.test_cases = test_cases
+
+    def next_item(self, udid: str, current_key=(None, None)) -> Optional[WorkItem]:
+        item = self.client.post('/next', {'udid': udid, 'current_key': list(current_key)}).get('item')
+        if item is None:
+            return None
+        return WorkItem(test_case=self.test_cases[item['case_index']],
+                        user_config=from_wire(item['user']), language=item['language'],
+                        pair_id=item.get('pair_id'))
+
+    def record(self, udid: str, kind: str, seconds: float, completed: bool = False):
+        try:
+            self.client.post('/record', {'udid': udid, 'kind': kind, 'seconds': seconds, 'completed': completed})
+        except OSError as e:
+            print(f"⚠️ 코디네이터 기록 실패: {e}")
+
+    def drop_bucket(self, key) -> int:
+        return self.client.post('/drop', {'key': list(key)}).get('dropped', 0)
+
+    def finish_device(self, udid: str):
+        try:
+            self.client.post('/finish', {'udid': udid})
+        except OSError as e:
+            print(f"⚠️ 코디네이터 종료 보고 실패: {e}")
+
+def run_worker(coordinator_url: str, udids: List[str], run_device: Callable,
+               prepare_servers: Callable[[List[str]], Dict[str, int]]) -> int:
+    """
+    워커 실행: 디바이스 등록 후 디바이스마다 run_device(pair, scheduler, appium_port) 실행
+
+    Args:
+        prepare_servers: udid 목록을 받아 이 호스트의 Appium 서버를 준비하고 udid -> 포트 반환
+
+    Returns:
+        int: 실행한 디바이스 수
+    """
+    client = CoordinatorClient(coordinator_url)
+    registration = client.post('/register', {'host': socket.gethostname(), 'udids': list(udids)})
+    if registration.get('rejected'):
+        print(f"⚠️ 코디네이터가 거부한 디바이스: {registration['rejected']}")
+    devices = registration.get('devices', [])
+    if not devices:
+        print("No devices accepted by coordinator")
+        return 0
+
+    scheduler = RemoteScheduler(client, from_wire(registration['test_cases']))
+    appium_ports = prepare_servers([device['udid'] for device in devices])
+    print(f"🛰️ 워커 {registration['worker_id']}: 디바이스 {[d['udid'] for d in devices]}")
+    with ThreadPoolExecutor(max_workers=len(devices)) as executor:
+        futures = [executor.submit(run_device, from_wire(device['pair']), scheduler, appium_ports[device['udid']])
+                   for device in devices]
+        for future in futures:
+            future.result()
+    return len(devices)
+
+def partition_udids(test_pairs, worker_count: int) -> List[List[str]]:
+    """테스트 페어의 디바이스를 로컬 워커 수만큼 나눔"""
+    udids = list(dict.fromkeys(pair.device_config.udid for pair in test_pairs))
+    worker_count = max(1, min(worker_count, len(udids)))
+    return [udids[i::worker_count] for i in range(worker_count)]
+
+def launch_local_workers(script: str, coordinator_url: str, udid_groups: List[List[str]]) -> List[subprocess.Popen]:
+    """워커를 로컬 프로세스로 실행 (Appium 포트는 appium_server_pool의 udid별 슬롯 사용)"""
+    processes = []
+    for group in udid_groups:
+        command = [sys.executable, script, '--mode', 'worker', '--coordinator', coordinator_url,
+                   '--udids', ','.join(group)]
+        print(f"🚀 로컬 워커 시작: {group}")
+        processes.append(subprocess.Popen(command))
+    return processes
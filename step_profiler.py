@@ -0,0 +1,232 @@
+"""
+스텝 단위 실행 시간 프로파일러
+각 테스트 스텝을 locate(요소 조회), wait(조건 대기), action(클릭/입력/이동),
+screenshot, sleep(고정 대기/페이지 준비 대기) 구간으로 나누어 기록하고
+디바이스, 언어, test_id 태그와 함께 Chrome trace JSON으로 저장
+(chrome://tracing, Perfetto, speedscope에서 플레임 차트로 확인 가능)
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# STEP_PROFILE, PROFILE_DIR, PROFILE_MAX_SPANS는 러너의 load_dotenv 이후 글로벌 프로파일러가 처음 생성될 때 읽음
+
+PHASES = ('locate', 'wait', 'action', 'screenshot', 'sleep')
+STEP_CATEGORY = 'step'
+
+# 스레드와 asyncio 태스크별로 분리되는 태그 컨텍스트
+_profile_tags: contextvars.ContextVar = contextvars.ContextVar('profile_tags', default={})
+
+@dataclass
+class Span:
+    """기록된 구간 1개"""
+    name: str
+    category: str
+    start: float        # 프로파일러 시작 기준 초
+    duration: float
+    thread: str
+    tags: Dict[str, Any]
+
+class StepProfiler:
+    """스텝/구간 시간 기록기 (스레드 안전)"""
+
+    def __init__(self, enabled: bool = None, max_spans: int = None, profile_dir: str = None):
+        if enabled is None:
+            enabled = os.getenv('STEP_PROFILE', 'true').lower() == 'true'
+        self.enabled = enabled
+        # 이 개수를 넘으면 trace 구간은 버리고 집계만 유지 (장시간 실행 시 메모리 제한)
+        self.max_spans = max_spans or int(os.getenv('PROFILE_MAX_SPANS', '500000'))
+        self.profile_dir = profile_dir or os.getenv('PROFILE_DIR', 'profiles')
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._started_at = datetime.now()
+        self.spans: List[Span] = []
+        self.dropped_spans = 0
+        self._phase_totals: Dict[str, List[float]] = {}   # category -> [합계, 횟수]
+        self._step_totals: Dict[str, List[float]] = {}
+        self._device_totals: Dict[str, Dict[str, float]] = {}
+
+    def _tags(self) -> Dict[str, Any]:
+        return _profile_tags.get()
+
+    def current_tags(self) -> Dict[str, Any]:
+        """이 스레드/태스크의 현재 태그 (device, language, test_id 등)"""
+        return dict(self._tags())
+
+    @contextmanager
+    def context(self, **tags):
+        """이 스레드/태스크에서 기록되는 구간에 태그 추가 (device, language, test_id 등)"""
+        token = _profile_tags.set({**self._tags(), **{key: value for key, value in tags.items() if value is not None}})
+        try:
+            yield
+        finally:
+            _profile_tags.reset(token)
+
+    def _add(self, name: str, category: str, start: float, duration: float):
+        tags = self._tags()
+        device = str(tags.get('device', threading.current_thread().name))
+        with self._lock:
+            totals = self._phase_totals.setdefault(category, [0.0, 0])
+            totals[0] += duration
+            totals[1] += 1
+            if category == STEP_CATEGORY:
+                step_totals = self._step_totals.setdefault(name, [0.0, 0])
+                step_totals[0] += duration
+                step_totals[1] += 1
+            else:
+                device_totals = self._device_totals.setdefault(device, {})
+                device_totals[category] = device_totals.get(category, 0.0) + duration
+            if len(self.spans) < self.max_spans:
+                self.spans.append(Span(name, category, start - self._origin, duration, device, tags))
+            else:
+                self.dropped_spans += 1
+
+    @contextmanager
+    def span(self, category: str, name: Optional[str] = None):
+        """구간 기록 (category: locate, wait, action, screenshot, sleep)"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name or category, category, start, time.perf_counter() - start)
+
+    @contextmanager
+    def step(self, name: str):
+        """스텝 전체 구간 (내부 구간들의 부모로 표시됨)"""
+        with self.span(STEP_CATEGORY, name):
+            yield
+
+    def sleep(self, seconds: float, name: str = 'sleep'):
+        """time.sleep + sleep 구간 기록"""
+        with self.span('sleep', name):
+            time.sleep(seconds)
+
+    def screenshot(self, driver, path: str) -> bool:
+        """driver.save_screenshot + screenshot 구간 기록"""
+        with self.span('screenshot', os.path.basename(path)):
+            return driver.save_screenshot(path)
+
+    def get_report(self) -> Dict[str, Any]:
+        with self._lock:
+            phase_totals = {category: list(values) for category, values in self._phase_totals.items()}
+            step_totals = sorted(self._step_totals.items(), key=lambda item: item[1][0], reverse=True)
+            device_totals = {device: dict(values) for device, values in self._device_totals.items()}
+        phase_time = sum(phase_totals.get(phase, [0.0])[0] for phase in PHASES)
+        return {
+            'phases': {
+                phase: {
+                    'total': round(phase_totals.get(phase, [0.0, 0])[0], 2),
+                    'count': phase_totals.get(phase, [0.0, 0])[1],
+                    'share': round(phase_totals.get(phase, [0.0])[0] / phase_time * 100, 1) if phase_time else 0.0
+                } for phase in PHASES
+            },
+            'step_time': round(phase_totals.get(STEP_CATEGORY, [0.0])[0], 2),
+            'steps': phase_totals.get(STEP_CATEGORY, [0.0, 0])[1],
+            'slowest_steps': [(name, round(total, 2), count) for name, (total, count) in step_totals[:10]],
+            'devices': {device: {phase: round(seconds, 2) for phase, seconds in values.items()}
+                        for device, values in device_totals.items()},
+            'dropped_spans': self.dropped_spans
+        }
+
+    def print_report(self):
+        if not self.enabled:
+            return
+        report = self.get_report()
+        if not report['steps'] and not any(values['count'] for values in report['phases'].values()):
+            return
+        print("\n⏱️ 스텝 프로파일 리포트:")
+        print(f"   스텝 {report['steps']}개, 총 {report['step_time']}s")
+        for phase, values in report['phases'].items():
+            print(f"   {phase:<10} {values['total']:>9.2f}s ({values['share']:>5.1f}%, {values['count']}회)")
+        if report['slowest_steps']:
+            print("   가장 오래 걸린 스텝:")
+            for name, total, count in report['slowest_steps'][:5]:
+                print(f"     - {name}: {total}s ({count}회)")
+
+    def export_chrome_trace(self, path: str) -> str:
+        """Chrome trace 형식(JSON)으로 저장 - 디바이스별로 한 줄(tid)씩 표시"""
+        with self._lock:
+            spans = list(self.spans)
+        thread_ids: Dict[str, int] = {}
+        events = []
+        for span in spans:
+            tid = thread_ids.setdefault(span.thread, len(thread_ids) + 1)
+            events.append({
+                'name': span.name,
+                'cat': span.category,
+                'ph': 'X',
+                'ts': round(span.start * 1_000_000, 1),
+                'dur': round(span.duration * 1_000_000, 1),
+                'pid': 1,
+                'tid': tid,
+                'args': span.tags
+            })
+        for thread, tid in thread_ids.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': thread}})
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': 1, 'tid': 0,
+                       'args': {'name': f"appium run {self._started_at:%Y-%m-%d %H:%M:%S}"}})
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms',
+                       'otherData': {'summary': self.get_report()}}, f, ensure_ascii=False, default=str)
+        return path
+
+    def save(self, name: str = 'step_profile') -> Optional[str]:
+        """profile_dir(PROFILE_DIR)에 trace 저장 후 경로 반환 (기록이 없으면 None)"""
+        if not self.enabled or not self.spans:
+            return None
+        path = os.path.join(self.profile_dir, f"{name}_{self._started_at:%Y%m%d_%H%M%S}.json")
+        try:
+            self.export_chrome_trace(path)
+        except OSError as e:
+            print(f"⚠️ 프로파일 저장 실패 ({path}): {e}")
+            return None
+        print(f"⏱️ 스텝 프로파일 저장: {path} (chrome://tracing 또는 speedscope에서 열기)")
+        return path
+
+def wait_until(driver, wait, condition):
+    """
+    WebDriverWait.until을 locate(첫 조회)와 wait(이후 폴링) 구간으로 나누어 실행
+
+    첫 조회에서 조건이 만족되면 wait 구간 없이 바로 반환
+    (implicit wait가 설정된 경우 첫 조회 시간에 포함됨)
+    """
+    profiler = get_step_profiler()
+    result = None
+    with profiler.span('locate'):
+        try:
+            result = condition(driver)
+        except Exception:
+            result = None
+    if result:
+        return result
+    with profiler.span('wait'):
+        return wait.until(condition)
+
+# 글로벌 인스턴스 (러너의 load_dotenv 이후 첫 호출 시 생성)
+step_profiler = None
+_profiler_lock = threading.Lock()
+
+def get_step_profiler() -> StepProfiler:
+    """글로벌 StepProfiler 인스턴스 반환 (STEP_PROFILE, PROFILE_DIR, PROFILE_MAX_SPANS 환경변수 사용)"""
+    global step_profiler
+    profiler = step_profiler
+    if profiler is None:
+        with _profiler_lock:
+            if step_profiler is None:
+                step_profiler = StepProfiler()
+            profiler = step_profiler
+    return profiler
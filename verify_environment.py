@@ -10,6 +10,8 @@ import subprocess
 import json
 from pathlib import Path
 
+from device_discovery import get_device_discovery
+
 class EnvironmentVerifier:
     def __init__(self):
         self.results = []
@@ -135,23 +137,18 @@ class EnvironmentVerifier:
         """연결된 디바이스 확인"""
         print("🔍 Checking connected devices...")
         
-        success, output, _ = self.run_command("adb devices")
-        if success:
-            lines = output.split('\n')[1:]  # 첫 번째 헤더 라인 제외
-            devices = [line.split()[0] for line in lines if line.strip() and 'device' in line]
-            
+        # getprop은 디바이스별로 동시에 실행되고 빌드 지문이 같으면 캐시 사용
+        discovery = get_device_discovery()
+        devices = discovery.discover()
+        if not discovery.adb_error:
             if devices:
                 self.results.append(f"✅ Connected devices: {len(devices)}")
                 for device in devices:
-                    # 디바이스 정보 가져오기
-                    model_success, model, _ = self.run_command(f"adb -s {device} shell getprop ro.product.model")
-                    android_success, android_ver, _ = self.run_command(f"adb -s {device} shell getprop ro.build.version.release")
-                    
-                    device_info = f"{device}"
-                    if model_success and model:
-                        device_info += f" ({model})"
-                    if android_success and android_ver:
-                        device_info += f" Android {android_ver}"
+                    device_info = f"{device.udid}"
+                    if device.model:
+                        device_info += f" ({device.model})"
+                    if device.platform_version:
+                        device_info += f" Android {device.platform_version}"
                     
                     self.results.append(f"  📱 {device_info}")
             else:
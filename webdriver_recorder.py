@@ -0,0 +1,358 @@
+"""
+WebDriver 명령 기록/재생 모듈
+webdriver.Remote의 command_executor.execute를 감싸서 세션마다 모든 명령
+(명령 이름, 인자, 응답, 소요 시간)을 JSONL(.jsonl 또는 .jsonl.gz) 파일로 기록
+기록 파일로 명령별 소요 시간 요약, 두 실행 비교, 목 서버(mock_appium_server) 대상 재생 가능
+
+    python webdriver_recorder.py summary recordings/RFCM902ZM9K_20250101_120000_ab12cd34.jsonl
+    python webdriver_recorder.py compare before.jsonl after.jsonl
+    python webdriver_recorder.py replay recordings/RFCM902ZM9K_20250101_120000_ab12cd34.jsonl --speed 0.1
+"""
+
+import argparse
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# 기록 설정(WEBDRIVER_RECORD, WEBDRIVER_RECORD_DIR, WEBDRIVER_RECORD_MAX_VALUE, WEBDRIVER_RECORD_GZIP)은
+# 러너의 load_dotenv 이후 record_driver 호출 시점에 읽음
+DEFAULT_RECORD_MAX_VALUE = 65536
+
+def open_trace(path: str, mode: str = 'r'):
+    """기록 파일 열기 (.gz면 gzip)"""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+def read_trace(path: str) -> Iterator[Dict[str, Any]]:
+    """기록 레코드 순회 (중간에 끊긴 마지막 줄은 무시)"""
+    with open_trace(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+def _response_fields(response: Any, error: Optional[BaseException],
+                     max_value: int = DEFAULT_RECORD_MAX_VALUE) -> Dict[str, Any]:
+    """응답을 기록 필드로 변환 (W3C 에러 응답은 error_code/error로 분리, max_value 바이트 초과 값은 크기만 기록)"""
+    if error is not None:
+        return {'status': 'error', 'error_code': 'unknown error', 'error': f"{type(error).__name__}: {error}"}
+    value = response.get('value') if isinstance(response, dict) else response
+    if isinstance(value, dict) and isinstance(value.get('error'), str):
+        return {'status': 'error', 'error_code': value['error'], 'error': value.get('message', '')}
+    encoded = json.dumps(value, ensure_ascii=False, default=str)
+    if len(encoded) > max_value:
+        return {'status': 'ok', 'response': None, 'omitted': True, 'size': len(encoded)}
+    return {'status': 'ok', 'response': value}
+
+class WebDriverRecorder:
+    """세션 1개의 WebDriver 명령 기록기 (스레드 안전, 레코드마다 flush)"""
+
+    def __init__(self, path: str, session_info: Dict[str, Any], max_value: int = DEFAULT_RECORD_MAX_VALUE):
+        self.path = path
+        self.max_value = max_value
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open_trace(path, 'w')
+        self._origin = time.perf_counter()
+        self.closed = False
+        self.commands = 0
+        self.total_latency = 0.0
+        self._write({'record': 'session', 'data': session_info})
+
+    def _write(self, record: Dict[str, Any]):
+        with self._lock:
+            if self.closed:
+                return
+            self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            self._file.flush()
+
+    def record(self, command: str, params: Dict[str, Any], started: float, latency: float,
+               response: Any = None, error: Optional[BaseException] = None):
+        with self._lock:
+            self.commands += 1
+            self.total_latency += latency
+            seq = self.commands
+        self._write({
+            'record': 'command',
+            'seq': seq,
+            't': round(started - self._origin, 6),
+            'command': command,
+            'params': params,
+            'latency': round(latency, 6),
+            **_response_fields(response, error, self.max_value)
+        })
+
+    def attach(self, driver):
+        """driver.command_executor.execute를 감싸서 이후 모든 명령 기록"""
+        executor = driver.command_executor
+        original_execute = executor.execute
+
+        def execute(command, params):
+            # RemoteConnection.execute가 params에서 sessionId를 지우므로 호출 전에 복사
+            recorded_params = {key: value for key, value in (params or {}).items() if key != 'sessionId'}
+            started = time.perf_counter()
+            try:
+                response = original_execute(command, params)
+            except Exception as e:
+                self.record(command, recorded_params, started, time.perf_counter() - started, error=e)
+                raise
+            self.record(command, recorded_params, started, time.perf_counter() - started, response)
+            if command == 'quit':
+                self.close()
+            return response
+
+        executor.execute = execute
+        return driver
+
+    def close(self):
+        if self.closed:
+            return
+        self._write({'record': 'session_end', 'data': {
+            'end_time': datetime.now().isoformat(),
+            'commands': self.commands,
+            'total_latency': round(self.total_latency, 3)
+        }})
+        with self._lock:
+            self.closed = True
+            self._file.close()
+        print(f"🎥 WebDriver 기록 저장: {self.path} ({self.commands}개 명령, {self.total_latency:.1f}s)")
+
+_recorders: List[WebDriverRecorder] = []
+_recorders_lock = threading.Lock()
+
+def record_driver(driver, label: str):
+    """WEBDRIVER_RECORD=true면 드라이버 세션을 기록 파일에 연결 (아니면 그대로 반환)"""
+    if os.getenv('WEBDRIVER_RECORD', 'false').lower() != 'true':
+        return driver
+    session_id = getattr(driver, 'session_id', None) or 'session'
+    filename = f"{label}_{datetime.now():%Y%m%d_%H%M%S}_{session_id[:8]}.jsonl"
+    # true면 .jsonl.gz로 압축 기록
+    if os.getenv('WEBDRIVER_RECORD_GZIP', 'false').lower() == 'true':
+        filename += '.gz'
+    recorder = WebDriverRecorder(os.path.join(os.getenv('WEBDRIVER_RECORD_DIR', 'recordings'), filename), {
+        'label': label,
+        'session_id': session_id,
+        'capabilities': getattr(driver, 'capabilities', {}),
+        'start_time': datetime.now().isoformat()
+    }, max_value=int(os.getenv('WEBDRIVER_RECORD_MAX_VALUE', str(DEFAULT_RECORD_MAX_VALUE))))
+    with _recorders_lock:
+        _recorders.append(recorder)
+    return recorder.attach(driver)
+
+def close_recorders():
+    """열려 있는 기록 파일 모두 닫기 (quit 없이 종료된 세션 포함)"""
+    with _recorders_lock:
+        recorders = list(_recorders)
+        _recorders.clear()
+    for recorder in recorders:
+        recorder.close()
+
+atexit.register(close_recorders)
+
+# ---- 분석 ----
+
+def _percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent))] if ordered else 0.0
+
+def summarize_trace(path: str) -> Dict[str, Any]:
+    """명령별 횟수/소요 시간 집계 (총 소요 시간 순)"""
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    wall = 0.0
+    for record in read_trace(path):
+        if record.get('record') != 'command':
+            continue
+        command = record['command']
+        latencies.setdefault(command, []).append(record.get('latency', 0.0))
+        if record.get('status') == 'error':
+            errors[command] = errors.get(command, 0) + 1
+        wall = max(wall, record.get('t', 0.0) + record.get('latency', 0.0))
+
+    total_latency = sum(sum(values) for values in latencies.values())
+    commands = [{
+        'command': command,
+        'count': len(values),
+        'total': round(sum(values), 3),
+        'mean_ms': round(sum(values) / len(values) * 1000, 1),
+        'p95_ms': round(_percentile(values, 0.95) * 1000, 1),
+        'max_ms': round(max(values) * 1000, 1),
+        'share': round(sum(values) / total_latency * 100, 1) if total_latency else 0.0,
+        'errors': errors.get(command, 0)
+    } for command, values in latencies.items()]
+    commands.sort(key=lambda item: item['total'], reverse=True)
+    return {
+        'path': path,
+        'commands': sum(item['count'] for item in commands),
+        'wall': round(wall, 3),
+        'webdriver_time': round(total_latency, 3),
+        # 명령 사이 시간 (러너 코드, 고정 sleep 등)
+        'client_time': round(max(wall - total_latency, 0.0), 3),
+        'by_command': commands
+    }
+
+def print_summary(summary: Dict[str, Any], top: int = 15):
+    print(f"\n🎥 WebDriver 기록 요약: {summary['path']}")
+    print(f"   명령 {summary['commands']}회, 전체 {summary['wall']}s "
+          f"(WebDriver {summary['webdriver_time']}s, 명령 사이 {summary['client_time']}s)")
+    print(f"   {'command':<28}{'count':>7}{'total(s)':>10}{'mean(ms)':>10}{'p95(ms)':>10}{'share':>8}")
+    for item in summary['by_command'][:top]:
+        errors = f"  ⚠️ 에러 {item['errors']}회" if item['errors'] else ''
+        print(f"   {item['command']:<28}{item['count']:>7}{item['total']:>10.2f}{item['mean_ms']:>10.1f}"
+              f"{item['p95_ms']:>10.1f}{item['share']:>7.1f}%{errors}")
+
+def compare_traces(before_path: str, after_path: str) -> Dict[str, Any]:
+    """두 기록의 명령별 횟수/소요 시간 비교 (after - before)"""
+    before, after = summarize_trace(before_path), summarize_trace(after_path)
+    before_map = {item['command']: item for item in before['by_command']}
+    after_map = {item['command']: item for item in after['by_command']}
+    rows = []
+    for command in set(before_map) | set(after_map):
+        old, new = before_map.get(command, {}), after_map.get(command, {})
+        rows.append({
+            'command': command,
+            'count_before': old.get('count', 0),
+            'count_after': new.get('count', 0),
+            'total_before': old.get('total', 0.0),
+            'total_after': new.get('total', 0.0),
+            'delta': round(new.get('total', 0.0) - old.get('total', 0.0), 3)
+        })
+    rows.sort(key=lambda row: abs(row['delta']), reverse=True)
+    return {'before': before, 'after': after, 'by_command': rows}
+
+def print_comparison(comparison: Dict[str, Any], top: int = 15):
+    before, after = comparison['before'], comparison['after']
+    print(f"\n🎥 WebDriver 기록 비교: {before['path']} -> {after['path']}")
+    print(f"   전체 {before['wall']}s -> {after['wall']}s, 명령 {before['commands']}회 -> {after['commands']}회")
+    for row in comparison['by_command'][:top]:
+        print(f"   {row['command']:<28}{row['count_before']:>6} -> {row['count_after']:<6}"
+              f"{row['total_before']:>9.2f}s -> {row['total_after']:>8.2f}s ({row['delta']:+.2f}s)")
+
+# ---- 재생 ----
+
+def _send(base_url: str, method: str, path: str, body: Optional[Dict[str, Any]]) -> Tuple[bool, Any]:
+    data = json.dumps(body or {}).encode('utf-8') if method == 'POST' else None
+    request = urllib.request.Request(base_url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return True, json.loads(response.read() or b'{}').get('value')
+    except urllib.error.HTTPError as e:
+        return False, json.loads(e.read() or b'{}').get('value')
+
+def replay_trace(path: str, url: Optional[str] = None, speed: float = 1.0) -> Dict[str, Any]:
+    """
+    기록된 명령을 같은 간격으로 스텁 서버에 다시 보내기
+
+    speed는 기록된 간격/지연 시간 배율 (1.0: 기록 속도, 0.1: 10배 빠르게, 0: 대기 없이)
+    url이 없으면 같은 기록을 응답으로 재생하는 목 서버를 띄워서 사용
+    """
+    from mock_appium_server import CONTROL_COMMANDS, ROUTES, MockAppiumServer, MockConfig
+
+    routes = {command: (method, route) for method, route, command in ROUTES}
+    server = None
+    if url is None:
+        server = MockAppiumServer(MockConfig(replay_path=path, replay_speed=speed)).start()
+        url = server.url
+
+    records = list(read_trace(path))
+    session_info = next((record.get('data', {}) for record in records if record.get('record') == 'session'), {})
+    commands = [record for record in records
+                if record.get('record') == 'command' and record.get('command') not in ('newSession', 'status')]
+    per_command: Dict[str, List[float]] = {}
+    skipped = mismatches = 0
+    try:
+        ok, value = _send(url, 'POST', '/session',
+                          {'capabilities': {'alwaysMatch': session_info.get('capabilities') or {}}})
+        if not ok:
+            raise RuntimeError(f"세션 생성 실패: {value}")
+        session_id = value['sessionId']
+
+        first = commands[0].get('t', 0.0) if commands else 0.0
+        start = time.perf_counter()
+        for record in commands:
+            command, params = record['command'], record.get('params') or {}
+            if command not in routes:
+                skipped += 1
+                continue
+            if speed > 0:
+                delay = (record.get('t', 0.0) - first) * speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            method, route = routes[command]
+            route = (route.replace('{sid}', session_id)
+                     .replace('{eid}', str(params.get('id', '')))
+                     .replace('{name}', str(params.get('name', ''))))
+            sent = time.perf_counter()
+            ok, _ = _send(url, method, route, params)
+            totals = per_command.setdefault(command, [0.0, 0.0])
+            totals[0] += record.get('latency', 0.0)
+            totals[1] += time.perf_counter() - sent
+            if ok != (record.get('status') != 'error'):
+                mismatches += 1
+        replayed_wall = time.perf_counter() - start
+        if commands and commands[-1].get('command') not in CONTROL_COMMANDS:
+            _send(url, 'DELETE', f'/session/{session_id}', None)
+    finally:
+        if server:
+            server.stop()
+
+    recorded_wall = (commands[-1].get('t', 0.0) + commands[-1].get('latency', 0.0) - first) if commands else 0.0
+    return {
+        'path': path,
+        'commands': len(commands) - skipped,
+        'skipped': skipped,
+        'mismatches': mismatches,
+        'recorded_wall': round(recorded_wall, 3),
+        'replayed_wall': round(replayed_wall if commands else 0.0, 3),
+        'by_command': {command: {'recorded': round(recorded, 3), 'replayed': round(replayed, 3)}
+                       for command, (recorded, replayed) in per_command.items()}
+    }
+
+def print_replay(result: Dict[str, Any]):
+    print(f"\n🎥 WebDriver 기록 재생: {result['path']}")
+    print(f"   명령 {result['commands']}회 (지원하지 않는 명령 {result['skipped']}회 건너뜀), "
+          f"기록 {result['recorded_wall']}s -> 재생 {result['replayed_wall']}s")
+    if result['mismatches']:
+        print(f"   ⚠️ 기록과 성공/실패가 다른 응답 {result['mismatches']}회")
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='WebDriver 명령 기록 분석/재생')
+    subparsers = parser.add_subparsers(dest='action', required=True)
+    summary_parser = subparsers.add_parser('summary', help='명령별 소요 시간 요약')
+    summary_parser.add_argument('trace')
+    summary_parser.add_argument('--top', type=int, default=15)
+    compare_parser = subparsers.add_parser('compare', help='두 기록 비교')
+    compare_parser.add_argument('before')
+    compare_parser.add_argument('after')
+    compare_parser.add_argument('--top', type=int, default=15)
+    replay_parser = subparsers.add_parser('replay', help='스텁 서버로 재생')
+    replay_parser.add_argument('trace')
+    replay_parser.add_argument('--url', help='스텁 서버 주소 (없으면 목 서버 자동 실행)')
+    replay_parser.add_argument('--speed', type=float, default=1.0,
+                               help='기록된 간격/지연 시간 배율 (1.0: 기록 속도, 0: 대기 없이)')
+    args = parser.parse_args(argv)
+
+    if args.action == 'summary':
+        print_summary(summarize_trace(args.trace), args.top)
+    elif args.action == 'compare':
+        print_comparison(compare_traces(args.before, args.after), args.top)
+    else:
+        print_replay(replay_trace(args.trace, args.url, args.speed))
+
+if __name__ == '__main__':
+    main()
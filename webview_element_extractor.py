@@ -0,0 +1,507 @@
+"""
+WEBVIEW 요소 정보 추출 모듈
+페이지 요소 스캔 시 요소마다 WebDriver 호출을 20번 가까이 반복하는 대신
+execute_script 한 번으로 모든 선택자의 요소 정보를 수집
+(appium_webview.py, appium_webview_element_logger.py 공용)
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+logger = logging.getLogger(__name__)
+
+# script: execute_script 1회 수집, webdriver: 요소별 WebDriver 호출(기존 방식),
+# compare: 두 방식을 모두 실행하여 스캔 시간 비교 (결과는 script 방식 사용)
+ELEMENT_SCAN_MODE = os.getenv('ELEMENT_SCAN_MODE', 'script').lower()
+
+# 요소 타입별 CSS 선택자
+ELEMENT_SELECTORS = {
+    'inputs': [
+        "input[type='text']",
+        "input[type='email']",
+        "input[type='password']",
+        "input[type='number']",
+        "input[type='tel']",
+        "input[type='search']",
+        "input[type='url']",
+        "input:not([type])",
+        "input"
+    ],
+    'buttons': [
+        "button",
+        "input[type='button']",
+        "input[type='submit']",
+        "[role='button']",
+        ".btn",
+        ".button"
+    ],
+    'links': [
+        "a[href]",
+        "[role='link']"
+    ],
+    'forms': [
+        "form"
+    ],
+    'selects': [
+        "select",
+        "[role='combobox']",
+        "[role='listbox']"
+    ],
+    'textareas': [
+        "textarea"
+    ],
+    'images': [
+        "img",
+        "[role='img']"
+    ]
+}
+
+# 기타 요소 태그 (태그별 최대 OTHER_ELEMENTS_LIMIT개)
+OTHER_SELECTORS = ['div', 'span', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'label']
+OTHER_ELEMENTS_LIMIT = 5
+
+ATTRIBUTES_TO_CHECK = [
+    'id', 'class', 'name', 'type', 'value', 'placeholder',
+    'href', 'src', 'alt', 'title', 'role', 'data-*'
+]
+
+MAX_INNER_HTML_LENGTH = 200
+
+# 문서 루트부터의 태그:nth-of-type 경로 (요소 지문 구성 요소)
+DOM_PATH_FUNCTION_JS = """
+function domPath(el) {
+    var parts = [];
+    while (el && el.nodeType === 1 && el !== document.documentElement) {
+        var index = 1, sibling = el;
+        while ((sibling = sibling.previousElementSibling)) {
+            if (sibling.tagName === el.tagName) { index++; }
+        }
+        parts.unshift(el.tagName.toLowerCase() + ':nth-of-type(' + index + ')');
+        el = el.parentElement;
+    }
+    return 'html' + (parts.length ? '>' + parts.join('>') : '');
+}
+"""
+
+# 여러 요소의 DOM 경로를 한 번에 조회 (webdriver 방식 지문 계산용, 스캔당 1회)
+DOM_PATHS_JS = DOM_PATH_FUNCTION_JS + """
+return Array.prototype.map.call(arguments[0], function(el) {
+    try { return domPath(el); } catch (e) { return null; }
+});
+"""
+
+# 선택자 그룹을 받아 요소별 원시 정보를 한 번에 반환
+# nodes: 노드별 [tag_name, is_displayed, is_enabled, location, size, attributes, text, innerHTML, dom_path]
+#        (여러 선택자/분류에 해당하는 노드도 한 번만 기록)
+# groups: 그룹별 [nodes 위치, 선택자 결과 내 index] 목록 (같은 분류에서 이미 나온 노드는 건너뜀)
+EXTRACT_ELEMENTS_JS = DOM_PATH_FUNCTION_JS + """
+var groups = arguments[0], attributeNames = arguments[1];
+var propertyAttributes = {value: true, href: true, src: true};
+var seen = {}, positions = new Map(), described = [], skipped = 0, reused = 0;
+
+function isDisplayed(el) {
+    if (!el.isConnected) { return false; }
+    if (el.tagName.toLowerCase() === 'input' && (el.type || '').toLowerCase() === 'hidden') { return false; }
+    var style = window.getComputedStyle(el);
+    if (style.display === 'none' || style.visibility === 'hidden' ||
+        style.visibility === 'collapse' || style.opacity === '0') { return false; }
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+
+function describe(el) {
+    var rect = el.getBoundingClientRect();
+    var displayed = isDisplayed(el);
+    var attributes = {};
+    for (var i = 0; i < attributeNames.length; i++) {
+        var name = attributeNames[i], value = null;
+        if (propertyAttributes[name] && el[name] !== undefined && el[name] !== null) {
+            value = String(el[name]);
+        } else {
+            value = el.getAttribute(name);
+        }
+        if (value) { attributes[name] = value; }
+    }
+    return [
+        el.tagName.toLowerCase(),
+        displayed,
+        !el.disabled,
+        {x: Math.round(rect.left + window.pageXOffset), y: Math.round(rect.top + window.pageYOffset)},
+        {height: Math.floor(rect.height), width: Math.floor(rect.width)},
+        attributes,
+        displayed ? (el.innerText || '') : '',
+        el.innerHTML,
+        domPath(el)
+    ];
+}
+
+var results = [];
+for (var g = 0; g < groups.length; g++) {
+    var group = groups[g], nodes;
+    var categorySeen = seen[group[0]] || (seen[group[0]] = new Set());
+    try {
+        nodes = Array.prototype.slice.call(document.querySelectorAll(group[1]));
+    } catch (e) {
+        results.push(null);
+        continue;
+    }
+    if (group[2] > 0) { nodes = nodes.slice(0, group[2]); }
+    var entries = [];
+    for (var n = 0; n < nodes.length; n++) {
+        if (categorySeen.has(nodes[n])) { skipped++; continue; }
+        categorySeen.add(nodes[n]);
+        var position = positions.get(nodes[n]);
+        if (position === undefined) {
+            position = described.length;
+            positions.set(nodes[n], position);
+            described.push(describe(nodes[n]));
+        } else {
+            reused++;
+        }
+        entries.push([position, n]);
+    }
+    results.push(entries);
+}
+return {nodes: described, groups: results, skipped: skipped + reused};
+"""
+
+def _empty_element_info(element_type: str, selector: str, index: int) -> Dict[str, Any]:
+    return {
+        'index': index,
+        'selector_used': selector,
+        'element_type': element_type,
+        'tag_name': None,
+        'id': None,
+        'class': None,
+        'name': None,
+        'type': None,
+        'value': None,
+        'text': None,
+        'placeholder': None,
+        'href': None,
+        'src': None,
+        'alt': None,
+        'title': None,
+        'role': None,
+        'is_displayed': False,
+        'is_enabled': False,
+        'location': None,
+        'size': None,
+        'attributes': {},
+        'dom_path': None,
+        'fingerprint': None
+    }
+
+def element_fingerprint(tag_name, element_id, name, dom_path, location, size) -> str:
+    """태그, id, name, DOM 경로, 위치/크기로 요소 지문 생성"""
+    location = location or {}
+    size = size or {}
+    source = '|'.join(str(part) for part in (
+        tag_name, element_id or '', name or '', dom_path or '',
+        location.get('x'), location.get('y'), size.get('width'), size.get('height')
+    ))
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+def _set_fingerprint(element_info: Dict[str, Any], dom_path: Optional[str]):
+    element_info['dom_path'] = dom_path
+    element_info['fingerprint'] = element_fingerprint(
+        element_info['tag_name'], element_info['id'], element_info['name'],
+        dom_path, element_info['location'], element_info['size']
+    )
+
+def extract_element_info(element, element_type, selector, index):
+    """개별 요소의 상세 정보 추출 (요소별 WebDriver 호출)"""
+    try:
+        element_info = _empty_element_info(element_type, selector, index)
+
+        # 기본 정보
+        element_info['tag_name'] = element.tag_name
+        element_info['is_displayed'] = element.is_displayed()
+        element_info['is_enabled'] = element.is_enabled()
+
+        # 위치 및 크기 정보
+        try:
+            element_info['location'] = element.location
+            element_info['size'] = element.size
+        except:
+            pass
+
+        # 주요 속성들 추출
+        for attr in ATTRIBUTES_TO_CHECK:
+            try:
+                attr_value = element.get_attribute(attr)
+                if attr_value:
+                    element_info[attr] = attr_value
+                    element_info['attributes'][attr] = attr_value
+            except:
+                pass
+
+        # 텍스트 내용
+        try:
+            text = element.text
+            if text and text.strip():
+                element_info['text'] = text.strip()
+        except:
+            pass
+
+        # innerHTML 내용 (일부만)
+        try:
+            inner_html = element.get_attribute('innerHTML')
+            if inner_html and len(inner_html) < MAX_INNER_HTML_LENGTH:
+                element_info['innerHTML'] = inner_html
+        except:
+            pass
+
+        return element_info
+
+    except Exception as e:
+        logger.debug(f"요소 정보 추출 실패 (인덱스 {index}): {e}")
+        return None
+
+def _element_info_from_script(raw: List[Any], element_type: str, selector: str, index: int) -> Dict[str, Any]:
+    """스크립트 결과 노드 1건을 extract_element_info와 같은 형태로 변환"""
+    tag_name, displayed, enabled, location, size, attributes, text, inner_html, dom_path = raw
+    element_info = _empty_element_info(element_type, selector, index)
+    element_info['tag_name'] = tag_name
+    element_info['is_displayed'] = bool(displayed)
+    element_info['is_enabled'] = bool(enabled)
+    element_info['location'] = location
+    element_info['size'] = size
+    for attr in ATTRIBUTES_TO_CHECK:
+        attr_value = (attributes or {}).get(attr)
+        if attr_value:
+            element_info[attr] = attr_value
+            element_info['attributes'][attr] = attr_value
+    if text and text.strip():
+        element_info['text'] = text.strip()
+    if inner_html and len(inner_html) < MAX_INNER_HTML_LENGTH:
+        element_info['innerHTML'] = inner_html
+    _set_fingerprint(element_info, dom_path)
+    return element_info
+
+class ElementInventory:
+    """
+    요소 지문(태그, id, name, DOM 경로, 위치/크기) 기준 요소 목록
+
+    노드 정보는 모든 선택자/분류를 통틀어 한 번만 추출하고, 여러 분류의 선택자에
+    해당하는 요소(예: input[type=submit])는 기존 출력 형식대로 분류마다 기록하되
+    처음 추출한 정보를 분류 필드(element_type, selector_used, index)만 바꿔 재사용
+    """
+
+    def __init__(self):
+        self.elements: Dict[str, List[Dict[str, Any]]] = {element_type: [] for element_type in ELEMENT_SELECTORS}
+        self.elements['other_elements'] = []
+        self.fingerprints: Dict[str, Dict[str, Any]] = {}   # 지문 -> 처음 추출한 요소 정보
+        self.categories: Dict[str, List[str]] = {}          # 지문 -> 기록된 분류 목록
+        self.duplicates = 0                                 # 추출을 생략한 중복 매칭 수 (스캔 방식별로 집계)
+
+    def add(self, category: str, element_info: Optional[Dict[str, Any]], element_type: str,
+            selector: str, index: int):
+        """요소 추가 (같은 분류에 이미 있으면 건너뜀, 다른 분류에 있으면 추출한 정보 재사용)"""
+        if not element_info:
+            return
+        fingerprint = element_info['fingerprint']
+        categories = self.categories.setdefault(fingerprint, [])
+        if category in categories:
+            return
+        first = self.fingerprints.setdefault(fingerprint, element_info)
+        if categories:
+            first = dict(first, element_type=element_type, selector_used=selector, index=index)
+        categories.append(category)
+        self.elements[category].append(first)
+
+def _is_interesting_other(element_info) -> bool:
+    # 텍스트가 있거나 특별한 속성이 있는 요소만 수집
+    return bool(element_info and (element_info.get('text') or element_info.get('id') or element_info.get('class')))
+
+def _dom_paths(driver, elements: List[Any]) -> List[Optional[str]]:
+    """요소 목록의 DOM 경로를 execute_script 1회로 조회 (실패 시 경로 없이 지문 계산)"""
+    if not elements:
+        return []
+    try:
+        paths = driver.execute_script(DOM_PATHS_JS, elements)
+        if isinstance(paths, list) and len(paths) == len(elements):
+            return paths
+    except Exception as e:
+        logger.debug(f"   ⚠️ DOM 경로 조회 실패: {e}")
+    return [None] * len(elements)
+
+def scan_elements_webdriver(driver) -> ElementInventory:
+    """
+    요소별 WebDriver 호출로 스캔 (기존 방식)
+
+    노드마다 상세 정보는 한 번만 추출 (같은 세션에서 같은 노드는 같은 WebElement 참조 id로 반환됨)
+    지문용 DOM 경로는 스캔이 끝난 뒤 고유 노드 전체를 execute_script 1회로 조회
+    """
+    extracted: Dict[str, Optional[Dict[str, Any]]] = {}   # WebElement 참조 id -> 추출한 정보
+    unique_elements: List[Any] = []
+    matches: List[Tuple[str, str, str, str, int]] = []   # (분류, element_type, 선택자, 참조 id, index)
+
+    def collect(category: str, element_type: str, selector: str, found: List[Any]):
+        for i, element in enumerate(found):
+            if element.id not in extracted:
+                extracted[element.id] = extract_element_info(element, element_type, selector, i)
+                unique_elements.append(element)
+            matches.append((category, element_type, selector, element.id, i))
+
+    for element_type, selectors in ELEMENT_SELECTORS.items():
+        logger.info(f"🔍 {element_type.upper()} 요소 스캔 중...")
+        for selector in selectors:
+            try:
+                found = driver.find_elements(AppiumBy.CSS_SELECTOR, selector)
+                logger.info(f"   📍 '{selector}' 선택자로 {len(found)}개 요소 발견")
+                collect(element_type, element_type, selector, found)
+            except Exception as e:
+                logger.debug(f"   ⚠️ 선택자 '{selector}' 스캔 실패: {e}")
+
+    logger.info("🔍 기타 요소 스캔 중...")
+    for selector in OTHER_SELECTORS:
+        try:
+            found = driver.find_elements(AppiumBy.TAG_NAME, selector)
+            collect('other_elements', 'other', selector, found[:OTHER_ELEMENTS_LIMIT])
+        except:
+            continue
+
+    for element, dom_path in zip(unique_elements, _dom_paths(driver, unique_elements)):
+        if extracted[element.id]:
+            _set_fingerprint(extracted[element.id], dom_path)
+
+    inventory = ElementInventory()
+    inventory.duplicates = len(matches) - len(unique_elements)
+    for category, element_type, selector, element_id, index in matches:
+        element_info = extracted[element_id]
+        if category == 'other_elements' and not _is_interesting_other(element_info):
+            continue
+        inventory.add(category, element_info, element_type, selector, index)
+
+    for element_type in ELEMENT_SELECTORS:
+        logger.info(f"✅ {element_type.upper()} 요소 스캔 완료: {len(inventory.elements[element_type])}개")
+    return inventory
+
+def scan_elements_script(driver) -> ElementInventory:
+    """execute_script 1회로 모든 선택자 스캔"""
+    groups: List[Tuple[str, str, int]] = [
+        (element_type, selector, 0)
+        for element_type, selectors in ELEMENT_SELECTORS.items()
+        for selector in selectors
+    ]
+    groups += [('other', selector, OTHER_ELEMENTS_LIMIT) for selector in OTHER_SELECTORS]
+
+    response = driver.execute_script(EXTRACT_ELEMENTS_JS, [list(group) for group in groups],
+                                     ATTRIBUTES_TO_CHECK)
+    results = response.get('groups') if isinstance(response, dict) else None
+    nodes = response.get('nodes') if isinstance(response, dict) else None
+    if not isinstance(results, list) or len(results) != len(groups) or not isinstance(nodes, list):
+        raise ValueError("unexpected element extractor result")
+
+    inventory = ElementInventory()
+    # 같은 분류에서 건너뛴 노드 + 다른 분류에서 정보를 재사용한 노드
+    inventory.duplicates = int(response.get('skipped') or 0)
+    converted: Dict[int, Dict[str, Any]] = {}
+    for (element_type, selector, _), entries in zip(groups, results):
+        if entries is None:
+            logger.debug(f"   ⚠️ 선택자 '{selector}' 스캔 실패: invalid selector")
+            continue
+        category = 'other_elements' if element_type == 'other' else element_type
+        for position, index in entries:
+            element_info = converted.get(position)
+            if element_info is None:
+                element_info = converted[position] = _element_info_from_script(nodes[position], element_type,
+                                                                               selector, index)
+            if category == 'other_elements' and not _is_interesting_other(element_info):
+                continue
+            inventory.add(category, element_info, element_type, selector, index)
+
+    for element_type in ELEMENT_SELECTORS:
+        logger.info(f"✅ {element_type.upper()} 요소 스캔 완료: {len(inventory.elements[element_type])}개")
+    return inventory
+
+class ElementScanStats:
+    """스캔 방식별 소요 시간 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.scans: Dict[str, int] = {}
+        self.total_time: Dict[str, float] = {}
+        self.duplicates_skipped = 0
+        self.fallbacks = 0
+
+    def add_fallback(self):
+        with self._lock:
+            self.fallbacks += 1
+
+    def add(self, mode: str, seconds: float, duplicates: int = 0):
+        with self._lock:
+            self.scans[mode] = self.scans.get(mode, 0) + 1
+            self.total_time[mode] = self.total_time.get(mode, 0.0) + seconds
+            self.duplicates_skipped += duplicates
+
+    def get_report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                mode: {
+                    'scans': count,
+                    'total_time': round(self.total_time[mode], 2),
+                    'average_time': round(self.total_time[mode] / count, 2)
+                }
+                for mode, count in self.scans.items()
+            }
+
+    def print_report(self):
+        report = self.get_report()
+        if not report:
+            return
+        logger.info("⏱️ 요소 스캔 시간 리포트:")
+        for mode, stats in report.items():
+            logger.info(f"   {mode}: {stats['scans']}회, 총 {stats['total_time']}s, 평균 {stats['average_time']}s")
+        if 'webdriver' in report and 'script' in report and report['script']['average_time'] > 0:
+            speedup = report['webdriver']['average_time'] / report['script']['average_time']
+            logger.info(f"   script 방식 속도 향상: {speedup:.1f}배")
+        logger.info(f"   중복 요소 추출 생략: {self.duplicates_skipped}건")
+        if self.fallbacks:
+            logger.info(f"   script 실패로 webdriver 방식 사용: {self.fallbacks}회")
+
+# 글로벌 통계
+element_scan_stats = ElementScanStats()
+
+def get_element_scan_stats() -> ElementScanStats:
+    """글로벌 ElementScanStats 인스턴스 반환"""
+    return element_scan_stats
+
+def _timed_scan(mode: str, scan, driver) -> Dict[str, List[Dict[str, Any]]]:
+    start = time.time()
+    inventory = scan(driver)
+    elapsed = time.time() - start
+    element_scan_stats.add(mode, elapsed, inventory.duplicates)
+    logger.info(f"⏱️ 요소 스캔 시간 ({mode}): {elapsed:.2f}s, "
+                f"고유 요소 {len(inventory.fingerprints)}개, 중복 생략 {inventory.duplicates}건")
+    return inventory.elements
+
+def collect_page_elements(driver, mode: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    현재 페이지 요소 수집 (page_data['elements'] 형태로 반환)
+
+    Args:
+        driver: WEBVIEW 컨텍스트의 드라이버
+        mode: 'script', 'webdriver', 'compare' (기본값: ELEMENT_SCAN_MODE 환경변수)
+    """
+    mode = (mode or ELEMENT_SCAN_MODE).lower()
+
+    if mode == 'webdriver':
+        return _timed_scan('webdriver', scan_elements_webdriver, driver)
+
+    if mode == 'compare':
+        _timed_scan('webdriver', scan_elements_webdriver, driver)
+
+    try:
+        return _timed_scan('script', scan_elements_script, driver)
+    except Exception as e:
+        logger.warning(f"⚠️ 스크립트 요소 스캔 실패, 요소별 스캔으로 전환: {e}")
+        element_scan_stats.add_fallback()
+        return _timed_scan('webdriver', scan_elements_webdriver, driver)
@@ -0,0 +1,240 @@
+"""
+작업 훔치기(work-stealing) 테스트 스케줄러
+(테스트 케이스, 사용자, 언어) 작업 단위를 전역 큐에 두고 유휴 디바이스가 가져가도록 분배
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Tuple
+
+AffinityKey = Tuple[Optional[str], Optional[str]]
+BucketKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+@dataclass
+class WorkItem:
+    """단일 작업 단위 (페어 × 테스트 케이스 × 사용자 × 언어)"""
+    test_case: Any
+    user_config: Any
+    language: str
+    pair_id: Optional[str] = None
+
+    @property
+    def affinity_key(self) -> AffinityKey:
+        """디바이스의 로그인 상태 (사용자, 언어)"""
+        return (self.user_config.user_id, self.language)
+
+    @property
+    def bucket_key(self) -> BucketKey:
+        """작업 버킷 (페어, 사용자, 언어)"""
+        return (self.pair_id, self.user_config.user_id, self.language)
+
+@dataclass
+class DeviceUtilization:
+    """디바이스별 사용률 통계"""
+    device_id: str
+    udid: str
+    busy_time: float = 0.0      # 테스트 케이스 실행 시간
+    setup_time: float = 0.0     # 드라이버 생성, 언어 변경, 로그인 시간
+    idle_time: float = 0.0      # 작업 대기 시간
+    items_completed: int = 0
+    items_stolen: int = 0       # 다른 페어에서 가져온 작업 수
+    affinity_hits: int = 0      # 사용자/언어 전환 없이 실행한 작업 수
+    affinity_misses: int = 0
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def wall_time(self) -> float:
+        end = self.finished_at or time.time()
+        return max(end - self.started_at, 0.0)
+
+    @property
+    def utilization(self) -> float:
+        wall = self.wall_time
+        return (self.busy_time / wall) * 100 if wall > 0 else 0.0
+
+class WorkStealingScheduler:
+    """전역 작업 큐 스케줄러
+
+    작업은 (페어, 사용자, 언어) 버킷으로 묶여 관리된다. 디바이스는 현재 로그인된
+    사용자/언어 버킷에서 먼저 작업을 가져가고(affinity, 자신의 페어 우선), 버킷이 비면
+    같은 사용자의 다른 언어, 자신의 페어 작업, 가장 많이 남은 버킷 순으로 가져간다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[BucketKey, Deque[WorkItem]] = {}
+        self._eligible: Dict[BucketKey, FrozenSet[str]] = {}
+        self._key_pairs: Dict[BucketKey, set] = {}
+        self._device_pairs: Dict[str, set] = {}
+        self._utilization: Dict[str, DeviceUtilization] = {}
+        self._started_at = time.time()
+        self.total_items = 0
+
+    def add_items(self, items: List[WorkItem], eligible_devices: FrozenSet[str], pair_ids: List[str]):
+        """같은 페어/사용자/언어 작업 목록 추가"""
+        with self._lock:
+            for item in items:
+                key = item.bucket_key
+                self._buckets.setdefault(key, deque()).append(item)
+                self._eligible[key] = self._eligible.get(key, frozenset()) | eligible_devices
+                self._key_pairs.setdefault(key, set()).update(pair_ids)
+                self.total_items += 1
+
+    def register_device(self, device_id: str, udid: str, pair_ids: List[str]) -> DeviceUtilization:
+        """워커 디바이스 등록"""
+        with self._lock:
+            self._device_pairs[udid] = set(pair_ids)
+            stats = DeviceUtilization(device_id=device_id, udid=udid)
+            self._utilization[udid] = stats
+            return stats
+
+    def next_item(self, udid: str, current_key: AffinityKey = (None, None)) -> Optional[WorkItem]:
+        """디바이스가 실행할 다음 작업 선택 (없으면 None)"""
+        with self._lock:
+            key = self._select_bucket(udid, current_key)
+            if key is None:
+                return None
+
+            item = self._buckets[key].popleft()
+            if not self._buckets[key]:
+                del self._buckets[key]
+
+            stats = self._utilization.get(udid)
+            if stats:
+                if key[1:] == current_key:
+                    stats.affinity_hits += 1
+                else:
+                    stats.affinity_misses += 1
+                if not self._is_own_key(udid, key):
+                    stats.items_stolen += 1
+            return item
+
+    def _select_bucket(self, udid: str, current_key: AffinityKey) -> Optional[BucketKey]:
+        candidates = [key for key in self._buckets if udid in self._eligible.get(key, frozenset())]
+        if not candidates:
+            return None
+
+        # 1순위: 현재 사용자/언어 그대로 (자신의 페어 버킷 우선)
+        same_login = [key for key in candidates if key[1:] == current_key]
+        if same_login:
+            return self._largest(udid, same_login)
+
+        # 2순위: 같은 사용자 (드라이버 재생성 없이 언어만 변경)
+        same_user = [key for key in candidates if key[1] == current_key[0]]
+        if same_user:
+            return self._largest(udid, same_user)
+
+        # 3순위: 자신의 페어 작업, 4순위: 남은 작업이 가장 많은 버킷 훔치기
+        return self._largest(udid, candidates)
+
+    def _largest(self, udid: str, keys: List[BucketKey]) -> BucketKey:
+        own = [key for key in keys if self._is_own_key(udid, key)]
+        return max(own or keys, key=lambda k: len(self._buckets[k]))
+
+    def _is_own_key(self, udid: str, key: BucketKey) -> bool:
+        return bool(self._key_pairs.get(key, set()) & self._device_pairs.get(udid, set()))
+
+    def drop_bucket(self, key: BucketKey) -> int:
+        """페어/사용자/언어 버킷의 남은 작업 폐기 (언어 변경/로그인 실패 시)"""
+        with self._lock:
+            dropped = self._buckets.pop(key, None)
+            return len(dropped) if dropped else 0
+
+    def requeue(self, item: WorkItem):
+        """실행되지 못한 작업을 버킷 맨 앞에 다시 추가 (샤딩 워커 이탈 시)"""
+        with self._lock:
+            self._buckets.setdefault(item.bucket_key, deque()).appendleft(item)
+
+    def record(self, udid: str, kind: str, seconds: float, completed: bool = False):
+        """디바이스 시간 기록 (kind: busy, setup, idle)"""
+        with self._lock:
+            stats = self._utilization.get(udid)
+            if not stats:
+                return
+            setattr(stats, f"{kind}_time", getattr(stats, f"{kind}_time") + seconds)
+            if completed:
+                stats.items_completed += 1
+
+    def finish_device(self, udid: str):
+        """워커 종료 시각 기록"""
+        with self._lock:
+            stats = self._utilization.get(udid)
+            if stats:
+                stats.finished_at = time.time()
+
+    def drain(self) -> List[WorkItem]:
+        """남은 작업을 모두 꺼내 반환 (실행할 워커가 없어 실패로 기록할 때)"""
+        with self._lock:
+            items = [item for bucket in self._buckets.values() for item in bucket]
+            self._buckets.clear()
+            return items
+
+    def remaining(self) -> int:
+        with self._lock:
+            return sum(len(bucket) for bucket in self._buckets.values())
+
+    def get_utilization_report(self) -> Dict[str, Any]:
+        """디바이스별 사용률 리포트 생성"""
+        with self._lock:
+            wall_time = time.time() - self._started_at
+            devices = {}
+            for udid, stats in self._utilization.items():
+                devices[udid] = {
+                    'device_id': stats.device_id,
+                    'items_completed': stats.items_completed,
+                    'items_stolen': stats.items_stolen,
+                    'affinity_hits': stats.affinity_hits,
+                    'affinity_misses': stats.affinity_misses,
+                    'busy_time': round(stats.busy_time, 2),
+                    'setup_time': round(stats.setup_time, 2),
+                    'idle_time': round(stats.idle_time, 2),
+                    'wall_time': round(stats.wall_time, 2),
+                    'utilization': round(stats.utilization, 1)
+                }
+            return {
+                'total_items': self.total_items,
+                'wall_time': round(wall_time, 2),
+                'devices': devices
+            }
+
+    def print_utilization_report(self):
+        """디바이스별 사용률 출력"""
+        report = self.get_utilization_report()
+        print("\n📊 디바이스 사용률 리포트:")
+        print(f"   총 작업 수: {report['total_items']}, 전체 소요 시간: {report['wall_time']}s")
+        for udid, info in report['devices'].items():
+            print(f"   📱 {info['device_id']} ({udid}): "
+                  f"사용률 {info['utilization']}% | "
+                  f"완료 {info['items_completed']}건 (훔친 작업 {info['items_stolen']}건) | "
+                  f"실행 {info['busy_time']}s, 준비 {info['setup_time']}s, 대기 {info['idle_time']}s | "
+                  f"affinity {info['affinity_hits']}/{info['affinity_hits'] + info['affinity_misses']}")
+
+def build_scheduler(test_pairs, test_cases) -> WorkStealingScheduler:
+    """테스트 페어와 테스트 케이스로 전역 작업 큐 구성
+
+    페어별 실행과 같이 각 페어의 (테스트 케이스, 사용자, 언어) 작업이 모두 실행되며
+    (여러 페어에 같은 사용자/언어가 있으면 페어마다 한 번씩), 작업은 해당 사용자와
+    언어를 허용하는 모든 페어의 디바이스가 가져갈 수 있다.
+    """
+    scheduler = WorkStealingScheduler()
+
+    # (사용자, 언어)별 실행 가능한 디바이스
+    eligible: Dict[AffinityKey, set] = {}
+    for pair in test_pairs:
+        for user_config in pair.user_configs:
+            for lang in pair.languages:
+                eligible.setdefault((user_config.user_id, lang), set()).add(pair.device_config.udid)
+
+    for pair in test_pairs:
+        for user_config in pair.user_configs:
+            for lang in pair.languages:
+                items = [
+                    WorkItem(test_case=test_case, user_config=user_config, language=lang, pair_id=pair.pair_id)
+                    for test_case in test_cases
+                ]
+                scheduler.add_items(items, frozenset(eligible[(user_config.user_id, lang)]), [pair.pair_id])
+
+    return scheduler